@@ -4,6 +4,7 @@
 
 import logging
 import time
+from collections import deque
 from datetime import datetime, timedelta
 
 import matplotlib.pyplot as plt
@@ -21,6 +22,7 @@ from lightquant.domain.services.order_service import OrderService
 from lightquant.domain.services.strategy_service import StrategyService
 from lightquant.domain.strategies import BaseStrategy, StrategyResult
 from lightquant.domain.strategies.backtest_engine import BacktestEngine
+from lightquant.infrastructure.cache import IdentityMapStrategyRepository
 from lightquant.infrastructure.database import DatabaseManager, init_db
 from lightquant.infrastructure.database.repositories import (
     SQLAccountRepository,
@@ -54,8 +56,11 @@ class SimpleMovingAverageStrategy(BaseStrategy):
         self.long_window = self.parameters.get("long_window", 20)  # 长期窗口
 
         # 获取历史数据
-        self.candles = self.context.get_historical_candles(
-            symbol=self.symbol, timeframe="1h", limit=self.long_window + 10
+        self.candles = deque(
+            self.context.get_historical_candles(
+                symbol=self.symbol, timeframe="1h", limit=self.long_window + 10
+            ),
+            maxlen=self.long_window + 10,
         )
 
         # 初始化指标
@@ -72,13 +77,9 @@ class SimpleMovingAverageStrategy(BaseStrategy):
         """处理K线数据"""
         result = StrategyResult()
 
-        # 添加新K线
+        # 添加新K线，超出固定长度时自动丢弃最旧的K线
         self.candles.append(candle)
 
-        # 保持固定长度
-        if len(self.candles) > self.long_window + 10:
-            self.candles = self.candles[-(self.long_window + 10) :]
-
         # 如果数据不足，则返回
         if len(self.candles) < self.long_window:
             result.add_log(f"数据不足，当前数据长度: {len(self.candles)}")
@@ -358,7 +359,10 @@ def main():
     init_db(db_manager.engine)
 
     # 创建仓库
-    strategy_repo = SQLStrategyRepository(db_manager.session_factory)
+    # 策略服务的启动、暂停等操作连续读写同一策略，用身份映射避免重复查询
+    strategy_repo = IdentityMapStrategyRepository(
+        SQLStrategyRepository(db_manager.session_factory)
+    )
     order_repo = SQLOrderRepository(db_manager.session_factory)
     account_repo = SQLAccountRepository(db_manager.session_factory)
     market_data_repo = SQLMarketDataRepository(db_manager.session_factory)
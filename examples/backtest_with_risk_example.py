@@ -6,6 +6,7 @@
 
 import logging
 import time
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -29,6 +30,7 @@ from lightquant.domain.services.order_service import OrderService
 from lightquant.domain.services.strategy_service import StrategyService
 from lightquant.domain.strategies import BaseStrategy, StrategyResult
 from lightquant.domain.strategies.backtest_engine import BacktestEngine
+from lightquant.infrastructure.cache import IdentityMapStrategyRepository
 from lightquant.infrastructure.database import DatabaseManager, init_db
 from lightquant.infrastructure.database.repositories import (
     SQLAccountRepository,
@@ -64,8 +66,11 @@ class RiskAwareMovingAverageStrategy(BaseStrategy):
         self.position_size = self.parameters.get("position_size", 0.01)  # 仓位大小
 
         # 获取历史数据
-        self.candles = self.context.get_historical_candles(
-            symbol=self.symbol, timeframe="1h", limit=self.long_window + 10
+        self.candles = deque(
+            self.context.get_historical_candles(
+                symbol=self.symbol, timeframe="1h", limit=self.long_window + 10
+            ),
+            maxlen=self.long_window + 10,
         )
 
         # 初始化指标
@@ -109,13 +114,9 @@ class RiskAwareMovingAverageStrategy(BaseStrategy):
         """处理K线数据"""
         result = StrategyResult()
 
-        # 添加新K线
+        # 添加新K线，超出固定长度时自动丢弃最旧的K线
         self.candles.append(candle)
 
-        # 保持固定长度
-        if len(self.candles) > self.long_window + 10:
-            self.candles = self.candles[-(self.long_window + 10) :]
-
         # 如果数据不足，则返回
         if len(self.candles) < self.long_window:
             result.add_log(f"数据不足，当前数据长度: {len(self.candles)}")
@@ -132,7 +133,7 @@ class RiskAwareMovingAverageStrategy(BaseStrategy):
 
         # 计算当前回撤
         if len(self.candles) > 30:  # 至少需要30根K线才能计算回撤
-            highest_close = max([c.close for c in self.candles[-30:]])
+            highest_close = max(closes[-30:])
             current_close = candle.close
             if highest_close > 0:
                 drawdown = (highest_close - current_close) / highest_close * 100
@@ -438,7 +439,10 @@ def run_backtest(with_risk: bool = True) -> Dict[str, Any]:
     init_db(db_manager.engine)
 
     # 创建仓库
-    strategy_repo = SQLStrategyRepository(db_manager.session_factory)
+    # 策略服务的启动、暂停等操作连续读写同一策略，用身份映射避免重复查询
+    strategy_repo = IdentityMapStrategyRepository(
+        SQLStrategyRepository(db_manager.session_factory)
+    )
     order_repo = SQLOrderRepository(db_manager.session_factory)
     account_repo = SQLAccountRepository(db_manager.session_factory)
     market_data_repo = SQLMarketDataRepository(db_manager.session_factory)
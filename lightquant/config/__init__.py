@@ -0,0 +1,13 @@
+"""
+配置模块，包含全局运行时开关
+"""
+
+import os
+
+# 是否为未指定ID的成交记录使用进程内自增ID代替UUID
+# 自增ID仅在当前进程内唯一，适用于回测等不需要持久化成交ID的场景
+FAST_IDS: bool = os.environ.get("LIGHTQUANT_FAST_IDS", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
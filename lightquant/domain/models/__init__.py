@@ -4,7 +4,7 @@
 
 from .account import Account, Balance
 from .base import AggregateRoot, Entity, ValueObject
-from .market_data import Candle, OrderBook, Ticker
+from .market_data import Candle, CandleBatch, CandleRingBuffer, OrderBook, Ticker
 from .order import Order, OrderSide, OrderStatus, OrderType
 from .strategy import Strategy, StrategyConfig, StrategyStatus
 from .trade import Trade
@@ -20,6 +20,8 @@ __all__ = [
     "Trade",
     "Ticker",
     "Candle",
+    "CandleBatch",
+    "CandleRingBuffer",
     "OrderBook",
     "Account",
     "Balance",
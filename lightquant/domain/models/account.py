@@ -7,10 +7,10 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from .base import AggregateRoot, ValueObject
+from .base import DATACLASS_SLOTS, AggregateRoot, ValueObject
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Balance:
     """资产余额数据类"""
 
@@ -2,18 +2,25 @@
 基础领域模型类，包括实体、值对象和聚合根
 """
 
+import sys
 import uuid
 from abc import ABC
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from typing import Any, Dict, Generic, List, Optional, Set, TypeVar
 
 T = TypeVar("T")
 
+# 高频创建的数据类使用__slots__，去掉实例__dict__以减少内存并加快属性访问；
+# dataclass的slots参数需要Python 3.10+，更早的版本退化为普通数据类
+DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class Entity(ABC):
     """实体基类"""
 
+    __slots__ = ("id", "_created_at", "_updated_at")
+
     def __init__(self, entity_id: Optional[str] = None):
         self.id = entity_id or str(uuid.uuid4())
         self._created_at = datetime.now()
@@ -51,6 +58,8 @@ class DomainEvent:
 class AggregateRoot(Entity):
     """聚合根基类"""
 
+    __slots__ = ("_domain_events",)
+
     def __init__(self, entity_id: Optional[str] = None):
         super().__init__(entity_id)
         self._domain_events: List[DomainEvent] = []
@@ -72,10 +81,16 @@ class AggregateRoot(Entity):
 class ValueObject:
     """值对象基类"""
 
+    __slots__ = ()
+
+    def _values(self) -> tuple:
+        """按字段顺序返回值对象的所有字段值，子类使用__slots__时也可用"""
+        return tuple(getattr(self, f.name) for f in fields(self))
+
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
             return False
-        return self.__dict__ == other.__dict__
+        return self._values() == other._values()
 
     def __hash__(self):
-        return hash(tuple(sorted(self.__dict__.items())))
+        return hash(self._values())
@@ -0,0 +1,59 @@
+"""
+K线缓冲区内核，安装了numba时使用JIT编译版本，否则退回Python实现
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba为可选依赖
+    njit = None
+
+
+def _ring_update_python(
+    timestamps: np.ndarray,
+    opens: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    volumes: np.ndarray,
+    state: np.ndarray,
+    timestamp: int,
+    open_: float,
+    high: float,
+    low: float,
+    close: float,
+    volume: float,
+) -> None:
+    """
+    向环形缓冲区写入一根K线（Python实现）
+
+    state[0] 为下一次写入的位置，state[1] 为已写入的K线数量；
+    与最新K线开盘时间相同的K线原地替换最新K线
+    """
+    capacity = timestamps.shape[0]
+    cursor = state[0]
+    filled = state[1]
+
+    last = (cursor - 1) % capacity
+    if filled and timestamps[last] == timestamp:
+        idx = last
+    else:
+        idx = cursor
+        state[0] = (cursor + 1) % capacity
+        if filled < capacity:
+            state[1] = filled + 1
+
+    timestamps[idx] = timestamp
+    opens[idx] = open_
+    highs[idx] = high
+    lows[idx] = low
+    closes[idx] = close
+    volumes[idx] = volume
+
+
+if njit is not None:
+    # 逐个标量写入的代码在两种实现中完全相同，直接编译Python实现
+    ring_update = njit(cache=True)(_ring_update_python)
+else:
+    ring_update = _ring_update_python
@@ -3,10 +3,28 @@
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
-from .base import ValueObject
+import numpy as np
+
+from .base import DATACLASS_SLOTS, ValueObject
+from .candle_kernels import ring_update
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _epoch_ns(timestamp: datetime) -> int:
+    """
+    将时间转换为纳秒时间戳
+
+    带时区的时间先归一为UTC，无时区的时间按UTC处理，与 datetime64[ns] 的约定一致；
+    使用整数运算，避免浮点误差和NumPy对带时区时间的弃用警告
+    """
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (timestamp - _EPOCH) // _MICROSECOND * 1000
 
 
 @dataclass
@@ -58,7 +76,7 @@ class Ticker(ValueObject):
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Candle(ValueObject):
     """K线数据值对象"""
 
@@ -124,6 +142,189 @@ class Candle(ValueObject):
         }
 
 
+# 价格类型到K线价格列的映射，未知类型按收盘价处理
+_PRICE_COLUMNS = {"open": "open", "high": "high", "low": "low", "close": "close"}
+
+
+@dataclass(eq=False)
+class CandleBatch:
+    """
+    列式存储的K线批量数据
+
+    每个字段是一个连续的NumPy数组，同一下标对应同一根K线，按时间升序排列。
+    适合指标计算等需要整列扫描的场景。
+    """
+
+    symbol: str  # 交易对，如 "BTC/USDT"
+    timestamps: np.ndarray  # 开盘时间，int64纳秒时间戳
+    open: np.ndarray  # 开盘价
+    high: np.ndarray  # 最高价
+    low: np.ndarray  # 最低价
+    close: np.ndarray  # 收盘价
+    volume: np.ndarray  # 成交量
+    exchange_id: str = ""  # 交易所ID
+    timeframe: str = "1m"  # 时间周期，如 "1m", "5m", "1h", "1d"
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def column(self, price_type: str) -> np.ndarray:
+        """
+        获取指定类型的价格列
+
+        Args:
+            price_type: 价格类型，可选 "open", "high", "low", "close"，其他值按 "close" 处理
+
+        Returns:
+            价格数组
+        """
+        return getattr(self, _PRICE_COLUMNS.get(price_type, "close"))
+
+    @classmethod
+    def from_candles(
+        cls,
+        candles: List[Candle],
+        symbol: str,
+        exchange_id: str = "",
+        timeframe: str = "1m",
+    ) -> "CandleBatch":
+        """
+        从K线对象列表构建列式数据
+
+        Args:
+            candles: K线列表，按时间升序排列
+            symbol: 交易对
+            exchange_id: 交易所ID
+            timeframe: 时间周期
+
+        Returns:
+            列式K线数据
+        """
+        count = len(candles)
+
+        def column(name: str) -> np.ndarray:
+            return np.fromiter(
+                (getattr(candle, name) for candle in candles),
+                dtype=np.float64,
+                count=count,
+            )
+
+        timestamps = np.fromiter(
+            (_epoch_ns(candle.timestamp) for candle in candles),
+            dtype=np.int64,
+            count=count,
+        )
+
+        return cls(
+            symbol=symbol,
+            exchange_id=exchange_id,
+            timeframe=timeframe,
+            timestamps=timestamps,
+            open=column("open"),
+            high=column("high"),
+            low=column("low"),
+            close=column("close"),
+            volume=column("volume"),
+        )
+
+
+class CandleRingBuffer:
+    """
+    定长的列式K线环形缓冲区
+
+    预先分配各字段的NumPy数组，新K线按写入游标循环覆盖最旧的数据，
+    追加时不分配内存；同一开盘时间的K线视为对最新K线的更新，原地替换。
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        capacity: int,
+        exchange_id: str = "",
+        timeframe: str = "1m",
+    ):
+        """
+        初始化环形缓冲区
+
+        Args:
+            symbol: 交易对
+            capacity: 最多保留的K线数量
+            exchange_id: 交易所ID
+            timeframe: 时间周期
+        """
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+
+        self.symbol = symbol
+        self.exchange_id = exchange_id
+        self.timeframe = timeframe
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.open = np.zeros(capacity, dtype=np.float64)
+        self.high = np.zeros(capacity, dtype=np.float64)
+        self.low = np.zeros(capacity, dtype=np.float64)
+        self.close = np.zeros(capacity, dtype=np.float64)
+        self.volume = np.zeros(capacity, dtype=np.float64)
+        # [下一次写入的位置, 已写入的K线数量]，以数组保存以便内核原地更新
+        self._state = np.zeros(2, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return int(self._state[1])
+
+    def append(self, candle: Candle) -> None:
+        """
+        写入一根K线
+
+        Args:
+            candle: K线数据
+        """
+        ring_update(
+            self.timestamps,
+            self.open,
+            self.high,
+            self.low,
+            self.close,
+            self.volume,
+            self._state,
+            _epoch_ns(candle.timestamp),
+            candle.open,
+            candle.high,
+            candle.low,
+            candle.close,
+            candle.volume,
+        )
+
+    def to_batch(self) -> CandleBatch:
+        """
+        按时间升序导出缓冲区中的K线
+
+        Returns:
+            列式K线数据，数组为缓冲区的拷贝
+        """
+        cursor, filled = (int(value) for value in self._state)
+        if filled < self.capacity:
+
+            def column(values: np.ndarray) -> np.ndarray:
+                return values[:filled].copy()
+
+        else:
+
+            def column(values: np.ndarray) -> np.ndarray:
+                return np.concatenate((values[cursor:], values[:cursor]))
+
+        return CandleBatch(
+            symbol=self.symbol,
+            exchange_id=self.exchange_id,
+            timeframe=self.timeframe,
+            timestamps=column(self.timestamps),
+            open=column(self.open),
+            high=column(self.high),
+            low=column(self.low),
+            close=column(self.close),
+            volume=column(self.volume),
+        )
+
+
 @dataclass
 class OrderBookEntry(ValueObject):
     """订单簿条目值对象"""
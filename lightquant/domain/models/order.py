@@ -2,14 +2,22 @@
 订单模型，包括订单实体和相关值对象
 """
 
+import json
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum, auto
-from typing import Any, Dict, Optional
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
 
 from .base import AggregateRoot, ValueObject
 
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖
+    orjson = None
+
 
 class OrderType(Enum):
     """订单类型枚举"""
@@ -40,6 +48,10 @@ class OrderSide(Enum):
     SELL = "sell"  # 卖出
 
 
+# 未提供交易所特定参数的订单共享同一个只读空映射，避免每个订单分配一个空字典
+_EMPTY_PARAMS: Mapping[str, Any] = MappingProxyType({})
+
+
 @dataclass
 class OrderParams(ValueObject):
     """订单参数值对象"""
@@ -51,11 +63,16 @@ class OrderParams(ValueObject):
     price: Optional[float] = None  # 价格，市价单可为None
     stop_price: Optional[float] = None  # 止损价格，仅止损单和止损限价单需要
     leverage: Optional[float] = None  # 杠杆倍数，仅杠杆交易需要
-    params: Optional[Dict[str, Any]] = None  # 交易所特定参数
+    params: Optional[Mapping[str, Any]] = None  # 交易所特定参数
+    base_asset: str = field(init=False, repr=False, compare=False)  # 基础货币
+    quote_asset: str = field(init=False, repr=False, compare=False)  # 计价货币
 
     def __post_init__(self):
         if self.params is None:
-            self.params = {}
+            self.params = _EMPTY_PARAMS
+
+        # 解析交易对，如 "BTC/USDT" -> ("BTC", "USDT")
+        self.base_asset, _, self.quote_asset = self.symbol.partition("/")
 
         # 验证订单参数
         if self.order_type != OrderType.MARKET and self.price is None:
@@ -75,6 +92,23 @@ class OrderParams(ValueObject):
 class Order(AggregateRoot):
     """订单聚合根"""
 
+    __slots__ = (
+        "_params",
+        "_strategy_id",
+        "_exchange_id",
+        "_status",
+        "_filled_amount",
+        "_filled_amount_c",
+        "_remaining_amount",
+        "_average_price",
+        "_exchange_order_id",
+        "_client_order_id",
+        "_error_message",
+        "_submitted_at",
+        "_closed_at",
+        "_trades",
+    )
+
     def __init__(
         self,
         params: OrderParams,
@@ -88,9 +122,13 @@ class Order(AggregateRoot):
         self._exchange_id = exchange_id
         self._status = OrderStatus.PENDING
         self._filled_amount = 0.0
+        self._filled_amount_c = 0.0  # 成交数量Kahan求和的补偿项
         self._remaining_amount = params.amount
         self._average_price = None
         self._exchange_order_id: Optional[str] = None
+        self._client_order_id: Optional[str] = None
+        self._error_message: Optional[str] = None
+        self._submitted_at: Optional[datetime] = None
         self._closed_at: Optional[datetime] = None
         self._trades = []
 
@@ -168,16 +206,20 @@ class Order(AggregateRoot):
                 f"Fill amount {amount} exceeds remaining amount {self.remaining_amount}"
             )
 
-        # 更新成交信息
-        self._filled_amount += amount
-        self._remaining_amount -= amount
+        # 更新成交信息，使用Kahan补偿求和避免多次部分成交累积浮点误差
+        previous_filled = self._filled_amount
+        y = amount - self._filled_amount_c
+        t = previous_filled + y
+        self._filled_amount_c = (t - previous_filled) - y
+        self._filled_amount = t
+        self._remaining_amount = self._params.amount - t
 
         # 计算新的平均价格
         if self._average_price is None:
             self._average_price = price
         else:
             self._average_price = (
-                self._average_price * (self._filled_amount - amount) + price * amount
+                self._average_price * previous_filled + price * amount
             ) / self._filled_amount
 
         # 添加成交记录
@@ -261,24 +303,121 @@ class Order(AggregateRoot):
 
     def to_dict(self) -> Dict[str, Any]:
         """将订单转换为字典"""
+        data = self._to_iso_dict()
+        # 返回的字典可能被调用方修改，交易所参数复制一份，避免改动订单本身
+        data["params"] = dict(data["params"])
+        return data
+
+    def to_json_bytes(self) -> bytes:
+        """
+        将订单序列化为JSON字节串
+
+        安装了orjson时直接由orjson格式化时间字段，省去中间的isoformat调用；
+        否则退回标准库json。两种方式输出的字段和取值一致。
+        交易所参数直接序列化订单持有的映射，不做复制。
+
+        Returns:
+            UTF-8编码的JSON字节串
+        """
+        if orjson is not None:
+            return orjson.dumps(self._to_raw_dict(), default=_json_default)
+        return json.dumps(
+            self._to_iso_dict(), ensure_ascii=False, default=_json_default
+        ).encode("utf-8")
+
+    def _to_iso_dict(self) -> Dict[str, Any]:
+        """将订单转换为字典，时间字段转换为ISO格式字符串"""
+        data = self._to_raw_dict()
+        closed_at = data["closed_at"]
+        data["created_at"] = data["created_at"].isoformat()
+        data["updated_at"] = data["updated_at"].isoformat()
+        data["closed_at"] = closed_at.isoformat() if closed_at else None
+        return data
+
+    def _to_raw_dict(self) -> Dict[str, Any]:
+        """
+        将订单转换为字典，时间字段保留为datetime对象
+
+        params 为订单持有的交易所参数映射本身（可能是只读映射），调用方不应修改
+        """
+        (
+            order_id,
+            exchange_id,
+            exchange_order_id,
+            strategy_id,
+            params,
+            status,
+            filled_amount,
+            remaining_amount,
+            average_price,
+            created_at,
+            updated_at,
+            closed_at,
+        ) = _ORDER_FIELDS(self)
+        (
+            symbol,
+            order_type,
+            side,
+            amount,
+            price,
+            stop_price,
+            leverage,
+            extra_params,
+        ) = _ORDER_PARAMS_FIELDS(params)
+
         return {
-            "id": self.id,
-            "exchange_id": self._exchange_id,
-            "exchange_order_id": self._exchange_order_id,
-            "strategy_id": self._strategy_id,
-            "symbol": self._params.symbol,
-            "type": self._params.order_type.value,
-            "side": self._params.side.value,
-            "amount": self._params.amount,
-            "price": self._params.price,
-            "stop_price": self._params.stop_price,
-            "leverage": self._params.leverage,
-            "params": self._params.params,
-            "status": self._status.value,
-            "filled_amount": self._filled_amount,
-            "remaining_amount": self._remaining_amount,
-            "average_price": self._average_price,
-            "created_at": self._created_at.isoformat(),
-            "updated_at": self._updated_at.isoformat(),
-            "closed_at": self._closed_at.isoformat() if self._closed_at else None,
+            "id": order_id,
+            "exchange_id": exchange_id,
+            "exchange_order_id": exchange_order_id,
+            "strategy_id": strategy_id,
+            "symbol": symbol,
+            "type": order_type.value,
+            "side": side.value,
+            "amount": amount,
+            "price": price,
+            "stop_price": stop_price,
+            "leverage": leverage,
+            "params": extra_params,
+            "status": status.value,
+            "filled_amount": filled_amount,
+            "remaining_amount": remaining_amount,
+            "average_price": average_price,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "closed_at": closed_at,
         }
+
+
+def _json_default(value: Any) -> Any:
+    """JSON序列化的兜底转换，处理只读映射等非dict映射"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# 批量序列化时一次性取出所有字段，避免逐个属性查找
+_ORDER_FIELDS = attrgetter(
+    "id",
+    "_exchange_id",
+    "_exchange_order_id",
+    "_strategy_id",
+    "_params",
+    "_status",
+    "_filled_amount",
+    "_remaining_amount",
+    "_average_price",
+    "_created_at",
+    "_updated_at",
+    "_closed_at",
+)
+
+_ORDER_PARAMS_FIELDS = attrgetter(
+    "symbol",
+    "order_type",
+    "side",
+    "amount",
+    "price",
+    "stop_price",
+    "leverage",
+    "params",
+)
@@ -5,7 +5,7 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 from .base import AggregateRoot, ValueObject
 
@@ -191,20 +191,60 @@ class Strategy(AggregateRoot):
             self._order_ids.remove(order_id)
             self.update()
 
+    def add_orders(self, order_ids: Iterable[str]) -> None:
+        """批量添加订单ID"""
+        self._order_ids.update(order_ids)
+        self.update()
+
+    def remove_orders(self, order_ids: Iterable[str]) -> None:
+        """批量移除订单ID"""
+        count = len(self._order_ids)
+        self._order_ids.difference_update(order_ids)
+        if len(self._order_ids) != count:
+            self.update()
+
     def to_dict(self) -> Dict[str, Any]:
         """将策略转换为字典"""
+        start_time = self._start_time
+        stop_time = self._stop_time
+        last_run_time = self._last_run_time
         return {
             "id": self.id,
             "config": self._config.to_dict(),
             "status": self._status.value,
-            "start_time": self._start_time.isoformat() if self._start_time else None,
-            "stop_time": self._stop_time.isoformat() if self._stop_time else None,
-            "last_run_time": (
-                self._last_run_time.isoformat() if self._last_run_time else None
-            ),
+            "start_time": start_time.isoformat() if start_time else None,
+            "stop_time": stop_time.isoformat() if stop_time else None,
+            "last_run_time": last_run_time.isoformat() if last_run_time else None,
             "error_message": self._error_message,
             "performance_metrics": self._performance_metrics,
             "order_ids": list(self._order_ids),
             "created_at": self._created_at.isoformat(),
             "updated_at": self._updated_at.isoformat(),
         }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Strategy":
+        """
+        从 to_dict 生成的字典重建策略
+
+        Args:
+            data: 策略字典
+
+        Returns:
+            策略对象
+        """
+
+        def parse_time(value: Optional[str]) -> Optional[datetime]:
+            return datetime.fromisoformat(value) if value else None
+
+        strategy = cls(StrategyConfig(**data["config"]), data["id"])
+        strategy._status = StrategyStatus(data["status"])
+        strategy._start_time = parse_time(data["start_time"])
+        strategy._stop_time = parse_time(data["stop_time"])
+        strategy._last_run_time = parse_time(data["last_run_time"])
+        strategy._error_message = data["error_message"]
+        strategy._performance_metrics = dict(data["performance_metrics"])
+        strategy._order_ids = set(data["order_ids"])
+        strategy._created_at = datetime.fromisoformat(data["created_at"])
+        strategy._updated_at = datetime.fromisoformat(data["updated_at"])
+        return strategy
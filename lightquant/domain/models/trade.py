@@ -2,13 +2,18 @@
 交易模型，表示订单的成交记录
 """
 
+import itertools
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict
 
+from ... import config
 from .base import Entity
 from .order import OrderSide
 
+# 进程内成交ID计数器，仅在启用 config.FAST_IDS 时使用
+_TRADE_COUNTER = itertools.count()
+
 
 class Trade(Entity):
     """交易实体，表示订单的成交记录"""
@@ -24,11 +29,14 @@ class Trade(Entity):
         exchange_id: str,
         entity_id: str = None,
     ):
+        if entity_id is None and config.FAST_IDS:
+            entity_id = f"t{next(_TRADE_COUNTER)}"
         super().__init__(entity_id)
         self._order_id = order_id
         self._trade_id = trade_id  # 交易所返回的成交ID
         self._amount = amount
         self._price = price
+        self._cost = amount * price  # 成交后数量和价格不再变化，构造时计算一次
         self._side = side
         self._symbol = symbol
         self._exchange_id = exchange_id
@@ -69,7 +77,7 @@ class Trade(Entity):
     @property
     def cost(self) -> float:
         """交易总成本/价值"""
-        return self._amount * self._price
+        return self._cost
 
     def to_dict(self) -> Dict[str, Any]:
         """将交易转换为字典"""
@@ -82,6 +90,6 @@ class Trade(Entity):
             "side": self._side.value,
             "amount": self._amount,
             "price": self._price,
-            "cost": self.cost,
+            "cost": self._cost,
             "timestamp": self._timestamp.isoformat(),
         }
@@ -3,7 +3,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from ..models.account import Account
 
@@ -34,6 +34,19 @@ class AccountRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def find_many_by_ids(self, account_ids: Iterable[str]) -> Dict[str, Account]:
+        """
+        根据ID批量查找账户
+
+        Args:
+            account_ids: 账户ID列表
+
+        Returns:
+            账户字典，键为账户ID，不存在的ID不会出现在结果中
+        """
+        pass
+
     @abstractmethod
     def find_by_exchange_id(self, exchange_id: str) -> Optional[Account]:
         """
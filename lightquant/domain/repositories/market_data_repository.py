@@ -4,9 +4,14 @@
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 
-from ..models.market_data import Candle, OrderBook, Ticker
+import numpy as np
+
+from ..models.market_data import Candle, CandleBatch, OrderBook, Ticker
+
+# get_candles_array 默认返回的K线字段
+CANDLE_ARRAY_FIELDS = ("open", "high", "low", "close", "volume")
 
 
 class MarketDataRepository(ABC):
@@ -49,6 +54,18 @@ class MarketDataRepository(ABC):
         """
         pass
 
+    def save_tickers(self, tickers: List[Ticker]) -> None:
+        """
+        批量保存行情
+
+        默认实现逐个调用 save_ticker，具体仓库可以覆盖为批量写入。
+
+        Args:
+            tickers: 行情列表
+        """
+        for ticker in tickers:
+            self.save_ticker(ticker)
+
     @abstractmethod
     def get_candles(
         self,
@@ -73,6 +90,83 @@ class MarketDataRepository(ABC):
         """
         pass
 
+    def get_latest_candle_timestamp(
+        self, symbol: str, exchange_id: str, timeframe: str
+    ) -> Optional[datetime]:
+        """
+        获取最新K线的开盘时间
+
+        默认实现基于 get_candles 获取一根K线，具体仓库可以覆盖为更轻量的查询。
+
+        Args:
+            symbol: 交易对，如 "BTC/USDT"
+            exchange_id: 交易所ID
+            timeframe: 时间周期，如 "1m", "5m", "1h", "1d"
+
+        Returns:
+            最新K线的开盘时间，如果没有K线则返回None
+        """
+        candles = self.get_candles(symbol, exchange_id, timeframe, limit=1)
+        return candles[-1].timestamp if candles else None
+
+    def get_candles_array(
+        self,
+        symbol: str,
+        exchange_id: str,
+        timeframe: str,
+        since: Optional[datetime] = None,
+        limit: int = 100,
+        fields: Sequence[str] = CANDLE_ARRAY_FIELDS,
+    ) -> np.ndarray:
+        """
+        以NumPy数组形式获取K线数据
+
+        默认实现基于 get_candles 转换，具体仓库可以覆盖此方法直接填充数组，
+        避免为每根K线创建对象。
+
+        Args:
+            symbol: 交易对，如 "BTC/USDT"
+            exchange_id: 交易所ID
+            timeframe: 时间周期，如 "1m", "5m", "1h", "1d"
+            since: 开始时间，如果为None则获取最新的K线
+            limit: 获取的K线数量
+            fields: 需要的K线字段，决定数组列的顺序
+
+        Returns:
+            形状为 (N, len(fields)) 的float64数组，按时间升序排列
+        """
+        candles = self.get_candles(symbol, exchange_id, timeframe, since, limit)
+        return np.array(
+            [[getattr(candle, name) for name in fields] for candle in candles],
+            dtype=np.float64,
+        ).reshape(len(candles), len(fields))
+
+    def get_candle_batch(
+        self,
+        symbol: str,
+        exchange_id: str,
+        timeframe: str,
+        since: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> CandleBatch:
+        """
+        以列式结构获取K线数据
+
+        默认实现基于 get_candles 转换，具体仓库可以覆盖此方法直接填充各列数组。
+
+        Args:
+            symbol: 交易对，如 "BTC/USDT"
+            exchange_id: 交易所ID
+            timeframe: 时间周期，如 "1m", "5m", "1h", "1d"
+            since: 开始时间，如果为None则获取最新的K线
+            limit: 获取的K线数量
+
+        Returns:
+            列式K线数据，按时间升序排列
+        """
+        candles = self.get_candles(symbol, exchange_id, timeframe, since, limit)
+        return CandleBatch.from_candles(candles, symbol, exchange_id, timeframe)
+
     @abstractmethod
     def save_candles(self, candles: List[Candle]) -> None:
         """
@@ -3,7 +3,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from ..models.order import Order
 
@@ -21,6 +21,16 @@ class OrderRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def save_many(self, orders: Iterable[Order]) -> None:
+        """
+        批量保存订单
+
+        Args:
+            orders: 订单对象列表
+        """
+        pass
+
     @abstractmethod
     def find_by_id(self, order_id: str) -> Optional[Order]:
         """
@@ -34,6 +44,19 @@ class OrderRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def find_many_by_ids(self, order_ids: Iterable[str]) -> Dict[str, Order]:
+        """
+        根据ID批量查找订单
+
+        Args:
+            order_ids: 订单ID列表
+
+        Returns:
+            订单字典，键为订单ID，不存在的ID不会出现在结果中
+        """
+        pass
+
     @abstractmethod
     def find_by_exchange_order_id(
         self, exchange_id: str, exchange_order_id: str
@@ -3,7 +3,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from ..models.strategy import Strategy, StrategyStatus
 
@@ -34,6 +34,19 @@ class StrategyRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def find_many_by_ids(self, strategy_ids: Iterable[str]) -> Dict[str, Strategy]:
+        """
+        根据ID批量查找策略
+
+        Args:
+            strategy_ids: 策略ID列表
+
+        Returns:
+            策略字典，键为策略ID，不存在的ID不会出现在结果中
+        """
+        pass
+
     @abstractmethod
     def find_all(self) -> List[Strategy]:
         """
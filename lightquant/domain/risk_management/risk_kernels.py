@@ -0,0 +1,34 @@
+"""
+风险检查内核，安装了numba时使用JIT编译版本，否则退回NumPy实现
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba为可选依赖
+    njit = None
+
+
+def _check_position_sizes_numpy(
+    amounts: np.ndarray, values: np.ndarray, max_amount: float, max_value: float
+) -> np.ndarray:
+    """批量检查订单数量和价值上限（NumPy实现）"""
+    return (amounts <= max_amount) & (np.isnan(values) | (values <= max_value))
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _check_position_sizes_jit(amounts, values, max_amount, max_value):
+        """批量检查订单数量和价值上限（JIT实现，单遍扫描）"""
+        n = amounts.shape[0]
+        ok = np.empty(n, np.bool_)
+        for i in range(n):
+            value = values[i]
+            ok[i] = amounts[i] <= max_amount and (np.isnan(value) or value <= max_value)
+        return ok
+
+    check_position_sizes = _check_position_sizes_jit
+else:
+    check_position_sizes = _check_position_sizes_numpy
@@ -3,7 +3,9 @@
 """
 
 import logging
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import Any, Dict, List, Optional, Sequence, Type, Union
+
+import numpy as np
 
 from ..models.account import Account
 from ..models.order import Order
@@ -20,7 +22,9 @@ class RiskManager:
     def __init__(self):
         """初始化风险管理器"""
         self.rules: Dict[str, RiskRule] = {}
-        self.context: Dict[str, Any] = {}
+        # 最新价格表：symbol -> 最新成交价，在行情进入上下文时统一整理
+        self.last_prices: Dict[str, float] = {}
+        self.context: Dict[str, Any] = {"last_prices": self.last_prices}
         self.logger = logging.getLogger("risk_manager")
 
     def add_rule(self, rule: RiskRule) -> None:
@@ -31,7 +35,7 @@ class RiskManager:
             rule: 要添加的风险控制规则
         """
         self.rules[rule.name] = rule
-        self.logger.info(f"添加风险规则: {rule.name}")
+        self.logger.info("添加风险规则: %s", rule.name)
 
     def remove_rule(self, rule_name: str) -> bool:
         """
@@ -45,10 +49,10 @@ class RiskManager:
         """
         if rule_name in self.rules:
             del self.rules[rule_name]
-            self.logger.info(f"移除风险规则: {rule_name}")
+            self.logger.info("移除风险规则: %s", rule_name)
             return True
         else:
-            self.logger.warning(f"找不到风险规则: {rule_name}")
+            self.logger.warning("找不到风险规则: %s", rule_name)
             return False
 
     def enable_rule(self, rule_name: str) -> bool:
@@ -65,7 +69,7 @@ class RiskManager:
             self.rules[rule_name].enable()
             return True
         else:
-            self.logger.warning(f"找不到风险规则: {rule_name}")
+            self.logger.warning("找不到风险规则: %s", rule_name)
             return False
 
     def disable_rule(self, rule_name: str) -> bool:
@@ -82,7 +86,7 @@ class RiskManager:
             self.rules[rule_name].disable()
             return True
         else:
-            self.logger.warning(f"找不到风险规则: {rule_name}")
+            self.logger.warning("找不到风险规则: %s", rule_name)
             return False
 
     def update_rule_params(self, rule_name: str, params: Dict[str, Any]) -> bool:
@@ -100,18 +104,55 @@ class RiskManager:
             self.rules[rule_name].update_params(params)
             return True
         else:
-            self.logger.warning(f"找不到风险规则: {rule_name}")
+            self.logger.warning("找不到风险规则: %s", rule_name)
             return False
 
     def update_context(self, context: Dict[str, Any]) -> None:
         """
         更新上下文信息
 
+        行情数据（"ticker"）会在这里整理为 {symbol: last} 格式的最新价格表，
+        规则检查时直接读取 context["last_prices"]，无需再逐项校验行情结构。
+        传入的 "last_prices" 合并到最新价格表中，不会替换风险管理器持有的价格表。
+
         Args:
             context: 新的上下文信息
         """
+        if "last_prices" in context:
+            context = dict(context)
+            prices = context.pop("last_prices")
+            if isinstance(prices, dict):
+                self.last_prices.update(prices)
         self.context.update(context)
 
+        ticker = context.get("ticker")
+        if isinstance(ticker, dict):
+            last_prices = self.last_prices
+            for symbol, data in ticker.items():
+                if isinstance(data, dict) and "last" in data:
+                    last_prices[symbol] = data["last"]
+
+    def update_last_price(self, symbol: str, price: float) -> None:
+        """
+        更新单个交易对的最新价格
+
+        逐根K线更新价格时使用，直接写入最新价格表，不需要构造行情字典
+
+        Args:
+            symbol: 交易对
+            price: 最新成交价
+        """
+        self.last_prices[symbol] = price
+
+    def clear_last_prices(self) -> None:
+        """
+        清空最新价格表
+
+        策略停止或重新回测时调用，避免规则用过期价格估值；
+        原地清空，上下文中的价格表引用仍然有效
+        """
+        self.last_prices.clear()
+
     def check_order(self, order: Order, account: Account) -> bool:
         """
         检查订单是否符合所有启用的风险控制规则
@@ -123,17 +164,52 @@ class RiskManager:
         Returns:
             bool: 如果订单符合所有启用的规则返回True，否则返回False
         """
-        self.logger.info(f"检查订单 {order.id} 是否符合风险规则")
+        self.logger.info("检查订单 %s 是否符合风险规则", order.id)
 
         for rule_name, rule in self.rules.items():
             if rule.enabled:
                 if not rule.check_order(order, account, self.context):
-                    self.logger.warning(f"订单 {order.id} 被风险规则拒绝: {rule_name}")
+                    self.logger.warning(
+                        "订单 %s 被风险规则拒绝: %s", order.id, rule_name
+                    )
                     return False
 
-        self.logger.info(f"订单 {order.id} 通过所有风险检查")
+        self.logger.info("订单 %s 通过所有风险检查", order.id)
         return True
 
+    def check_orders(self, orders: Sequence[Order], account: Account) -> np.ndarray:
+        """
+        批量检查订单是否符合所有启用的风险控制规则
+
+        每条规则只检查通过了前面规则的订单，与逐个调用 check_order 的结果一致
+
+        Args:
+            orders: 要检查的订单列表
+            account: 账户信息
+
+        Returns:
+            布尔数组，与订单一一对应，True表示订单符合所有启用的规则
+        """
+        ok = np.ones(len(orders), dtype=bool)
+
+        for rule_name, rule in self.rules.items():
+            if not rule.enabled:
+                continue
+
+            pending = np.flatnonzero(ok)
+            if not len(pending):
+                break
+
+            ok[pending] = rule.check_orders(
+                [orders[i] for i in pending], account, self.context
+            )
+            for i in pending[~ok[pending]]:
+                self.logger.warning(
+                    "订单 %s 被风险规则拒绝: %s", orders[i].id, rule_name
+                )
+
+        return ok
+
     def get_rule(self, rule_name: str) -> Optional[RiskRule]:
         """
         获取指定名称的风险控制规则
@@ -3,18 +3,38 @@
 这些规则用于管理交易风险，防止过度交易和资金损失。
 """
 
+import inspect
 import logging
 from abc import ABC, abstractmethod
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, FrozenSet, Optional, Sequence
+
+import numpy as np
+import pandas as pd
 
 from ..models.account import Account
 from ..models.order import Order
+from .risk_kernels import check_position_sizes
 
 
 class RiskRule(ABC):
     """风险控制规则抽象基类"""
 
+    __slots__ = ("name", "description", "enabled", "logger")
+
+    # 可通过 update_params 更新的参数名，即构造函数的参数，在子类定义时计算
+    _param_names: FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._param_names = frozenset(
+            name
+            for name, param in inspect.signature(cls.__init__).parameters.items()
+            if name != "self"
+            and param.kind
+            not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+        )
+
     def __init__(self, name: str, description: str = "", enabled: bool = True):
         self.name = name
         self.description = description
@@ -38,15 +58,65 @@ class RiskRule(ABC):
         """
         pass
 
+    def check_orders(
+        self, orders: Sequence[Order], account: Account, context: Dict[str, Any]
+    ) -> np.ndarray:
+        """
+        批量检查订单是否符合风险控制规则
+
+        默认逐个调用 check_order，可以向量化的规则应覆盖此方法
+
+        Args:
+            orders: 要检查的订单列表
+            account: 账户信息
+            context: 上下文信息，包含市场数据等
+
+        Returns:
+            布尔数组，与订单一一对应，True表示符合规则
+        """
+        return np.fromiter(
+            (self.check_order(order, account, context) for order in orders),
+            dtype=bool,
+            count=len(orders),
+        )
+
+    @staticmethod
+    def _get_prices(context: Dict[str, Any]) -> Dict[str, float]:
+        """
+        获取上下文中的最新价格
+
+        风险管理器整理好的最新价格表（"last_prices"）直接返回；
+        未经风险管理器的上下文则从原始行情中提取，不修改上下文
+
+        Args:
+            context: 上下文信息
+
+        Returns:
+            价格字典，格式为 {symbol: price}
+        """
+        prices = context.get("last_prices")
+        if isinstance(prices, dict):
+            return prices
+
+        ticker = context.get("ticker")
+        if not isinstance(ticker, dict):
+            return {}
+
+        return {
+            symbol: data["last"]
+            for symbol, data in ticker.items()
+            if isinstance(data, dict) and "last" in data
+        }
+
     def enable(self) -> None:
         """启用规则"""
         self.enabled = True
-        self.logger.info(f"风险规则 '{self.name}' 已启用")
+        self.logger.info("风险规则 '%s' 已启用", self.name)
 
     def disable(self) -> None:
         """禁用规则"""
         self.enabled = False
-        self.logger.info(f"风险规则 '{self.name}' 已禁用")
+        self.logger.info("风险规则 '%s' 已禁用", self.name)
 
     def update_params(self, params: Dict[str, Any]) -> None:
         """
@@ -55,12 +125,21 @@ class RiskRule(ABC):
         Args:
             params: 参数字典
         """
-        for key, value in params.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
-                self.logger.info(f"已更新规则 '{self.name}' 的参数 '{key}' 为 {value}")
-            else:
-                self.logger.warning(f"规则 '{self.name}' 不存在参数 '{key}'")
+        param_names = self._param_names
+        updates = {key: value for key, value in params.items() if key in param_names}
+        for key, value in updates.items():
+            setattr(self, key, value)
+
+        if updates:
+            self._on_params_updated()
+            self.logger.info("已更新规则 '%s' 的参数: %s", self.name, updates)
+
+        unknown = params.keys() - param_names
+        if unknown:
+            self.logger.warning("规则 '%s' 不存在参数: %s", self.name, sorted(unknown))
+
+    def _on_params_updated(self) -> None:
+        """参数更新后的回调，子类可据此刷新由参数派生的状态"""
 
 
 class PositionSizeRule(RiskRule):
@@ -70,6 +149,14 @@ class PositionSizeRule(RiskRule):
     控制单笔交易的仓位大小，可以基于最大金额、账户权益百分比或固定数量
     """
 
+    __slots__ = (
+        "max_position_value",
+        "max_position_percentage",
+        "max_position_amount",
+        "quote_asset",
+        "_checker",
+    )
+
     def __init__(
         self,
         name: str = "Position Size Rule",
@@ -97,6 +184,18 @@ class PositionSizeRule(RiskRule):
         self.max_position_percentage = max_position_percentage
         self.max_position_amount = max_position_amount
         self.quote_asset = quote_asset
+        self._checker = self._make_checker()
+
+    def _make_checker(self) -> Callable[[Order, Account, Dict[str, Any]], bool]:
+        """根据当前配置的阈值选择检查实现，未配置的检查不产生任何开销"""
+        if self.max_position_value is None and self.max_position_percentage is None:
+            if self.max_position_amount is None:
+                return self._check_nothing
+            return self._check_amount
+        return self._check_value
+
+    def _on_params_updated(self) -> None:
+        self._checker = self._make_checker()
 
     def check_order(
         self, order: Order, account: Account, context: Dict[str, Any]
@@ -114,31 +213,115 @@ class PositionSizeRule(RiskRule):
         """
         if not self.enabled:
             return True
+        return self._checker(order, account, context)
 
-        # 获取订单的基础货币和计价货币
-        symbol = order.params.symbol
-        base_asset, quote_asset = symbol.split("/")
+    def check_orders(
+        self, orders: Sequence[Order], account: Account, context: Dict[str, Any]
+    ) -> np.ndarray:
+        """
+        批量检查订单是否符合仓位大小规则
 
-        # 检查最大仓位数量
-        if (
-            self.max_position_amount is not None
-            and order.params.amount > self.max_position_amount
-        ):
+        订单数量和价值打包为数组后由内核一次比较，账户权益每批只计算一次
+
+        Args:
+            orders: 要检查的订单列表
+            account: 账户信息
+            context: 上下文信息，包含市场数据等
+
+        Returns:
+            布尔数组，与订单一一对应，True表示符合规则
+        """
+        count = len(orders)
+        if not self.enabled or self._checker == self._check_nothing:
+            return np.ones(count, dtype=bool)
+
+        amounts = np.fromiter(
+            (order.params.amount for order in orders), dtype=np.float64, count=count
+        )
+        max_amount = self.max_position_amount
+        if max_amount is None:
+            max_amount = np.inf
+
+        # 只检查数量时不需要价格，价值全部记为NaN（视为无法确定价格，不检查）
+        max_value = np.inf
+        if self._checker == self._check_amount:
+            values = np.full(count, np.nan)
+        else:
+            prices = self._get_prices(context)
+
+            # 限价单使用订单价格，市价单使用当前市场价格，无法确定价格时为NaN
+            values = amounts * np.fromiter(
+                (
+                    (
+                        order.params.price
+                        if order.params.price is not None
+                        else prices.get(order.params.symbol, np.nan)
+                    )
+                    for order in orders
+                ),
+                dtype=np.float64,
+                count=count,
+            )
+
+            if self.max_position_value is not None:
+                max_value = self.max_position_value
+
+            # 百分比上限换算为价值上限；权益为零或负值时拒绝所有能确定价格的订单
+            if self.max_position_percentage is not None:
+                equity = account.get_equity(self.quote_asset, prices)
+                if equity <= 0:
+                    self.logger.warning("账户权益为零或负值: %s", equity)
+                    max_value = -np.inf
+                else:
+                    max_value = min(
+                        max_value, equity * self.max_position_percentage / 100
+                    )
+
+        ok = check_position_sizes(amounts, values, float(max_amount), float(max_value))
+        for i in np.flatnonzero(~ok):
+            self.logger.warning("订单 %s 超过仓位大小限制", orders[i].id)
+        return ok
+
+    def _check_nothing(
+        self, order: Order, account: Account, context: Dict[str, Any]
+    ) -> bool:
+        """未设置任何阈值，所有订单都通过"""
+        return True
+
+    def _check_amount(
+        self, order: Order, account: Account, context: Dict[str, Any]
+    ) -> bool:
+        """只检查最大仓位数量，无需订单价格"""
+        amount = order.params.amount
+        if self.max_position_amount is not None and amount > self.max_position_amount:
             self.logger.warning(
-                f"订单数量 {order.params.amount} {base_asset} 超过最大仓位数量 {self.max_position_amount}"
+                "订单数量 %s %s 超过最大仓位数量 %s",
+                amount,
+                order.params.base_asset,
+                self.max_position_amount,
             )
             return False
+        return True
+
+    def _check_value(
+        self, order: Order, account: Account, context: Dict[str, Any]
+    ) -> bool:
+        """检查最大仓位数量、价值和百分比，需要订单价格"""
+        # 检查最大仓位数量：只需比较订单数量，代价最低，优先执行
+        if not self._check_amount(order, account, context):
+            return False
+
+        # 最新价格表，由风险管理器在行情进入上下文时整理
+        prices = self._get_prices(context)
 
         # 计算订单价值
         price = order.params.price
-        if price is None and "ticker" in context:
+        if price is None:
             # 如果是市价单，使用当前市场价格
-            ticker = context["ticker"]
-            if symbol in ticker:
-                price = ticker[symbol]["last"]
+            price = prices.get(order.params.symbol)
 
         if price is None:
-            self.logger.warning(f"无法确定订单 {order.id} 的价格")
+            self.logger.warning("无法确定订单 %s 的价格", order.id)
             return True  # 无法确定价格时，默认通过
 
         order_value = order.params.amount * price
@@ -149,24 +332,19 @@ class PositionSizeRule(RiskRule):
             and order_value > self.max_position_value
         ):
             self.logger.warning(
-                f"订单价值 {order_value} {quote_asset} 超过最大仓位价值 {self.max_position_value}"
+                "订单价值 %s %s 超过最大仓位价值 %s",
+                order_value,
+                order.params.quote_asset,
+                self.max_position_value,
             )
             return False
 
-        # 检查最大仓位百分比
+        # 检查最大仓位百分比，只有此项需要计算账户权益
         if self.max_position_percentage is not None:
             # 计算账户权益
-            prices = {}
-            if "ticker" in context:
-                ticker = context["ticker"]
-                if isinstance(ticker, dict):
-                    for symbol, data in ticker.items():
-                        if isinstance(data, dict) and "last" in data:
-                            prices[symbol] = data["last"]
-
             equity = account.get_equity(self.quote_asset, prices)
             if equity <= 0:
-                self.logger.warning(f"账户权益为零或负值: {equity}")
+                self.logger.warning("账户权益为零或负值: %s", equity)
                 return False
 
             # 避免除零错误
@@ -174,7 +352,9 @@ class PositionSizeRule(RiskRule):
                 position_percentage = (order_value / equity) * 100
                 if position_percentage > self.max_position_percentage:
                     self.logger.warning(
-                        f"订单仓位百分比 {position_percentage:.2f}% 超过最大值 {self.max_position_percentage}%"
+                        "订单仓位百分比 %.2f%% 超过最大值 %s%%",
+                        position_percentage,
+                        self.max_position_percentage,
                     )
                     return False
             except ZeroDivisionError:
@@ -191,6 +371,16 @@ class MaxDrawdownRule(RiskRule):
     当账户回撤超过指定阈值时，停止新的交易
     """
 
+    __slots__ = (
+        "max_drawdown_percentage",
+        "lookback_days",
+        "_current_drawdown",
+        "_precomputed",
+        "_day_peaks",
+        "_head",
+        "_head_day",
+    )
+
     def __init__(
         self,
         name: str = "Max Drawdown Rule",
@@ -212,6 +402,97 @@ class MaxDrawdownRule(RiskRule):
         super().__init__(name, description, enabled)
         self.max_drawdown_percentage = max_drawdown_percentage
         self.lookback_days = lookback_days
+        self._reset_equity_buffer()
+        self._current_drawdown = 0.0
+        # 预先计算的逐K线回撤序列，由 precompute 设置
+        self._precomputed: Optional[np.ndarray] = None
+
+    def _reset_equity_buffer(self) -> None:
+        """按回顾天数分配权益环形缓冲区，每个槽位保存一天内的权益峰值"""
+        # 当天加上回顾的天数，未写入的槽位为-inf，不影响取最大值
+        self._day_peaks = np.full(self.lookback_days + 1, -np.inf)
+        self._head = 0
+        self._head_day: Optional[date] = None
+
+    def _on_params_updated(self) -> None:
+        if len(self._day_peaks) != self.lookback_days + 1:
+            self._reset_equity_buffer()
+            self._precomputed = None
+
+    def precompute(
+        self, equity: Sequence[float], timestamps: Optional[Sequence] = None
+    ) -> np.ndarray:
+        """
+        一次性计算整条权益曲线的回撤，供已知权益曲线的批量场景使用
+
+        设置后，check_order 按上下文中的 bar_idx 直接读取对应回撤
+
+        Args:
+            equity: 按时间排序的权益序列
+            timestamps: 权益对应的时间，提供时峰值按回顾天数滚动计算，
+                否则使用历史最高权益
+
+        Returns:
+            np.ndarray: 每个时间点的回撤百分比
+        """
+        equity = np.asarray(equity, dtype=np.float64)
+        if timestamps is None:
+            peaks = np.maximum.accumulate(equity)
+        else:
+            peaks = (
+                pd.Series(equity, index=pd.DatetimeIndex(timestamps))
+                .rolling(f"{self.lookback_days}D")
+                .max()
+                .to_numpy()
+            )
+
+        drawdowns = np.zeros_like(equity)
+        positive = peaks > 0
+        drawdowns[positive] = (1.0 - equity[positive] / peaks[positive]) * 100
+        self._precomputed = drawdowns
+        return drawdowns
+
+    def clear_precomputed(self) -> None:
+        """清除预先计算的回撤序列"""
+        self._precomputed = None
+
+    def update_equity(self, equity: float, timestamp: datetime) -> float:
+        """
+        记录最新权益并更新回顾窗口内的回撤
+
+        权益按天归并到固定大小的环形缓冲区，内存占用与更新频率无关，
+        窗口峰值为对缓冲区的一次向量化取最大值
+
+        Args:
+            equity: 最新权益
+            timestamp: 权益对应的时间
+
+        Returns:
+            float: 当前回撤百分比
+        """
+        buf = self._day_peaks
+        size = len(buf)
+        day = timestamp.date()
+
+        if self._head_day is None:
+            self._head_day = day
+        elif day > self._head_day:
+            # 前进到新的一天，清空期间跳过的日期所在的槽位
+            elapsed = (day - self._head_day).days
+            if elapsed >= size:
+                buf.fill(-np.inf)
+            else:
+                for offset in range(1, elapsed + 1):
+                    buf[(self._head + offset) % size] = -np.inf
+            self._head = (self._head + elapsed) % size
+            self._head_day = day
+
+        if equity > buf[self._head]:
+            buf[self._head] = equity
+
+        peak = buf.max()
+        self._current_drawdown = (peak - equity) / peak * 100 if peak > 0 else 0.0
+        return self._current_drawdown
 
     def check_order(
         self, order: Order, account: Account, context: Dict[str, Any]
@@ -230,20 +511,51 @@ class MaxDrawdownRule(RiskRule):
         if not self.enabled:
             return True
 
-        # 检查上下文中是否有回撤信息
-        if "drawdown" not in context:
+        # 优先使用上下文中的回撤信息，其次是预先计算的回撤序列，
+        # 最后根据上下文中的权益增量计算
+        if "drawdown" in context:
+            current_drawdown = context["drawdown"]
+        elif self._precomputed is not None and "bar_idx" in context:
+            current_drawdown = self._precomputed[context["bar_idx"]]
+        elif "equity" in context:
+            current_time = context.get("current_time")
+            if not isinstance(current_time, datetime):
+                current_time = datetime.utcnow()
+            current_drawdown = self.update_equity(context["equity"], current_time)
+        else:
             self.logger.warning("上下文中没有回撤信息")
             return True  # 无法确定回撤时，默认通过
 
-        current_drawdown = context["drawdown"]
         if current_drawdown > self.max_drawdown_percentage:
             self.logger.warning(
-                f"当前回撤 {current_drawdown:.2f}% 超过最大回撤 {self.max_drawdown_percentage}%"
+                "当前回撤 %.2f%% 超过最大回撤 %s%%",
+                current_drawdown,
+                self.max_drawdown_percentage,
             )
             return False
 
         return True
 
+    def check_orders(
+        self, orders: Sequence[Order], account: Account, context: Dict[str, Any]
+    ) -> np.ndarray:
+        """
+        批量检查订单是否符合最大回撤规则
+
+        回撤与具体订单无关，每批只计算一次，结果应用到所有订单
+
+        Args:
+            orders: 要检查的订单列表
+            account: 账户信息
+            context: 上下文信息，包含市场数据等
+
+        Returns:
+            布尔数组，与订单一一对应，True表示符合规则
+        """
+        if not orders:
+            return np.ones(0, dtype=bool)
+        return np.full(len(orders), self.check_order(orders[0], account, context))
+
 
 class MaxTradesPerDayRule(RiskRule):
     """
@@ -252,6 +564,8 @@ class MaxTradesPerDayRule(RiskRule):
     限制每日交易次数，防止过度交易
     """
 
+    __slots__ = ("max_trades", "_trades_today", "_current_date")
+
     def __init__(
         self,
         name: str = "Max Trades Per Day Rule",
@@ -270,7 +584,7 @@ class MaxTradesPerDayRule(RiskRule):
         """
         super().__init__(name, description, enabled)
         self.max_trades = max_trades
-        self._trades_today: List[str] = []
+        self._trades_today = 0
         self._current_date = date.today()
 
     def check_order(
@@ -290,8 +604,73 @@ class MaxTradesPerDayRule(RiskRule):
         if not self.enabled:
             return True
 
-        # 检查日期是否变更，如果变更则重置计数
-        # 优先使用上下文中的当前时间（对回测模式友好）
+        self._roll_date(context)
+
+        # 检查今日交易次数是否已达上限
+        if self._trades_today >= self.max_trades:
+            self.logger.warning(
+                "已达到每日最大交易次数 (%s) - %s",
+                self.max_trades,
+                self._current_date,
+            )
+            return False
+
+        # 记录本次交易
+        self._trades_today += 1
+        self.logger.info(
+            "今日交易: %s/%s, 订单ID=%s", self._trades_today, self.max_trades, order.id
+        )
+
+        return True
+
+    def check_orders(
+        self, orders: Sequence[Order], account: Account, context: Dict[str, Any]
+    ) -> np.ndarray:
+        """
+        批量检查订单是否符合每日最大交易次数规则
+
+        日期每批只判断一次，按顺序放行剩余额度内的订单，与逐个检查的结果一致
+
+        Args:
+            orders: 要检查的订单列表
+            account: 账户信息
+            context: 上下文信息，包含市场数据等
+
+        Returns:
+            布尔数组，与订单一一对应，True表示符合规则
+        """
+        count = len(orders)
+        if not self.enabled:
+            return np.ones(count, dtype=bool)
+
+        self._roll_date(context)
+
+        remaining = max(self.max_trades - self._trades_today, 0)
+        accepted = min(count, remaining)
+        self._trades_today += accepted
+        if accepted < count:
+            self.logger.warning(
+                "已达到每日最大交易次数 (%s) - %s",
+                self.max_trades,
+                self._current_date,
+            )
+        if accepted:
+            self.logger.info(
+                "今日交易: %s/%s, 本批订单数=%s",
+                self._trades_today,
+                self.max_trades,
+                accepted,
+            )
+
+        return np.arange(count) < accepted
+
+    def _roll_date(self, context: Dict[str, Any]) -> None:
+        """
+        检查日期是否变更，如果变更则重置计数
+
+        Args:
+            context: 上下文信息，优先使用其中的当前时间（对回测模式友好）
+        """
         current_date = None
         if "current_time" in context:
             current_time = context["current_time"]
@@ -303,18 +682,5 @@ class MaxTradesPerDayRule(RiskRule):
             current_date = date.today()
 
         if current_date != self._current_date:
-            self._trades_today = []
+            self._trades_today = 0
             self._current_date = current_date
-
-        # 检查今日交易次数是否已达上限
-        if len(self._trades_today) >= self.max_trades:
-            self.logger.warning(
-                f"已达到每日最大交易次数 ({self.max_trades}) - {self._current_date.isoformat()}"
-            )
-            return False
-
-        # 记录本次交易
-        self._trades_today.append(order.id)
-        self.logger.info(f"今日交易: {len(self._trades_today)}/{self.max_trades}")
-
-        return True
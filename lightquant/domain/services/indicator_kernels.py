@@ -0,0 +1,52 @@
+"""
+指标计算内核，安装了numba时使用JIT编译版本，否则退回NumPy实现
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba为可选依赖
+    njit = None
+
+
+def _mean_std_numpy(prices: np.ndarray) -> Tuple[float, float]:
+    """计算均值和总体标准差（NumPy实现）"""
+    return float(prices.mean()), float(prices.std())
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _mean_std_jit(prices):
+        """计算均值和总体标准差（JIT实现，Welford单遍扫描）"""
+        n = prices.shape[0]
+        mean = 0.0
+        squared = 0.0
+        for i in range(n):
+            x = prices[i]
+            delta = x - mean
+            mean += delta / (i + 1)
+            squared += delta * (x - mean)
+        return mean, (squared / n) ** 0.5
+
+    mean_std = _mean_std_jit
+else:
+    mean_std = _mean_std_numpy
+
+
+def bollinger_bands(prices: np.ndarray, deviation: float) -> Tuple[float, float, float]:
+    """
+    计算布林带
+
+    Args:
+        prices: 价格数组，不能为空
+        deviation: 标准差倍数
+
+    Returns:
+        (中轨, 上轨, 下轨)
+    """
+    middle, std_dev = mean_std(np.ascontiguousarray(prices, dtype=np.float64))
+    return middle, middle + deviation * std_dev, middle - deviation * std_dev
@@ -2,19 +2,40 @@
 市场数据服务，处理市场数据相关的领域逻辑
 """
 
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-from ..models.market_data import Candle, OrderBook, Ticker
-from ..repositories.market_data_repository import MarketDataRepository
+import numpy as np
+
+from ..models.market_data import Candle, CandleBatch, OrderBook, Ticker, _epoch_ns
+from ..repositories.market_data_repository import (
+    CANDLE_ARRAY_FIELDS,
+    MarketDataRepository,
+)
+from .indicator_kernels import bollinger_bands
 
 
 class MarketDataService:
     """市场数据服务，处理市场数据相关的领域逻辑"""
 
-    def __init__(self, market_data_repository: MarketDataRepository):
+    def __init__(
+        self,
+        market_data_repository: MarketDataRepository,
+        indicator_cache_size: int = 4096,
+        candle_cache_size: int = 256,
+    ):
         self._market_data_repository = market_data_repository
 
+        # 指标缓存：(指标参数..., 最新K线开盘时间) -> 指标值，按LRU淘汰
+        self._indicator_cache: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._indicator_cache_size = indicator_cache_size
+
+        # K线窗口缓存：(交易对, 交易所ID, 时间周期, 周期数, 最新K线开盘时间)
+        # -> K线数据，同一窗口上的多个指标共用一次查询
+        self._candle_cache: "OrderedDict[Tuple, CandleBatch]" = OrderedDict()
+        self._candle_cache_size = candle_cache_size
+
     def get_ticker(self, symbol: str, exchange_id: str) -> Optional[Ticker]:
         """
         获取最新行情
@@ -65,6 +86,58 @@ class MarketDataService:
             symbol, exchange_id, timeframe, since, limit
         )
 
+    def get_candle_batch(
+        self,
+        symbol: str,
+        exchange_id: str,
+        timeframe: str,
+        since: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> CandleBatch:
+        """
+        以列式结构获取K线数据
+
+        Args:
+            symbol: 交易对，如 "BTC/USDT"
+            exchange_id: 交易所ID
+            timeframe: 时间周期，如 "1m", "5m", "1h", "1d"
+            since: 开始时间，如果为None则获取最新的K线
+            limit: 获取的K线数量
+
+        Returns:
+            列式K线数据，按时间升序排列
+        """
+        return self._market_data_repository.get_candle_batch(
+            symbol, exchange_id, timeframe, since, limit
+        )
+
+    def get_candles_array(
+        self,
+        symbol: str,
+        exchange_id: str,
+        timeframe: str,
+        since: Optional[datetime] = None,
+        limit: int = 100,
+        fields: Sequence[str] = CANDLE_ARRAY_FIELDS,
+    ) -> np.ndarray:
+        """
+        以NumPy数组形式获取K线数据
+
+        Args:
+            symbol: 交易对，如 "BTC/USDT"
+            exchange_id: 交易所ID
+            timeframe: 时间周期，如 "1m", "5m", "1h", "1d"
+            since: 开始时间，如果为None则获取最新的K线
+            limit: 获取的K线数量
+            fields: 需要的K线字段，决定数组列的顺序
+
+        Returns:
+            形状为 (N, len(fields)) 的float64数组，按时间升序排列
+        """
+        return self._market_data_repository.get_candles_array(
+            symbol, exchange_id, timeframe, since, limit, fields
+        )
+
     def get_order_book(
         self, symbol: str, exchange_id: str, limit: int = 20
     ) -> Optional[OrderBook]:
@@ -96,25 +169,24 @@ class MarketDataService:
         Returns:
             VWAP值，如果数据不足则返回None
         """
-        candles = self.get_candles(symbol, exchange_id, timeframe, limit=periods)
+        return self._cached_indicator(
+            ("vwap", symbol, exchange_id, timeframe, periods),
+            lambda batch: self._calculate_vwap(batch, periods),
+        )
 
-        if len(candles) < periods:
+    @staticmethod
+    def _calculate_vwap(batch: CandleBatch, periods: int) -> Optional[float]:
+        """根据K线窗口计算成交量加权平均价格(VWAP)"""
+        if len(batch) < periods:
             return None
 
-        total_volume = 0
-        total_volume_price = 0
-
-        for candle in candles:
-            volume = candle.volume
-            typical_price = (candle.high + candle.low + candle.close) / 3
-
-            total_volume += volume
-            total_volume_price += volume * typical_price
-
+        volume = batch.volume
+        total_volume = volume.sum()
         if total_volume == 0:
             return None
 
-        return total_volume_price / total_volume
+        typical_price = (batch.high + batch.low + batch.close) / 3.0
+        return float(np.dot(typical_price, volume) / total_volume)
 
     def calculate_moving_average(
         self,
@@ -137,23 +209,21 @@ class MarketDataService:
         Returns:
             移动平均线值，如果数据不足则返回None
         """
-        candles = self.get_candles(symbol, exchange_id, timeframe, limit=periods)
+        return self._cached_indicator(
+            ("ma", symbol, exchange_id, timeframe, periods, price_type),
+            lambda batch: self._calculate_moving_average(batch, periods, price_type),
+        )
 
-        if len(candles) < periods:
+    @staticmethod
+    def _calculate_moving_average(
+        batch: CandleBatch, periods: int, price_type: str
+    ) -> Optional[float]:
+        """根据K线窗口计算移动平均线"""
+        if len(batch) < periods:
             return None
 
-        prices = []
-        for candle in candles:
-            if price_type == "open":
-                prices.append(candle.open)
-            elif price_type == "high":
-                prices.append(candle.high)
-            elif price_type == "low":
-                prices.append(candle.low)
-            else:  # default to close
-                prices.append(candle.close)
-
-        return sum(prices) / len(prices)
+        prices = batch.column(price_type)
+        return float(prices.mean())
 
     def calculate_bollinger_bands(
         self,
@@ -178,35 +248,118 @@ class MarketDataService:
         Returns:
             布林带值，包含中轨、上轨和下轨，如果数据不足则返回None
         """
-        candles = self.get_candles(symbol, exchange_id, timeframe, limit=periods)
+        bands = self._cached_indicator(
+            (
+                "bollinger",
+                symbol,
+                exchange_id,
+                timeframe,
+                periods,
+                deviation,
+                price_type,
+            ),
+            lambda batch: self._calculate_bollinger_bands(
+                batch, periods, deviation, price_type
+            ),
+        )
+        # 返回副本，避免调用方修改缓存中的字典
+        return dict(bands) if bands is not None else None
 
-        if len(candles) < periods:
+    @staticmethod
+    def _calculate_bollinger_bands(
+        batch: CandleBatch, periods: int, deviation: float, price_type: str
+    ) -> Optional[Dict[str, float]]:
+        """根据K线窗口计算布林带"""
+        if len(batch) < periods:
             return None
 
-        prices = []
-        for candle in candles:
-            if price_type == "open":
-                prices.append(candle.open)
-            elif price_type == "high":
-                prices.append(candle.high)
-            elif price_type == "low":
-                prices.append(candle.low)
-            else:  # default to close
-                prices.append(candle.close)
-
-        # 计算中轨（简单移动平均线）
-        middle = sum(prices) / len(prices)
-
-        # 计算标准差
-        variance = sum((price - middle) ** 2 for price in prices) / len(prices)
-        std_dev = variance**0.5
+        prices = batch.column(price_type)
 
-        # 计算上轨和下轨
-        upper = middle + deviation * std_dev
-        lower = middle - deviation * std_dev
+        # 中轨为简单移动平均线，上下轨为中轨加减标准差倍数
+        middle, upper, lower = bollinger_bands(prices, deviation)
 
         return {
             "middle": middle,
             "upper": upper,
             "lower": lower,
         }
+
+    def _cached_indicator(
+        self, key: Tuple, compute: Callable[[CandleBatch], Any]
+    ) -> Any:
+        """
+        按最新K线时间缓存指标值
+
+        缓存键包含仓库中最新K线的开盘时间，只需一次轻量查询即可判断是否命中；
+        有新K线入库后缓存键变化，旧值自然失效，不依赖本地时钟和时区。
+        已入库的K线不会被原地修改，同一开盘时间对应的K线窗口不变。
+
+        Args:
+            key: 指标参数组成的键，第2至5项依次为交易对、交易所ID、时间周期和周期数
+            compute: 缓存未命中时根据K线窗口计算指标的函数
+
+        Returns:
+            指标值
+        """
+        symbol, exchange_id, timeframe, periods = key[1:5]
+        latest = self._market_data_repository.get_latest_candle_timestamp(
+            symbol, exchange_id, timeframe
+        )
+        if latest is None:
+            return compute(
+                self.get_candle_batch(symbol, exchange_id, timeframe, limit=periods)
+            )
+
+        cache = self._indicator_cache
+        cache_key = key + (latest,)
+        if cache_key in cache:
+            cache.move_to_end(cache_key)
+            return cache[cache_key]
+
+        batch, complete = self._get_candle_batch_cached(
+            symbol, exchange_id, timeframe, periods, latest
+        )
+        value = compute(batch)
+        if complete:
+            cache[cache_key] = value
+            if len(cache) > self._indicator_cache_size:
+                cache.popitem(last=False)
+        return value
+
+    def _get_candle_batch_cached(
+        self,
+        symbol: str,
+        exchange_id: str,
+        timeframe: str,
+        periods: int,
+        latest: datetime,
+    ) -> Tuple[CandleBatch, bool]:
+        """
+        获取以最新K线结尾的K线窗口，同一窗口已查询过时直接复用
+
+        查询前后之间有新K线入库时，窗口不以latest结尾，照常返回但不缓存
+
+        Args:
+            symbol: 交易对，如 "BTC/USDT"
+            exchange_id: 交易所ID
+            timeframe: 时间周期，如 "1m", "5m", "1h", "1d"
+            periods: 窗口K线数量
+            latest: 最新K线的开盘时间
+
+        Returns:
+            (列式K线数据, 窗口是否以latest结尾)
+        """
+        cache = self._candle_cache
+        key = (symbol, exchange_id, timeframe, periods, latest)
+        batch = cache.get(key)
+        if batch is not None:
+            cache.move_to_end(key)
+            return batch, True
+
+        batch = self.get_candle_batch(symbol, exchange_id, timeframe, limit=periods)
+        complete = len(batch) > 0 and int(batch.timestamps[-1]) == _epoch_ns(latest)
+        if complete:
+            cache[key] = batch
+            if len(cache) > self._candle_cache_size:
+                cache.popitem(last=False)
+        return batch, complete
@@ -2,7 +2,7 @@
 订单服务，处理订单相关的领域逻辑
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from ..models.account import Account
 from ..models.order import Order, OrderParams, OrderSide, OrderStatus, OrderType
@@ -41,12 +41,30 @@ class OrderService:
 
         return order
 
-    def validate_order(self, order: Order) -> bool:
+    def submit_orders(self, orders: Iterable[Order]) -> List[Order]:
+        """
+        批量提交订单，在一次仓库调用中保存，由交易所适配器执行
+
+        Args:
+            orders: 订单列表
+
+        Returns:
+            已提交的订单列表
+        """
+        orders = list(orders)
+        self._order_repository.save_many(orders)
+
+        return orders
+
+    def validate_order(
+        self, order: Order, reference_price: Optional[float] = None
+    ) -> bool:
         """
         验证订单是否有效
 
         Args:
             order: 订单对象
+            reference_price: 参考价格，如最新成交价，用于估算没有价格的市价单所需金额
 
         Returns:
             订单是否有效
@@ -58,19 +76,26 @@ class OrderService:
 
         # 买入订单检查计价货币余额
         if order.params.side == OrderSide.BUY:
-            # 从交易对中提取计价货币，如BTC/USDT中的USDT
-            quote_currency = order.params.symbol.split("/")[1]
+            price = order.params.price
+            if price is None:
+                price = reference_price
+            if price is None:
+                # 市价单且没有参考价格，无法估算所需金额，只确认账户存在
+                return True
+
+            # 计价货币，如BTC/USDT中的USDT
+            quote_currency = order.params.quote_asset
 
             # 计算所需金额
-            required_amount = order.params.amount * (order.params.price or 0)
+            required_amount = order.params.amount * price
 
             # 检查余额是否足够
             return account.has_sufficient_balance(quote_currency, required_amount)
 
         # 卖出订单检查基础货币余额
         elif order.params.side == OrderSide.SELL:
-            # 从交易对中提取基础货币，如BTC/USDT中的BTC
-            base_currency = order.params.symbol.split("/")[0]
+            # 基础货币，如BTC/USDT中的BTC
+            base_currency = order.params.base_asset
 
             # 检查余额是否足够
             return account.has_sufficient_balance(base_currency, order.params.amount)
@@ -156,6 +181,25 @@ class OrderService:
 
         return True
 
+    def cancel_orders(self, order_ids: Iterable[str]) -> List[str]:
+        """
+        批量取消订单，一次查询所有订单并一次保存
+
+        Args:
+            order_ids: 订单ID列表
+
+        Returns:
+            成功取消的订单ID列表，不存在或已结束的订单不包含在内
+        """
+        orders = self._order_repository.find_many_by_ids(order_ids)
+
+        canceled = [order for order in orders.values() if not order.is_closed]
+        for order in canceled:
+            order.cancel()
+        self._order_repository.save_many(canceled)
+
+        return [order.id for order in canceled]
+
     def cancel_all_orders_by_strategy(self, strategy_id: str) -> int:
         """
         取消策略的所有未完成订单
@@ -167,14 +211,12 @@ class OrderService:
             成功取消的订单数量
         """
         orders = self._order_repository.find_open_by_strategy_id(strategy_id)
-        canceled_count = 0
 
         for order in orders:
             order.cancel()
-            self._order_repository.save(order)
-            canceled_count += 1
+        self._order_repository.save_many(orders)
 
-        return canceled_count
+        return len(orders)
 
     def cancel_all_orders_by_exchange(self, exchange_id: str) -> int:
         """
@@ -187,11 +229,9 @@ class OrderService:
             成功取消的订单数量
         """
         orders = self._order_repository.find_open_by_exchange_id(exchange_id)
-        canceled_count = 0
 
         for order in orders:
             order.cancel()
-            self._order_repository.save(order)
-            canceled_count += 1
+        self._order_repository.save_many(orders)
 
-        return canceled_count
+        return len(orders)
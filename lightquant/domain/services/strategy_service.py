@@ -2,7 +2,7 @@
 策略服务，处理策略相关的领域逻辑
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from ..models.strategy import Strategy, StrategyConfig, StrategyStatus
 from ..repositories.order_repository import OrderRepository
@@ -243,6 +243,60 @@ class StrategyService:
         self._strategy_repository.save(strategy)
         return True
 
+    def add_orders_to_strategy(
+        self, strategy_id: str, order_ids: Iterable[str]
+    ) -> bool:
+        """
+        批量将订单添加到策略，只加载和保存一次策略
+
+        Args:
+            strategy_id: 策略ID
+            order_ids: 订单ID列表
+
+        Returns:
+            是否成功添加，不存在的订单会被忽略
+        """
+        order_ids = list(order_ids)
+        if not order_ids:
+            return True
+
+        strategy = self._strategy_repository.find_by_id(strategy_id)
+        if not strategy:
+            return False
+
+        orders = self._order_repository.find_many_by_ids(order_ids)
+        if not orders:
+            return False
+
+        strategy.add_orders(order_id for order_id in order_ids if order_id in orders)
+        self._strategy_repository.save(strategy)
+        return True
+
+    def remove_orders_from_strategy(
+        self, strategy_id: str, order_ids: Iterable[str]
+    ) -> bool:
+        """
+        批量从策略中移除订单，只加载和保存一次策略
+
+        Args:
+            strategy_id: 策略ID
+            order_ids: 订单ID列表
+
+        Returns:
+            是否成功移除
+        """
+        order_ids = list(order_ids)
+        if not order_ids:
+            return True
+
+        strategy = self._strategy_repository.find_by_id(strategy_id)
+        if not strategy:
+            return False
+
+        strategy.remove_orders(order_ids)
+        self._strategy_repository.save(strategy)
+        return True
+
     def get_strategy_orders(self, strategy_id: str) -> List[str]:
         """
         获取策略的所有订单ID
@@ -5,11 +5,13 @@
 from .base_strategy import BaseStrategy
 from .strategy_context import StrategyContext
 from .strategy_engine import StrategyEngine
-from .strategy_result import StrategyResult
+from .strategy_result import EMPTY_RESULT, BulkStrategyResult, StrategyResult
 
 __all__ = [
     "StrategyEngine",
     "BaseStrategy",
     "StrategyContext",
     "StrategyResult",
+    "BulkStrategyResult",
+    "EMPTY_RESULT",
 ]
@@ -4,12 +4,17 @@
 
 import logging
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple, Type
+from itertools import chain
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple, Type
+
+import numpy as np
 
 from ..models.account import Account, Balance
-from ..models.market_data import Candle, OrderBook, Ticker
-from ..models.order import Order, OrderSide, OrderStatus, OrderType
+from ..models.market_data import Candle, CandleBatch, OrderBook, Ticker
+from ..models.order import Order, OrderParams, OrderSide, OrderStatus, OrderType
 from ..models.strategy import Strategy, StrategyConfig, StrategyStatus
 from ..repositories.account_repository import AccountRepository
 from ..risk_management import RiskManager
@@ -23,6 +28,28 @@ from .strategy_result import StrategyResult
 logger = logging.getLogger(__name__)
 
 
+def _simulate_fill(
+    side: int, amount: float, close: float, slippage: float, commission_rate: float
+) -> Tuple[float, float, float, float]:
+    """
+    模拟一笔以收盘价成交的订单
+
+    Args:
+        side: 订单方向，买入为1，卖出为-1
+        amount: 成交数量
+        close: 收盘价
+        slippage: 滑点
+        commission_rate: 手续费率
+
+    Returns:
+        (成交价格, 手续费, 计价货币变化量, 基础货币变化量)
+    """
+    execution_price = close * (1 + side * slippage)
+    value = amount * execution_price
+    fee = value * commission_rate
+    return execution_price, fee, -side * value - fee, side * amount
+
+
 class BacktestEngine:
     """
     回测引擎，用于在历史数据上测试策略
@@ -73,15 +100,22 @@ class BacktestEngine:
         # 策略上下文映射表：策略ID -> 策略上下文
         self.strategy_contexts: Dict[str, StrategyContext] = {}
 
+        # 第一个创建的策略上下文，账户快照使用其账户
+        self._primary_context: Optional[StrategyContext] = None
+
         # 策略类映射表：策略类名 -> 策略类
         self.strategy_classes: Dict[str, Type[BaseStrategy]] = {}
 
         # 回测数据
         self.account: Optional[Account] = None
-        self.orders: List[Order] = []
+        self.orders: Deque[Order] = deque()  # 已成交订单，只追加
         self.candles: Dict[str, Dict[str, List[Candle]]] = (
             {}
         )  # symbol -> timeframe -> candles
+        # 与 candles 对应的列式K线数据，在加载时构建
+        self.candle_batches: Dict[str, Dict[str, CandleBatch]] = (
+            {}
+        )  # symbol -> timeframe -> batch
         self.tickers: Dict[str, List[Ticker]] = {}  # symbol -> tickers
         self.orderbooks: Dict[str, List[OrderBook]] = {}  # symbol -> orderbooks
 
@@ -92,6 +126,20 @@ class BacktestEngine:
         )  # (timestamp, balances)
         self.performance_metrics: Dict[str, Any] = {}
 
+        # 最近一次账户快照的余额，以及之后余额有变化的资产
+        self._snapshot_balances: Dict[str, float] = {}
+        self._dirty_currencies: Set[str] = set()
+
+        # 每笔成交的已实现盈亏，以及按交易对记录的持仓 (数量, 总成本)
+        self._pnl_list: List[float] = []
+        self._positions: Dict[str, Tuple[float, float]] = {}
+
+        # 交易对 -> 回放到当前时间为止最新的1小时K线收盘价
+        self._latest_close: Dict[str, float] = {}
+
+        # 资产 -> 以USDT计价的交易对，计算权益时复用
+        self._quote_symbol_cache: Dict[str, str] = {}
+
         # 回测状态
         self.is_running = False
         self.current_time: datetime = datetime.utcnow()
@@ -108,7 +156,7 @@ class BacktestEngine:
         """
         class_name = strategy_class.__name__
         self.strategy_classes[class_name] = strategy_class
-        logger.info(f"注册策略类: {class_name}")
+        logger.info("注册策略类: %s", class_name)
 
     def create_strategy(
         self, strategy_class: Type[BaseStrategy], config: StrategyConfig
@@ -152,11 +200,17 @@ class BacktestEngine:
             # 保存策略ID
             self.strategy_id = strategy.id
 
-            logger.info(f"创建回测策略: {strategy.id}, 名称: {config.name}")
+            # 登记策略实例和上下文
+            self.strategy_instances[strategy.id] = self.strategy_instance
+            self.strategy_contexts[strategy.id] = self.strategy_context
+            if self._primary_context is None:
+                self._primary_context = self.strategy_context
+
+            logger.info("创建回测策略: %s, 名称: %s", strategy.id, config.name)
             return strategy.id
 
         except Exception as e:
-            logger.error(f"创建回测策略失败: {e}")
+            logger.error("创建回测策略失败: %s", e)
             return None
 
     def _create_backtest_account(self, exchange_id: str) -> Account:
@@ -169,18 +223,9 @@ class BacktestEngine:
         Returns:
             账户对象
         """
-        # 创建初始余额
-        balances = {
-            "USDT": Balance(
-                currency="USDT",
-                free=self.initial_capital,
-                used=0.0,
-                total=self.initial_capital,
-            )
-        }
-
-        # 创建账户
-        account = Account(exchange_id=exchange_id, balances=balances)
+        # 创建账户和初始余额
+        account = Account(exchange_id=exchange_id)
+        account.balances["USDT"] = Balance(asset="USDT", free=self.initial_capital)
 
         return account
 
@@ -202,14 +247,61 @@ class BacktestEngine:
         candles = self.market_data_service.get_historical_candles(
             symbol=symbol, timeframe=timeframe, since=start_time, until=end_time
         )
+        self._store_candles(symbol, timeframe, candles)
+        return candles
+
+    def load_candles_batch(
+        self,
+        pairs: List[Tuple[str, str]],
+        start_time: datetime,
+        end_time: datetime,
+        max_workers: int = 8,
+    ) -> Dict[Tuple[str, str], List[Candle]]:
+        """
+        并发加载多组K线数据，总耗时取决于最慢的一次查询而不是所有查询之和
+
+        Args:
+            pairs: (交易对, 时间周期) 列表
+            start_time: 开始时间
+            end_time: 结束时间
+            max_workers: 最大并发数
+
+        Returns:
+            K线数据字典，键为 (交易对, 时间周期)
+        """
+        if not pairs:
+            return {}
 
-        if symbol not in self.candles:
-            self.candles[symbol] = {}
+        def fetch(pair: Tuple[str, str]) -> List[Candle]:
+            symbol, timeframe = pair
+            return self.market_data_service.get_historical_candles(
+                symbol=symbol, timeframe=timeframe, since=start_time, until=end_time
+            )
 
-        self.candles[symbol][timeframe] = candles
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as executor:
+            results = dict(zip(pairs, executor.map(fetch, pairs)))
 
-        logger.info(f"加载K线数据: {symbol} {timeframe}, 数量: {len(candles)}")
-        return candles
+        for (symbol, timeframe), candles in results.items():
+            self._store_candles(symbol, timeframe, candles)
+        return results
+
+    def _store_candles(
+        self, symbol: str, timeframe: str, candles: List[Candle]
+    ) -> None:
+        """
+        保存加载的K线数据，并构建对应的列式数据
+
+        Args:
+            symbol: 交易对
+            timeframe: 时间周期
+            candles: K线数据列表
+        """
+        self.candles.setdefault(symbol, {})[timeframe] = candles
+        self.candle_batches.setdefault(symbol, {})[timeframe] = (
+            CandleBatch.from_candles(candles, symbol, timeframe=timeframe)
+        )
+
+        logger.debug("加载K线数据: %s %s, 数量: %d", symbol, timeframe, len(candles))
 
     def initialize_strategy(self, strategy_id: str) -> bool:
         """
@@ -222,7 +314,7 @@ class BacktestEngine:
             是否成功初始化
         """
         if strategy_id not in self.strategy_instances:
-            logger.error(f"找不到策略实例: {strategy_id}")
+            logger.error("找不到策略实例: %s", strategy_id)
             return False
 
         try:
@@ -230,11 +322,11 @@ class BacktestEngine:
             strategy_instance.initialize()
             strategy_instance.is_initialized = True
 
-            logger.info(f"初始化策略: {strategy_id}")
+            logger.info("初始化策略: %s", strategy_id)
             return True
 
         except Exception as e:
-            logger.error(f"初始化策略失败: {strategy_id}, 错误: {e}")
+            logger.error("初始化策略失败: %s, 错误: %s", strategy_id, e)
             return False
 
     def _process_order(self, order: Order, candle: Candle) -> None:
@@ -250,15 +342,13 @@ class BacktestEngine:
 
         # 进行风险检查
         if self.risk_manager and not self.risk_manager.check_order(order, self.account):
-            logger.warning(f"订单被风险管理器拒绝: 订单ID={order.id}")
+            logger.warning("订单被风险管理器拒绝: 订单ID=%s", order.id)
             order.reject("风险控制规则拒绝")
+            self._close_open_order(order)
             return
 
-        # 只处理未成交的订单
-        if (
-            order.status != OrderStatus.OPEN
-            and order.status != OrderStatus.PARTIALLY_FILLED
-        ):
+        # 只处理未完成的订单，回测中没有交易所，待提交的订单也直接撮合
+        if order.is_closed:
             return
 
         # 获取策略上下文
@@ -269,66 +359,105 @@ class BacktestEngine:
         # 获取账户
         account = context.account
 
-        # 计算执行价格（考虑滑点）
-        execution_price = candle.close
-        if order.side == OrderSide.BUY:
-            execution_price *= 1 + self.slippage
+        # 模拟成交：以收盘价加滑点全部成交
+        params = order.params
+        amount = order.remaining_amount
+        execution_price, fee, quote_delta, base_delta = _simulate_fill(
+            1 if params.side == OrderSide.BUY else -1,
+            amount,
+            candle.close,
+            self.slippage,
+            self.commission_rate,
+        )
+
+        # 更新订单状态
+        order.fill(amount, execution_price, trade_id=f"backtest-{order.id}")
+        context.close_order(order)
+
+        # 更新账户余额
+        base_currency = params.base_asset
+        quote_currency = params.quote_asset
+        self._dirty_currencies.add(base_currency)
+        self._dirty_currencies.add(quote_currency)
+
+        # 每种货币只查找一次余额对象；total由free和locked推导，只需更新free
+        balances = account.balances
+        if params.side == OrderSide.BUY:
+            # 买入：减少计价货币，增加基础货币
+            debit, credit = quote_currency, base_currency
+            debit_delta, credit_delta = quote_delta, base_delta
         else:
-            execution_price *= 1 - self.slippage
+            # 卖出：减少基础货币，增加计价货币
+            debit, credit = base_currency, quote_currency
+            debit_delta, credit_delta = base_delta, quote_delta
 
-        # 计算手续费
-        fee = order.amount * execution_price * self.commission_rate
+        debit_balance = balances.get(debit)
+        if debit_balance is not None:
+            debit_balance.free += debit_delta
 
-        # 更新订单状态
-        order.fill(
-            price=execution_price, filled=order.amount, fee=fee, fee_currency="USDT"
+        credit_balance = balances.get(credit)
+        if credit_balance is None:
+            credit_balance = balances[credit] = Balance(asset=credit, free=0.0)
+        credit_balance.free += credit_delta
+
+        # 添加到订单列表，同时记录本次成交的已实现盈亏
+        self.orders.append(order)
+        self._pnl_list.append(
+            self._realize_pnl(params.symbol, params.side, amount, execution_price, fee)
         )
 
-        # 更新账户余额
-        base_currency, quote_currency = order.symbol.split("/")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "执行订单: %s, 价格: %s, 数量: %s, 手续费: %s",
+                order.id,
+                execution_price,
+                amount,
+                fee,
+            )
 
-        if order.side == OrderSide.BUY:
-            # 买入：减少计价货币，增加基础货币
-            if quote_currency in account.balances:
-                account.balances[quote_currency].free -= (
-                    order.amount * execution_price + fee
-                )
-                account.balances[quote_currency].total -= (
-                    order.amount * execution_price + fee
-                )
+    def _realize_pnl(
+        self, symbol: str, side: OrderSide, amount: float, price: float, fee: float
+    ) -> float:
+        """
+        按平均成本法更新持仓，并计算一笔成交的已实现盈亏
 
-            if base_currency not in account.balances:
-                account.balances[base_currency] = Balance(
-                    currency=base_currency, free=0.0, used=0.0, total=0.0
-                )
+        买入的手续费计入持仓成本，已实现盈亏为0；卖出时按平均成本结算平仓部分，
+        并扣除手续费
 
-            account.balances[base_currency].free += order.amount
-            account.balances[base_currency].total += order.amount
+        Args:
+            symbol: 交易对
+            side: 订单方向
+            amount: 成交数量
+            price: 成交价格
+            fee: 手续费
 
-        else:
-            # 卖出：减少基础货币，增加计价货币
-            if base_currency in account.balances:
-                account.balances[base_currency].free -= order.amount
-                account.balances[base_currency].total -= order.amount
+        Returns:
+            已实现盈亏
+        """
+        position, cost = self._positions.get(symbol, (0.0, 0.0))
 
-            if quote_currency not in account.balances:
-                account.balances[quote_currency] = Balance(
-                    currency=quote_currency, free=0.0, used=0.0, total=0.0
-                )
+        if side == OrderSide.BUY:
+            self._positions[symbol] = (position + amount, cost + amount * price + fee)
+            return 0.0
 
-            account.balances[quote_currency].free += (
-                order.amount * execution_price - fee
-            )
-            account.balances[quote_currency].total += (
-                order.amount * execution_price - fee
-            )
+        closed = min(amount, position)
+        if closed <= 0:
+            return -fee
 
-        # 添加到订单列表
-        self.orders.append(order)
+        average_cost = cost / position
+        self._positions[symbol] = (position - closed, cost - average_cost * closed)
+        return (price - average_cost) * closed - fee
 
-        logger.info(
-            f"执行订单: {order.id}, 价格: {execution_price}, 数量: {order.amount}, 手续费: {fee}"
-        )
+    def _close_open_order(self, order: Order) -> None:
+        """
+        将已结束的订单移到策略上下文的已结束订单
+
+        Args:
+            order: 订单对象
+        """
+        context = self.strategy_contexts.get(order.strategy_id)
+        if context:
+            context.close_order(order)
 
     def _update_account_snapshot(self, timestamp: datetime) -> None:
         """
@@ -338,16 +467,27 @@ class BacktestEngine:
             timestamp: 时间戳
         """
         # 获取第一个策略的上下文
-        if not self.strategy_contexts:
+        context = self._primary_context
+        if context is None:
             return
 
-        context = next(iter(self.strategy_contexts.values()))
         account = context.account
 
-        # 创建余额快照
-        balances = {}
-        for currency, balance in account.balances.items():
-            balances[currency] = balance.total
+        # 创建余额快照：只刷新上次快照后有成交的资产，没有成交时复用上一份快照，
+        # 因此快照中的余额字典应视为只读
+        dirty = self._dirty_currencies
+        if dirty:
+            balances = dict(self._snapshot_balances)
+            for currency in dirty:
+                balance = account.balances.get(currency)
+                if balance is None:
+                    balances.pop(currency, None)
+                else:
+                    balances[currency] = balance.total
+            dirty.clear()
+            self._snapshot_balances = balances
+        else:
+            balances = self._snapshot_balances
 
         # 添加到快照列表
         self.account_snapshots.append((timestamp, balances))
@@ -359,12 +499,12 @@ class BacktestEngine:
                 equity += amount
             else:
                 # 获取最新价格
-                symbol = f"{currency}/USDT"
-                if symbol in self.candles and "1h" in self.candles[symbol]:
-                    candles = self.candles[symbol]["1h"]
-                    if candles:
-                        latest_price = candles[-1].close
-                        equity += amount * latest_price
+                symbol = self._quote_symbol_cache.get(currency)
+                if symbol is None:
+                    symbol = self._quote_symbol_cache[currency] = f"{currency}/USDT"
+                latest_price = self._latest_close.get(symbol)
+                if latest_price is not None:
+                    equity += amount * latest_price
 
         # 添加到权益曲线
         self.equity_curve.append((timestamp, equity))
@@ -384,13 +524,13 @@ class BacktestEngine:
             回测结果
         """
         if strategy_id not in self.strategy_instances:
-            logger.error(f"找不到策略实例: {strategy_id}")
+            logger.error("找不到策略实例: %s", strategy_id)
             return {}
 
         # 获取策略
         strategy = self.strategy_service.get_strategy(strategy_id)
         if not strategy:
-            logger.error(f"找不到策略: {strategy_id}")
+            logger.error("找不到策略: %s", strategy_id)
             return {}
 
         # 获取策略实例和上下文
@@ -407,29 +547,225 @@ class BacktestEngine:
         self.current_time = start_time
 
         # 清空回测结果
-        self.orders = []
+        self.orders = deque()
         self.account_snapshots = []
         self.equity_curve = []
+        self.performance_metrics = {}
+        self._pnl_list = []
+        self._positions = {}
+        self._latest_close = {}
+        self._snapshot_balances = {}
+        self._dirty_currencies = set(context.account.balances)
+        if self.risk_manager:
+            self.risk_manager.clear_last_prices()
 
         # 获取所有交易对和时间周期
         symbols = strategy.config.symbols
         timeframes = strategy.config.timeframes
 
-        # 加载所有K线数据
-        for symbol in symbols:
-            for timeframe in timeframes:
-                if symbol not in self.candles or timeframe not in self.candles[symbol]:
-                    self.load_candles(symbol, timeframe, start_time, end_time)
+        # 并发加载所有尚未加载的K线数据
+        self.load_candles_batch(
+            [
+                (symbol, timeframe)
+                for symbol in symbols
+                for timeframe in timeframes
+                if symbol not in self.candles or timeframe not in self.candles[symbol]
+            ],
+            start_time,
+            end_time,
+        )
 
-        # 按时间排序所有K线
-        all_candles = []
+        # 单交易对、单时间周期的策略优先尝试向量化回测
+        if len(symbols) == 1 and len(timeframes) == 1:
+            vectorized = self._run_vectorized(
+                strategy_instance, context, symbols[0], timeframes[0], start_time
+            )
+        else:
+            vectorized = False
+
+        if not vectorized:
+            self._run_event_loop(
+                strategy_id, strategy_instance, context, symbols, timeframes, start_time
+            )
+
+        # 计算性能指标
+        performance_metrics = self._calculate_performance_metrics()
+        self.performance_metrics = performance_metrics
+
+        # 更新策略性能指标
+        self.strategy_service.update_strategy_performance(
+            strategy_id, performance_metrics
+        )
+
+        # 设置回测状态
+        self.is_running = False
+
+        logger.info(
+            "回测完成: 策略ID=%s, 开始时间=%s, 结束时间=%s",
+            strategy_id,
+            start_time,
+            end_time,
+        )
+
+        # 返回回测结果
+        return {
+            "strategy_id": strategy_id,
+            "start_time": start_time,
+            "end_time": end_time,
+            "orders": list(self.orders),
+            "equity_curve": self.equity_curve,
+            "performance_metrics": performance_metrics,
+        }
+
+    def _run_vectorized(
+        self,
+        strategy_instance: BaseStrategy,
+        context: StrategyContext,
+        symbol: str,
+        timeframe: str,
+        start_time: datetime,
+    ) -> bool:
+        """
+        向量化回测：由策略一次给出全部目标持仓，用NumPy计算每根K线的成交量
+
+        目标持仓的变化量在对应K线收盘时以市价单成交，成交、余额、已实现盈亏和
+        账户快照与逐根K线回测使用同一套记账逻辑，回测结果与逐根K线回测一致
+
+        Args:
+            strategy_instance: 策略实例
+            context: 策略上下文
+            symbol: 交易对
+            timeframe: 时间周期
+            start_time: 开始时间
+
+        Returns:
+            策略是否支持向量化回测，不支持时需要逐根K线回测
+        """
+        batch = self.candle_batches.get(symbol, {}).get(timeframe)
+        if batch is None or not len(batch):
+            return False
+
+        # 风险规则需要逐笔检查订单，被拒绝的订单会改变之后的持仓，退回逐根K线回测
+        if self.risk_manager and any(
+            rule.enabled for rule in self.risk_manager.rules.values()
+        ):
+            return False
+
+        positions = strategy_instance.on_candles_vectorized(batch)
+        if positions is None:
+            return False
+
+        positions = np.asarray(positions, dtype=np.float64)
+        if positions.shape != (len(batch),):
+            raise ValueError(
+                f"on_candles_vectorized 返回的目标持仓形状为 {positions.shape}，"
+                f"应为与K线数量一致的一维数组 ({len(batch)},)"
+            )
+        if not np.isfinite(positions).all():
+            raise ValueError("on_candles_vectorized 返回的目标持仓包含NaN或无穷大")
+
+        # 每根K线收盘时按目标持仓的变化量下单
+        trades = np.diff(positions, prepend=0.0).tolist()
+        strategy_id = context.strategy_id
+        exchange_id = context.account.exchange_id
+        track_close = timeframe == "1h"
+
+        self._update_account_snapshot(start_time)
+
+        for candle, trade in zip(self.candles[symbol][timeframe], trades):
+            self.current_time = candle.timestamp
+            if track_close:
+                self._latest_close[symbol] = candle.close
+
+            if trade:
+                order = self.order_service.create_order(
+                    OrderParams(
+                        symbol=symbol,
+                        order_type=OrderType.MARKET,
+                        side=OrderSide.BUY if trade > 0 else OrderSide.SELL,
+                        amount=abs(trade),
+                    ),
+                    strategy_id,
+                    exchange_id,
+                )
+                self._process_order(order, candle)
+
+            self._update_account_snapshot(candle.timestamp)
+
+        context.update_current_time(self.current_time)
+
+        logger.info(
+            "向量化回测完成: %s %s, K线数量: %d, 成交次数: %d",
+            symbol,
+            timeframe,
+            len(batch),
+            len(self.orders),
+        )
+        return True
+
+    def _merge_candles(
+        self, symbols: List[str], timeframes: List[str]
+    ) -> Iterator[Candle]:
+        """
+        按时间顺序归并多个交易对、时间周期的K线
+
+        排序使用加载时构建的int64纳秒时间戳，而不是逐对比较datetime；
+        稳定排序保证时间相同的K线保持交易对、时间周期的先后顺序
+
+        Args:
+            symbols: 交易对列表
+            timeframes: 时间周期列表
+
+        Returns:
+            按时间排序的K线迭代器
+        """
+        streams = []
+        timestamps = []
         for symbol in symbols:
             for timeframe in timeframes:
-                if symbol in self.candles and timeframe in self.candles[symbol]:
-                    for candle in self.candles[symbol][timeframe]:
-                        all_candles.append(candle)
+                candles = self.candles.get(symbol, {}).get(timeframe)
+                if not candles:
+                    continue
+                batch = self.candle_batches.get(symbol, {}).get(timeframe)
+                if batch is None:
+                    batch = CandleBatch.from_candles(
+                        candles, symbol, timeframe=timeframe
+                    )
+                streams.append(candles)
+                timestamps.append(batch.timestamps)
+
+        if len(streams) == 1:
+            return iter(streams[0])
+
+        all_candles = list(chain.from_iterable(streams))
+        if not all_candles:
+            return iter(all_candles)
+
+        order = np.argsort(np.concatenate(timestamps), kind="stable")
+        return map(all_candles.__getitem__, order.tolist())
+
+    def _run_event_loop(
+        self,
+        strategy_id: str,
+        strategy_instance: BaseStrategy,
+        context: StrategyContext,
+        symbols: List[str],
+        timeframes: List[str],
+        start_time: datetime,
+    ) -> None:
+        """
+        逐根K线回测：按时间顺序回放K线，模拟订单成交并记录账户快照
 
-        all_candles.sort(key=lambda c: c.timestamp)
+        Args:
+            strategy_id: 策略ID
+            strategy_instance: 策略实例
+            context: 策略上下文
+            symbols: 交易对列表
+            timeframes: 时间周期列表
+            start_time: 开始时间
+        """
+        # 按时间顺序归并所有K线
+        all_candles = self._merge_candles(symbols, timeframes)
 
         # 初始化账户快照
         self._update_account_snapshot(start_time)
@@ -439,16 +775,16 @@ class BacktestEngine:
             # 更新当前时间
             self.current_time = candle.timestamp
             context.update_current_time(self.current_time)
+            if candle.timeframe == "1h":
+                self._latest_close[candle.symbol] = candle.close
 
             # 更新风险管理器上下文
             if self.risk_manager:
-                ticker_context = {"ticker": {candle.symbol: {"last": candle.close}}}
-                self.risk_manager.update_context(ticker_context)
+                self.risk_manager.update_last_price(candle.symbol, candle.close)
 
             # 处理未完成的订单
-            for order_id, order in list(context.orders.items()):
-                if order.status == OrderStatus.OPEN:
-                    self._process_order(order, candle)
+            for order in list(context.open_orders.values()):
+                self._process_order(order, candle)
 
             # 处理K线
             try:
@@ -466,34 +802,9 @@ class BacktestEngine:
                 self._update_account_snapshot(candle.timestamp)
 
             except Exception as e:
-                logger.error(f"处理K线数据失败: 策略ID={strategy_id}, 错误: {e}")
+                logger.error("处理K线数据失败: 策略ID=%s, 错误: %s", strategy_id, e)
                 break
 
-        # 计算性能指标
-        performance_metrics = self._calculate_performance_metrics()
-
-        # 更新策略性能指标
-        self.strategy_service.update_strategy_performance(
-            strategy_id, performance_metrics
-        )
-
-        # 设置回测状态
-        self.is_running = False
-
-        logger.info(
-            f"回测完成: 策略ID={strategy_id}, 开始时间={start_time}, 结束时间={end_time}"
-        )
-
-        # 返回回测结果
-        return {
-            "strategy_id": strategy_id,
-            "start_time": start_time,
-            "end_time": end_time,
-            "orders": self.orders,
-            "equity_curve": self.equity_curve,
-            "performance_metrics": performance_metrics,
-        }
-
     def _calculate_performance_metrics(self) -> Dict[str, Any]:
         """
         计算性能指标
@@ -505,52 +816,49 @@ class BacktestEngine:
             return {}
 
         # 提取权益数据
-        timestamps = [t for t, _ in self.equity_curve]
-        equity_values = [e for _, e in self.equity_curve]
+        start_time = self.equity_curve[0][0]
+        end_time = self.equity_curve[-1][0]
+        equity_values = np.fromiter(
+            (e for _, e in self.equity_curve),
+            dtype=np.float64,
+            count=len(self.equity_curve),
+        )
 
         # 计算收益率
-        initial_equity = equity_values[0]
-        final_equity = equity_values[-1]
+        initial_equity = float(equity_values[0])
+        final_equity = float(equity_values[-1])
         total_return = (final_equity - initial_equity) / initial_equity
 
         # 计算年化收益率
-        days = (timestamps[-1] - timestamps[0]).days
+        days = (end_time - start_time).days
         if days > 0:
             annual_return = (1 + total_return) ** (365 / days) - 1
         else:
             annual_return = 0.0
 
-        # 计算最大回撤
-        max_drawdown = 0.0
-        peak_value = equity_values[0]
-
-        for equity in equity_values:
-            if equity > peak_value:
-                peak_value = equity
-            else:
-                drawdown = (peak_value - equity) / peak_value
-                max_drawdown = max(max_drawdown, drawdown)
+        # 计算最大回撤，峰值非正时回撤记为0，避免除零产生inf或nan
+        peak_values = np.maximum.accumulate(equity_values)
+        drawdowns = np.divide(
+            peak_values - equity_values,
+            peak_values,
+            out=np.zeros_like(equity_values),
+            where=peak_values > 0,
+        )
+        max_drawdown = float(drawdowns.max())
 
         # 计算夏普比率
         if len(equity_values) > 1:
             # 计算日收益率
-            daily_returns = []
-            for i in range(1, len(equity_values)):
-                daily_return = (
-                    equity_values[i] - equity_values[i - 1]
-                ) / equity_values[i - 1]
-                daily_returns.append(daily_return)
+            daily_returns = np.diff(equity_values) / equity_values[:-1]
 
             # 计算平均收益率和标准差
-            avg_return = sum(daily_returns) / len(daily_returns)
-            std_return = (
-                sum((r - avg_return) ** 2 for r in daily_returns) / len(daily_returns)
-            ) ** 0.5
+            avg_return = daily_returns.mean()
+            std_return = daily_returns.std()
 
             # 计算夏普比率（假设无风险利率为0）
             if std_return > 0:
-                sharpe_ratio = (avg_return / std_return) * (
-                    252**0.5
+                sharpe_ratio = float(
+                    (avg_return / std_return) * (252**0.5)
                 )  # 假设一年252个交易日
             else:
                 sharpe_ratio = 0.0
@@ -559,28 +867,17 @@ class BacktestEngine:
 
         # 计算交易统计
         total_trades = len(self.orders)
-        winning_trades = sum(1 for order in self.orders if order.realized_pnl > 0)
-        losing_trades = sum(1 for order in self.orders if order.realized_pnl < 0)
+        pnl = np.asarray(self._pnl_list, dtype=np.float64)
+        profits = pnl[pnl > 0]
+        losses = pnl[pnl < 0]
+        winning_trades = len(profits)
+        losing_trades = len(losses)
 
         win_rate = winning_trades / total_trades if total_trades > 0 else 0.0
 
         # 计算平均盈亏比
-        avg_profit = (
-            sum(order.realized_pnl for order in self.orders if order.realized_pnl > 0)
-            / winning_trades
-            if winning_trades > 0
-            else 0.0
-        )
-        avg_loss = (
-            sum(
-                abs(order.realized_pnl)
-                for order in self.orders
-                if order.realized_pnl < 0
-            )
-            / losing_trades
-            if losing_trades > 0
-            else 0.0
-        )
+        avg_profit = float(profits.mean()) if winning_trades > 0 else 0.0
+        avg_loss = float(-losses.mean()) if losing_trades > 0 else 0.0
 
         profit_loss_ratio = avg_profit / avg_loss if avg_loss > 0 else 0.0
 
@@ -614,7 +911,7 @@ class BacktestEngine:
         Returns:
             订单列表
         """
-        return self.orders
+        return list(self.orders)
 
     def get_performance_metrics(self) -> Dict[str, Any]:
         """
@@ -623,7 +920,7 @@ class BacktestEngine:
         Returns:
             性能指标字典
         """
-        return self._calculate_performance_metrics()
+        return self.performance_metrics or self._calculate_performance_metrics()
 
     def set_initial_capital(self, capital: float) -> None:
         """
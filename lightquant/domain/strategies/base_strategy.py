@@ -3,9 +3,11 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
 
-from ..models.market_data import Candle, OrderBook, Ticker
+import numpy as np
+
+from ..models.market_data import Candle, CandleBatch, OrderBook, Ticker
 from ..models.order import Order, OrderSide, OrderType
 from ..models.strategy import StrategyConfig
 from .strategy_context import StrategyContext
@@ -25,6 +27,30 @@ class BaseStrategy(ABC):
     6. 清理资源（cleanup）
     """
 
+    # 子类是否覆盖了可选的行情回调，在子类定义时计算；
+    # 未覆盖时引擎只更新上下文，不调用回调
+    has_on_ticker: bool = False
+    has_on_orderbook: bool = False
+
+    # 子类未声明__slots__时仍会有__dict__，可以自由添加属性
+    __slots__ = (
+        "config",
+        "context",
+        "parameters",
+        "is_initialized",
+        "_symbols_fs",
+        "_timeframes_fs",
+        "_on_candle",
+        "_on_ticker",
+        "_on_orderbook",
+        "_on_order_update",
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.has_on_ticker = cls.on_ticker is not BaseStrategy.on_ticker
+        cls.has_on_orderbook = cls.on_orderbook is not BaseStrategy.on_orderbook
+
     def __init__(self, config: StrategyConfig):
         """
         初始化策略
@@ -37,6 +63,21 @@ class BaseStrategy(ABC):
         self.parameters: Dict[str, Any] = config.params
         self.is_initialized = False
 
+        # 订阅的交易对和时间周期，创建时缓存为集合，成员检查为O(1)
+        self._symbols_fs: FrozenSet[str] = frozenset(config.symbols)
+        self._timeframes_fs: FrozenSet[str] = frozenset(config.timeframes)
+
+        # 引擎调用的回调，创建时绑定为方法对象，行情分发时不再逐次查找方法；
+        # 未覆盖的可选回调为None
+        self._on_candle: Callable[[Candle], StrategyResult] = self.on_candle
+        self._on_ticker: Optional[Callable[[Ticker], StrategyResult]] = (
+            self.on_ticker if self.has_on_ticker else None
+        )
+        self._on_orderbook: Optional[Callable[[OrderBook], StrategyResult]] = (
+            self.on_orderbook if self.has_on_orderbook else None
+        )
+        self._on_order_update: Callable[[Order], None] = self.on_order_update
+
     def set_context(self, context: StrategyContext) -> None:
         """
         设置策略上下文
@@ -46,6 +87,32 @@ class BaseStrategy(ABC):
         """
         self.context = context
 
+    @property
+    def subscribed_symbols(self) -> FrozenSet[str]:
+        """订阅的交易对集合"""
+        return self._symbols_fs
+
+    @property
+    def subscribed_timeframes(self) -> FrozenSet[str]:
+        """订阅的时间周期集合"""
+        return self._timeframes_fs
+
+    def is_subscribed(self, symbol: str, timeframe: Optional[str] = None) -> bool:
+        """
+        检查策略是否订阅了指定的交易对和时间周期
+
+        Args:
+            symbol: 交易对
+            timeframe: 时间周期，为None时只检查交易对
+
+        Returns:
+            是否已订阅
+        """
+        if symbol not in self._symbols_fs:
+            return False
+
+        return timeframe is None or timeframe in self._timeframes_fs
+
     @abstractmethod
     def initialize(self) -> None:
         """
@@ -67,6 +134,23 @@ class BaseStrategy(ABC):
         """
         pass
 
+    def on_candles_vectorized(self, batch: CandleBatch) -> Optional[np.ndarray]:
+        """
+        向量化回测钩子，一次处理完整的K线序列
+
+        只交易单个交易对、单个时间周期的策略可以实现此方法，回测引擎按目标持仓的
+        变化量在每根K线收盘时成交，不再逐根K线调用 on_candle；
+        启用了风险规则时仍逐根K线回测
+
+        Args:
+            batch: 回测区间内的全部K线，按时间升序排列
+
+        Returns:
+            每根K线收盘时的目标持仓（以基础货币计），长度与K线数量相同；
+            返回None表示不支持向量化回测
+        """
+        return None
+
     def on_ticker(self, ticker: Ticker) -> StrategyResult:
         """
         处理Ticker数据
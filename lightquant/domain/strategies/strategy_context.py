@@ -2,16 +2,35 @@
 策略上下文，提供策略运行时的环境和服务
 """
 
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import logging
+from collections import ChainMap, OrderedDict
+from datetime import datetime, timedelta
+from time import time_ns
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from ..models.account import Account
-from ..models.market_data import Candle, OrderBook, Ticker
+from ..models.market_data import (
+    _EPOCH,
+    Candle,
+    CandleBatch,
+    CandleRingBuffer,
+    OrderBook,
+    Ticker,
+    _epoch_ns,
+)
 from ..models.order import Order, OrderSide, OrderType
 from ..risk_management import RiskManager
 from ..services.market_data_service import MarketDataService
 from ..services.order_service import OrderService
 
+logger = logging.getLogger(__name__)
+
+# 每个交易对、时间周期缓存的K线数量
+CANDLE_BUFFER_SIZE = 1000
+
+# 最多保留的已结束订单数量，超出时淘汰最久未访问的订单
+CLOSED_ORDERS_MAX = 10_000
+
 
 class StrategyContext:
     """
@@ -26,6 +45,22 @@ class StrategyContext:
     6. 风险管理器：用于控制交易风险
     """
 
+    __slots__ = (
+        "strategy_id",
+        "order_service",
+        "market_data_service",
+        "account",
+        "risk_manager",
+        "is_backtest",
+        "candles",
+        "tickers",
+        "orderbooks",
+        "current_time_ns",
+        "open_orders",
+        "closed_orders",
+        "performance_metrics",
+    )
+
     def __init__(
         self,
         strategy_id: str,
@@ -54,19 +89,34 @@ class StrategyContext:
         self.is_backtest = is_backtest
 
         # 市场数据缓存
-        self.candles: Dict[str, Dict[str, List[Candle]]] = (
+        self.candles: Dict[Tuple[str, str], CandleRingBuffer] = (
             {}
-        )  # symbol -> timeframe -> candles
+        )  # (symbol, timeframe) -> 列式K线环形缓冲区，首次更新时创建
         self.tickers: Dict[str, Ticker] = {}  # symbol -> ticker
         self.orderbooks: Dict[str, OrderBook] = {}  # symbol -> orderbook
 
         # 运行时信息
-        self.current_time: datetime = datetime.utcnow()
-        self.orders: Dict[str, Order] = {}  # order_id -> order
+        self.current_time_ns: int = time_ns()  # 当前时间，UTC纳秒时间戳
+        # 未完成订单和已结束订单分开存放，每笔订单结束时只移动一次，
+        # 逐K线扫描的未完成订单字典因此保持很小
+        self.open_orders: Dict[str, Order] = {}  # order_id -> 未完成的订单
+        self.closed_orders: Dict[str, Order] = (
+            OrderedDict()
+        )  # order_id -> 已结束的订单，按LRU顺序淘汰
 
         # 性能指标
         self.performance_metrics: Dict[str, Any] = {}
 
+    @property
+    def orders(self) -> ChainMap:
+        """
+        全部订单的合并视图（order_id -> order），依次查找未完成和已结束的订单
+
+        Returns:
+            合并未完成订单和已结束订单的ChainMap
+        """
+        return ChainMap(self.open_orders, self.closed_orders)
+
     def create_order(
         self,
         symbol: str,
@@ -90,10 +140,6 @@ class StrategyContext:
         Returns:
             创建的订单，如果创建失败则返回None
         """
-        import logging
-
-        logger = logging.getLogger(__name__)
-
         order = self.order_service.create_order(
             strategy_id=self.strategy_id,
             symbol=symbol,
@@ -110,17 +156,31 @@ class StrategyContext:
                 order, self.account
             ):
                 logger.warning(
-                    f"订单被风险管理器拒绝: 策略ID={self.strategy_id}, 订单ID={order.id}, 交易对={symbol}, 方向={side}, 数量={amount}"
+                    "订单被风险管理器拒绝: 策略ID=%s, 订单ID=%s, 交易对=%s, 方向=%s, 数量=%s",
+                    self.strategy_id,
+                    order.id,
+                    symbol,
+                    side,
+                    amount,
                 )
                 return None
 
-            self.orders[order.id] = order
+            self.open_orders[order.id] = order
             logger.info(
-                f"订单已创建: 策略ID={self.strategy_id}, 订单ID={order.id}, 交易对={symbol}, 方向={side}, 数量={amount}"
+                "订单已创建: 策略ID=%s, 订单ID=%s, 交易对=%s, 方向=%s, 数量=%s",
+                self.strategy_id,
+                order.id,
+                symbol,
+                side,
+                amount,
             )
         else:
             logger.error(
-                f"创建订单失败: 策略ID={self.strategy_id}, 交易对={symbol}, 方向={side}, 数量={amount}"
+                "创建订单失败: 策略ID=%s, 交易对=%s, 方向=%s, 数量=%s",
+                self.strategy_id,
+                symbol,
+                side,
+                amount,
             )
 
         return order
@@ -137,9 +197,11 @@ class StrategyContext:
         """
         result = self.order_service.cancel_order(order_id)
 
-        if result and order_id in self.orders:
+        order = self.open_orders.get(order_id)
+        if result and order is not None:
             # 更新本地订单状态
-            self.orders[order_id].cancel()
+            order.cancel()
+            self.close_order(order)
 
         return result
 
@@ -204,27 +266,35 @@ class StrategyContext:
         Args:
             candle: K线数据
         """
-        symbol = candle.symbol
-        timeframe = candle.timeframe
+        key = (candle.symbol, candle.timeframe)
+        buffer = self.candles.get(key)
+        if buffer is None:
+            buffer = self.candles[key] = CandleRingBuffer(
+                candle.symbol,
+                CANDLE_BUFFER_SIZE,
+                exchange_id=candle.exchange_id,
+                timeframe=candle.timeframe,
+            )
 
-        if symbol not in self.candles:
-            self.candles[symbol] = {}
+        # 添加或更新K线，超出容量时覆盖最旧的K线
+        buffer.append(candle)
 
-        if timeframe not in self.candles[symbol]:
-            self.candles[symbol][timeframe] = []
+    def get_candles_view(self, symbol: str, timeframe: str) -> Optional[CandleBatch]:
+        """
+        获取缓存的K线数据
 
-        # 添加或更新K线
-        candles = self.candles[symbol][timeframe]
+        Args:
+            symbol: 交易对
+            timeframe: 时间周期
 
-        # 如果是最新K线的更新，则替换
-        if candles and candles[-1].timestamp == candle.timestamp:
-            candles[-1] = candle
-        else:
-            candles.append(candle)
+        Returns:
+            按时间升序排列的列式K线数据，如果没有缓存则返回None
+        """
+        buffer = self.candles.get((symbol, timeframe))
+        if buffer is None:
+            return None
 
-            # 限制缓存大小
-            if len(candles) > 1000:
-                self.candles[symbol][timeframe] = candles[-1000:]
+        return buffer.to_batch()
 
     def update_ticker(self, ticker: Ticker) -> None:
         """
@@ -251,16 +321,59 @@ class StrategyContext:
         Args:
             order: 订单对象
         """
-        self.orders[order.id] = order
+        if order.is_closed:
+            self.close_order(order)
+        else:
+            self.open_orders[order.id] = order
+
+    def close_order(self, order: Order) -> None:
+        """
+        将已结束的订单从未完成订单移到已结束订单
+
+        Args:
+            order: 订单对象
+        """
+        self.open_orders.pop(order.id, None)
+
+        closed_orders = self.closed_orders
+        closed_orders[order.id] = order
+        closed_orders.move_to_end(order.id)
+        if len(closed_orders) > CLOSED_ORDERS_MAX:
+            closed_orders.popitem(last=False)
+
+    def get_order(self, order_id: str) -> Optional[Order]:
+        """
+        获取订单，已结束的订单被访问后标记为最近使用
+
+        Args:
+            order_id: 订单ID
+
+        Returns:
+            订单对象，如果不存在或已被淘汰则返回None
+        """
+        order = self.open_orders.get(order_id)
+        if order is not None:
+            return order
+
+        order = self.closed_orders.get(order_id)
+        if order is not None:
+            self.closed_orders.move_to_end(order_id)
+
+        return order
+
+    @property
+    def current_time(self) -> datetime:
+        """当前时间（不带时区的UTC时间），按需由纳秒时间戳转换"""
+        return _EPOCH + timedelta(microseconds=self.current_time_ns // 1000)
 
-    def update_current_time(self, time: datetime) -> None:
+    def update_current_time(self, time: Union[datetime, int]) -> None:
         """
         更新当前时间
 
         Args:
-            time: 当前时间
+            time: 当前时间，datetime或UTC纳秒时间戳
         """
-        self.current_time = time
+        self.current_time_ns = time if isinstance(time, int) else _epoch_ns(time)
 
     def update_performance_metrics(self, metrics: Dict[str, Any]) -> None:
         """
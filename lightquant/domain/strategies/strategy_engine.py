@@ -4,9 +4,12 @@
 
 import importlib
 import logging
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Type
+from itertools import compress
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, Union
 
 from ..models.market_data import Candle, OrderBook, Ticker
 from ..models.order import Order
@@ -18,10 +21,28 @@ from ..services.order_service import OrderService
 from ..services.strategy_service import StrategyService
 from .base_strategy import BaseStrategy
 from .strategy_context import StrategyContext
-from .strategy_result import StrategyResult
+from .strategy_result import BulkStrategyResult, StrategyResult
 
 logger = logging.getLogger(__name__)
 
+# 订阅同一行情的运行中策略达到该数量时，使用线程池并行执行策略回调
+PARALLEL_DISPATCH_THRESHOLD = 4
+
+# 运行中策略的分发项，行情分发时直接解包调用，不再逐次查找方法：
+# (策略实例, 策略上下文, on_candle, on_ticker, on_orderbook,
+#  update_ticker, update_orderbook, update_current_time)
+# 未覆盖的可选回调为None
+_DispatchEntry = Tuple[
+    BaseStrategy,
+    StrategyContext,
+    Callable[[Candle], StrategyResult],
+    Optional[Callable[[Ticker], StrategyResult]],
+    Optional[Callable[[OrderBook], StrategyResult]],
+    Callable[[Ticker], None],
+    Callable[[OrderBook], None],
+    Callable[[Union[datetime, int]], None],
+]
+
 
 class StrategyEngine:
     """
@@ -42,6 +63,8 @@ class StrategyEngine:
         order_service: OrderService,
         market_data_service: MarketDataService,
         account_repository: AccountRepository,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
     ):
         """
         初始化策略引擎
@@ -51,11 +74,16 @@ class StrategyEngine:
             order_service: 订单服务
             market_data_service: 市场数据服务
             account_repository: 账户仓库
+            parallel: 是否在线程池中并行执行各策略的on_candle和on_ticker，
+                策略回调需要保证对共享状态的访问是线程安全的
+            max_workers: 线程池的最大线程数，默认为CPU核数
         """
         self.strategy_service = strategy_service
         self.order_service = order_service
         self.market_data_service = market_data_service
         self.account_repository = account_repository
+        self.parallel = parallel
+        self.max_workers = max_workers or os.cpu_count()
 
         # 策略实例映射表：策略ID -> 策略实例
         self.strategy_instances: Dict[str, BaseStrategy] = {}
@@ -66,12 +94,28 @@ class StrategyEngine:
         # 策略类映射表：策略类名 -> 策略类
         self.strategy_classes: Dict[str, Type[BaseStrategy]] = {}
 
+        # 已加载的策略类：(模块路径, 类名) -> 策略类，重复加载时不再导入模块
+        self._class_cache: Dict[Tuple[str, str], Type[BaseStrategy]] = {}
+
         # 风险管理器映射表：策略ID -> 风险管理器
         self.risk_managers: Dict[str, RiskManager] = {}
 
         # 是否正在运行
         self.is_running = False
 
+        # 运行中的策略：策略ID -> 分发项，随引擎内的状态变更维护，
+        # 行情分发时一次查找同时得到运行状态、策略回调和上下文更新方法
+        self._dispatch: Dict[str, _DispatchEntry] = {}
+
+        # 订阅索引：(交易对, 时间周期) -> 策略ID元组，交易对 -> 策略ID元组，
+        # 只包含运行中的策略，随运行状态变更推入或移出；
+        # 变更时整体替换元组，分发过程中策略停止也不会影响正在遍历的订阅者
+        self._candle_subs: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+        self._ticker_subs: Dict[str, Tuple[str, ...]] = {}
+
+        # 并行执行策略回调的线程池，首次需要时创建
+        self._pool: Optional[ThreadPoolExecutor] = None
+
     def register_strategy_class(self, strategy_class: Type[BaseStrategy]) -> None:
         """
         注册策略类
@@ -81,7 +125,8 @@ class StrategyEngine:
         """
         class_name = strategy_class.__name__
         self.strategy_classes[class_name] = strategy_class
-        logger.info(f"注册策略类: {class_name}")
+        self._class_cache[(strategy_class.__module__, class_name)] = strategy_class
+        logger.info("注册策略类: %s", class_name)
 
     def load_strategy_class(
         self, module_path: str, class_name: str
@@ -96,20 +141,26 @@ class StrategyEngine:
         Returns:
             策略类，如果加载失败则返回None
         """
+        strategy_class = self._class_cache.get((module_path, class_name))
+        if strategy_class is not None:
+            return strategy_class
+
         try:
             module = importlib.import_module(module_path)
             strategy_class = getattr(module, class_name)
 
             # 检查是否是BaseStrategy的子类
             if not issubclass(strategy_class, BaseStrategy):
-                logger.error(f"类 {class_name} 不是BaseStrategy的子类")
+                logger.error("类 %s 不是BaseStrategy的子类", class_name)
                 return None
 
             self.register_strategy_class(strategy_class)
+            # 模块路径可能是重新导出策略类的包，与类定义所在的模块不同
+            self._class_cache[(module_path, class_name)] = strategy_class
             return strategy_class
 
         except (ImportError, AttributeError) as e:
-            logger.error(f"加载策略类失败: {e}")
+            logger.error("加载策略类失败: %s", e)
             return None
 
     def create_strategy(
@@ -140,7 +191,7 @@ class StrategyEngine:
                 )
 
             if not account:
-                logger.error(f"找不到交易所账户: {config.exchange_ids}")
+                logger.error("找不到交易所账户: %s", config.exchange_ids)
                 return None
 
             # 创建风险管理器
@@ -163,11 +214,11 @@ class StrategyEngine:
             self.strategy_instances[strategy.id] = strategy_instance
             self.strategy_contexts[strategy.id] = context
 
-            logger.info(f"创建策略: {strategy.id}, 名称: {config.name}")
+            logger.info("创建策略: %s, 名称: %s", strategy.id, config.name)
             return strategy.id
 
         except Exception as e:
-            logger.error(f"创建策略失败: {e}")
+            logger.error("创建策略失败: %s", e)
             return None
 
     def initialize_strategy(self, strategy_id: str) -> bool:
@@ -181,7 +232,7 @@ class StrategyEngine:
             是否成功初始化
         """
         if strategy_id not in self.strategy_instances:
-            logger.error(f"找不到策略实例: {strategy_id}")
+            logger.error("找不到策略实例: %s", strategy_id)
             return False
 
         try:
@@ -189,11 +240,11 @@ class StrategyEngine:
             strategy_instance.initialize()
             strategy_instance.is_initialized = True
 
-            logger.info(f"初始化策略: {strategy_id}")
+            logger.info("初始化策略: %s", strategy_id)
             return True
 
         except Exception as e:
-            logger.error(f"初始化策略失败: {strategy_id}, 错误: {e}")
+            logger.error("初始化策略失败: %s, 错误: %s", strategy_id, e)
 
             # 设置策略错误状态
             self.strategy_service.update_strategy_status(
@@ -201,6 +252,7 @@ class StrategyEngine:
                 status=StrategyStatus.ERROR,
                 error_message=str(e),
             )
+            self._set_running(strategy_id, False)
 
             return False
 
@@ -215,13 +267,13 @@ class StrategyEngine:
             是否成功启动
         """
         if strategy_id not in self.strategy_instances:
-            logger.error(f"找不到策略实例: {strategy_id}")
+            logger.error("找不到策略实例: %s", strategy_id)
             return False
 
         # 获取策略领域模型
         strategy = self.strategy_service.get_strategy(strategy_id)
         if not strategy:
-            logger.error(f"找不到策略: {strategy_id}")
+            logger.error("找不到策略: %s", strategy_id)
             return False
 
         # 初始化策略
@@ -232,7 +284,8 @@ class StrategyEngine:
         # 启动策略
         result = self.strategy_service.start_strategy(strategy_id)
         if result:
-            logger.info(f"启动策略: {strategy_id}")
+            self._set_running(strategy_id, True)
+            logger.info("启动策略: %s", strategy_id)
 
         return result
 
@@ -248,7 +301,8 @@ class StrategyEngine:
         """
         result = self.strategy_service.pause_strategy(strategy_id)
         if result:
-            logger.info(f"暂停策略: {strategy_id}")
+            self._set_running(strategy_id, False)
+            logger.info("暂停策略: %s", strategy_id)
 
         return result
 
@@ -264,7 +318,8 @@ class StrategyEngine:
         """
         result = self.strategy_service.resume_strategy(strategy_id)
         if result:
-            logger.info(f"恢复策略: {strategy_id}")
+            self._set_running(strategy_id, True)
+            logger.info("恢复策略: %s", strategy_id)
 
         return result
 
@@ -279,7 +334,7 @@ class StrategyEngine:
             是否成功停止
         """
         if strategy_id not in self.strategy_instances:
-            logger.error(f"找不到策略实例: {strategy_id}")
+            logger.error("找不到策略实例: %s", strategy_id)
             return False
 
         try:
@@ -289,12 +344,17 @@ class StrategyEngine:
             # 停止策略
             result = self.strategy_service.stop_strategy(strategy_id)
             if result:
-                logger.info(f"停止策略: {strategy_id}")
+                self._set_running(strategy_id, False)
+                # 停止后不再收到行情，丢弃过期价格
+                risk_manager = self.risk_managers.get(strategy_id)
+                if risk_manager is not None:
+                    risk_manager.clear_last_prices()
+                logger.info("停止策略: %s", strategy_id)
 
             return result
 
         except Exception as e:
-            logger.error(f"停止策略失败: {strategy_id}, 错误: {e}")
+            logger.error("停止策略失败: %s, 错误: %s", strategy_id, e)
             return False
 
     def process_candle(self, candle: Candle) -> None:
@@ -307,77 +367,275 @@ class StrategyEngine:
         if not self.is_running:
             return
 
-        # 遍历所有策略
-        for strategy_id, strategy in self.strategy_instances.items():
-            # 检查策略是否已暂停
-            strategy_status = self.strategy_service.get_strategy_status(strategy_id)
-            if strategy_status != StrategyStatus.RUNNING:
-                continue
+        # 订阅索引中只有运行中的策略，直接分发给订阅了该交易对和时间周期的策略
+        subscribers = self._candle_subs.get((candle.symbol, candle.timeframe), ())
+        if self.parallel and len(subscribers) >= PARALLEL_DISPATCH_THRESHOLD:
+            self._dispatch_candle_parallel(subscribers, candle)
+            return
 
-            # 检查策略是否订阅了该交易对和时间周期
-            config = strategy.config
-            if (
-                candle.symbol not in config.symbols
-                or candle.timeframe not in config.timeframes
+        for strategy_id in subscribers:
+            self._dispatch_candles(strategy_id, (candle,))
+
+    def process_candles(self, candles: Iterable[Candle]) -> None:
+        """
+        批量处理K线数据
+
+        先按订阅索引把K线分给各个策略，再逐个策略连续处理，
+        每个策略收到的K线保持输入顺序
+
+        Args:
+            candles: K线数据，按时间升序排列
+        """
+        if not self.is_running:
+            return
+
+        batches: Dict[str, List[Candle]] = {}
+        for candle in candles:
+            for strategy_id in self._candle_subs.get(
+                (candle.symbol, candle.timeframe), ()
             ):
-                continue
+                batch = batches.get(strategy_id)
+                if batch is None:
+                    batch = batches[strategy_id] = []
+                batch.append(candle)
 
-            # 获取策略上下文
-            context = self.strategy_contexts.get(strategy_id)
-            if not context:
-                continue
+        for strategy_id, batch in batches.items():
+            self._dispatch_candles(strategy_id, batch)
 
-            # 更新风险管理器上下文
-            if strategy_id in self.risk_managers:
-                risk_manager = self.risk_managers[strategy_id]
-                # 更新市场数据
-                ticker_context = {"ticker": {candle.symbol: {"last": candle.close}}}
-                risk_manager.update_context(ticker_context)
+    def _dispatch_candles(self, strategy_id: str, candles: Iterable[Candle]) -> None:
+        """
+        把K线依次交给一个策略处理
+
+        Args:
+            strategy_id: 策略ID
+            candles: K线数据
+        """
+        entry = self._dispatch.get(strategy_id)
+        if entry is None:
+            return
+
+        on_candle = entry[2]
+        risk_manager = self.risk_managers.get(strategy_id)
+        running = self._dispatch
+
+        for candle in candles:
+            # 策略处理过程中可能出错停止运行，后续K线不再处理
+            if strategy_id not in running:
+                break
+
+            # 更新风险管理器的最新价格
+            if risk_manager is not None:
+                risk_manager.update_last_price(candle.symbol, candle.close)
 
             # 调用策略的on_candle方法
             try:
-                result = strategy.on_candle(candle)
+                result = on_candle(candle)
                 if result:
                     self._process_strategy_result(strategy_id, result)
             except Exception as e:
-                logger.error(f"策略 {strategy_id} 处理K线时发生错误: {e}")
+                logger.error("策略 %s 处理K线时发生错误: %s", strategy_id, e)
                 # 可以选择暂停策略
                 # self.pause_strategy(strategy_id)
 
+    def _dispatch_candle_parallel(
+        self, strategy_ids: Iterable[str], candle: Candle
+    ) -> None:
+        """
+        在线程池中并行执行各策略的on_candle
+
+        策略结果在调用线程上按订阅顺序处理，保证订单提交顺序确定
+
+        Args:
+            strategy_ids: 策略ID列表
+            candle: K线数据
+        """
+        pool = self._get_pool()
+        running = self._dispatch
+        futures = []
+        for strategy_id in strategy_ids:
+            entry = running.get(strategy_id)
+            if entry is None:
+                continue
+
+            # 更新风险管理器的最新价格
+            risk_manager = self.risk_managers.get(strategy_id)
+            if risk_manager is not None:
+                risk_manager.update_last_price(candle.symbol, candle.close)
+
+            futures.append((strategy_id, pool.submit(entry[2], candle)))
+
+        for strategy_id, future in futures:
+            try:
+                result = future.result()
+                if result:
+                    self._process_strategy_result(strategy_id, result)
+            except Exception as e:
+                logger.error("策略 %s 处理K线时发生错误: %s", strategy_id, e)
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """
+        获取并行执行策略回调的线程池，首次调用时创建
+
+        Returns:
+            线程池
+        """
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="strategy"
+            )
+        return self._pool
+
+    def _set_running(self, strategy_id: str, running: bool) -> None:
+        """
+        更新策略的运行状态，同时把策略推入或移出订阅索引
+
+        Args:
+            strategy_id: 策略ID
+            running: 是否运行中
+        """
+        if running:
+            if strategy_id not in self._dispatch:
+                strategy = self.strategy_instances[strategy_id]
+                context = self.strategy_contexts[strategy_id]
+                self._dispatch[strategy_id] = (
+                    strategy,
+                    context,
+                    strategy._on_candle,
+                    strategy._on_ticker,
+                    strategy._on_orderbook,
+                    context.update_ticker,
+                    context.update_orderbook,
+                    context.update_current_time,
+                )
+                self._subscribe(strategy_id)
+        elif self._dispatch.pop(strategy_id, None) is not None:
+            self._unsubscribe(strategy_id)
+
+    def _subscribe(self, strategy_id: str) -> None:
+        """
+        按策略配置把策略加入订阅索引，重复订阅不会重复加入
+
+        Args:
+            strategy_id: 策略ID
+        """
+        strategy = self.strategy_instances[strategy_id]
+        for symbol in strategy.subscribed_symbols:
+            self._add_subscriber(self._ticker_subs, symbol, strategy_id)
+            for timeframe in strategy.subscribed_timeframes:
+                self._add_subscriber(
+                    self._candle_subs, (symbol, timeframe), strategy_id
+                )
+
+    def _unsubscribe(self, strategy_id: str) -> None:
+        """
+        把策略从订阅索引中移除
+
+        Args:
+            strategy_id: 策略ID
+        """
+        # 只处理策略自己订阅的键，不扫描整个索引
+        strategy = self.strategy_instances[strategy_id]
+        for symbol in strategy.subscribed_symbols:
+            self._remove_subscriber(self._ticker_subs, symbol, strategy_id)
+            for timeframe in strategy.subscribed_timeframes:
+                self._remove_subscriber(
+                    self._candle_subs, (symbol, timeframe), strategy_id
+                )
+
+    @staticmethod
+    def _add_subscriber(
+        index: Dict[Any, Tuple[str, ...]], key: Any, strategy_id: str
+    ) -> None:
+        """
+        在订阅索引的一个键下追加策略
+
+        Args:
+            index: 订阅索引
+            key: 索引键
+            strategy_id: 策略ID
+        """
+        subscribers = index.get(key, ())
+        if strategy_id not in subscribers:
+            index[key] = subscribers + (strategy_id,)
+
+    @staticmethod
+    def _remove_subscriber(
+        index: Dict[Any, Tuple[str, ...]], key: Any, strategy_id: str
+    ) -> None:
+        """
+        从订阅索引的一个键下移除策略，没有订阅者的键一并删除
+
+        Args:
+            index: 订阅索引
+            key: 索引键
+            strategy_id: 策略ID
+        """
+        subscribers = index.get(key)
+        if subscribers and strategy_id in subscribers:
+            subscribers = tuple(sid for sid in subscribers if sid != strategy_id)
+            if subscribers:
+                index[key] = subscribers
+            else:
+                del index[key]
+
     def process_ticker(self, ticker: Ticker) -> None:
         """
         处理Ticker数据
 
+        开启parallel且订阅该交易对的运行中策略达到PARALLEL_DISPATCH_THRESHOLD个时，
+        各策略的on_ticker在线程池中并行执行，策略代码需要保证对自身状态的访问是线程安全的；
+        策略结果始终在调用线程上按订阅顺序处理，保证订单提交顺序确定
+
         Args:
             ticker: Ticker数据
         """
-        # 获取所有运行中的策略
-        running_strategies = self.strategy_service.get_strategies_by_status(
-            StrategyStatus.RUNNING
-        )
+        # 订阅索引中只有运行中的策略，分发过程中停止的策略取不到实例，直接跳过
+        handlers = []
+        running = self._dispatch
+        timestamp = ticker.timestamp
+        for strategy_id in self._ticker_subs.get(ticker.symbol, ()):
+            entry = running.get(strategy_id)
+            if entry is None:
+                continue
+            _, _, _, on_ticker, _, update_ticker, _, update_time = entry
 
-        for strategy in running_strategies:
-            # 检查策略是否关注该交易对
-            if (
-                ticker.symbol in strategy.config.symbols
-                and strategy.id in self.strategy_instances
-            ):
+            try:
+                # 更新上下文
+                update_ticker(ticker)
+                update_time(timestamp)
+            except Exception as e:
+                logger.error("处理Ticker数据失败: 策略ID=%s, 错误: %s", strategy_id, e)
+                continue
 
+            # 未覆盖回调的策略跳过调用
+            if on_ticker is not None:
+                handlers.append((strategy_id, on_ticker))
+
+        if self.parallel and len(handlers) >= PARALLEL_DISPATCH_THRESHOLD:
+            pool = self._get_pool()
+            futures = [
+                (strategy_id, pool.submit(on_ticker, ticker))
+                for strategy_id, on_ticker in handlers
+            ]
+            for strategy_id, future in futures:
                 try:
-                    # 更新上下文
-                    context = self.strategy_contexts[strategy.id]
-                    context.update_ticker(ticker)
-                    context.update_current_time(ticker.timestamp)
+                    result = future.result()
+                    self._process_strategy_result(strategy_id, result)
+                except Exception as e:
+                    logger.error(
+                        "处理Ticker数据失败: 策略ID=%s, 错误: %s", strategy_id, e
+                    )
+            return
 
-                    # 执行策略
-                    strategy_instance = self.strategy_instances[strategy.id]
-                    result = strategy_instance.on_ticker(ticker)
+        for strategy_id, on_ticker in handlers:
+            try:
+                result = on_ticker(ticker)
 
-                    # 处理结果
-                    self._process_strategy_result(strategy.id, result)
+                # 处理结果
+                self._process_strategy_result(strategy_id, result)
 
-                except Exception as e:
-                    logger.error(f"处理Ticker数据失败: 策略ID={strategy.id}, 错误: {e}")
+            except Exception as e:
+                logger.error("处理Ticker数据失败: 策略ID=%s, 错误: %s", strategy_id, e)
 
     def process_orderbook(self, orderbook: OrderBook) -> None:
         """
@@ -386,33 +644,30 @@ class StrategyEngine:
         Args:
             orderbook: 订单簿数据
         """
-        # 获取所有运行中的策略
-        running_strategies = self.strategy_service.get_strategies_by_status(
-            StrategyStatus.RUNNING
-        )
-
-        for strategy in running_strategies:
-            # 检查策略是否关注该交易对
-            if (
-                orderbook.symbol in strategy.config.symbols
-                and strategy.id in self.strategy_instances
-            ):
+        # 订阅索引中只有运行中的策略，分发过程中停止的策略取不到实例，直接跳过
+        running = self._dispatch
+        timestamp = orderbook.timestamp
+        for strategy_id in self._ticker_subs.get(orderbook.symbol, ()):
+            entry = running.get(strategy_id)
+            if entry is None:
+                continue
+            _, _, _, _, on_orderbook, _, update_orderbook, update_time = entry
 
-                try:
-                    # 更新上下文
-                    context = self.strategy_contexts[strategy.id]
-                    context.update_orderbook(orderbook)
-                    context.update_current_time(orderbook.timestamp)
+            try:
+                # 更新上下文
+                update_orderbook(orderbook)
+                update_time(timestamp)
 
-                    # 执行策略
-                    strategy_instance = self.strategy_instances[strategy.id]
-                    result = strategy_instance.on_orderbook(orderbook)
+                # 执行策略，未覆盖回调的策略跳过调用
+                if on_orderbook is None:
+                    continue
+                result = on_orderbook(orderbook)
 
-                    # 处理结果
-                    self._process_strategy_result(strategy.id, result)
+                # 处理结果
+                self._process_strategy_result(strategy_id, result)
 
-                except Exception as e:
-                    logger.error(f"处理订单簿数据失败: 策略ID={strategy.id}, 错误: {e}")
+            except Exception as e:
+                logger.error("处理订单簿数据失败: 策略ID=%s, 错误: %s", strategy_id, e)
 
     def process_order_update(self, order: Order) -> None:
         """
@@ -434,15 +689,17 @@ class StrategyEngine:
                 context.update_order(order)
 
                 # 通知策略
-                strategy_instance = self.strategy_instances[strategy_id]
-                strategy_instance.on_order_update(order)
+                self.strategy_instances[strategy_id]._on_order_update(order)
 
                 # 更新策略订单
                 self.strategy_service.add_order_to_strategy(strategy_id, order.id)
 
             except Exception as e:
                 logger.error(
-                    f"处理订单更新失败: 策略ID={strategy_id}, 订单ID={order.id}, 错误: {e}"
+                    "处理订单更新失败: 策略ID=%s, 订单ID=%s, 错误: %s",
+                    strategy_id,
+                    order.id,
+                    e,
                 )
 
     def _process_strategy_result(
@@ -461,86 +718,107 @@ class StrategyEngine:
         # 获取账户和风险管理器
         context = self.strategy_contexts.get(strategy_id)
         if not context:
-            logger.error(f"找不到策略上下文: {strategy_id}")
+            logger.error("找不到策略上下文: %s", strategy_id)
             return
 
         account = context.account
         risk_manager = self.risk_managers.get(strategy_id)
 
-        # 处理订单
-        for order in result.orders:
-            # 进行风险检查
-            if risk_manager and not risk_manager.check_order(order, account):
-                logger.warning(
-                    f"订单被风险管理器拒绝: 策略ID={strategy_id}, 订单ID={order.id}"
-                )
-                # 添加拒绝信息到结果日志
-                result.add_log(f"订单被风险管理器拒绝: {order.id}")
-                continue
+        # 风险预检查，一次批量检查所有订单，过滤出通过的订单后批量提交
+        orders = result.orders
+        approved: List[Order] = list(orders)
+        if risk_manager is not None and orders:
+            mask = risk_manager.check_orders(orders, account)
+            if not mask.all():
+                approved = list(compress(orders, mask))
+                for order in compress(orders, ~mask):
+                    logger.warning(
+                        "订单被风险管理器拒绝: 策略ID=%s, 订单ID=%s",
+                        strategy_id,
+                        order.id,
+                    )
+                    # 添加拒绝信息到结果日志
+                    result.add_log(f"订单被风险管理器拒绝: {order.id}")
+
+        for order in approved:
+            # 确保订单有策略ID
+            if not order.strategy_id:
+                logger.warning("订单没有策略ID，设置为当前策略: %s", strategy_id)
+                # 这里可能需要创建新的订单对象，因为strategy_id可能是只读的
 
-            # 提交订单到订单服务
+        if approved:
             try:
-                # 确保订单有策略ID
-                if not order.strategy_id:
-                    logger.warning(f"订单没有策略ID，设置为当前策略: {strategy_id}")
-                    # 这里可能需要创建新的订单对象，因为strategy_id可能是只读的
-
-                # 提交订单
-                submitted_order = self.order_service.submit_order(order)
-                if submitted_order:
-                    # 添加订单到策略
-                    self.strategy_service.add_order_to_strategy(
-                        strategy_id, submitted_order.id
-                    )
-                    logger.info(
-                        f"订单已提交: 策略ID={strategy_id}, 订单ID={submitted_order.id}"
-                    )
-                else:
-                    logger.error(
-                        f"提交订单失败: 策略ID={strategy_id}, 订单ID={order.id}"
-                    )
+                submitted = self.order_service.submit_orders(approved)
             except Exception as e:
-                logger.error(
-                    f"处理订单时发生错误: 策略ID={strategy_id}, 订单ID={order.id}, 错误: {e}"
+                logger.error("提交订单时发生错误: 策略ID=%s, 错误: %s", strategy_id, e)
+                submitted = []
+
+            # 批量添加订单到策略
+            if submitted:
+                self.strategy_service.add_orders_to_strategy(
+                    strategy_id, [order.id for order in submitted]
                 )
+            if logger.isEnabledFor(logging.INFO):
+                for order in submitted:
+                    logger.info(
+                        "订单已提交: 策略ID=%s, 订单ID=%s", strategy_id, order.id
+                    )
+
+            if len(submitted) < len(approved):
+                submitted_ids = {order.id for order in submitted}
+                for order in approved:
+                    if order.id not in submitted_ids:
+                        logger.error(
+                            "提交订单失败: 策略ID=%s, 订单ID=%s", strategy_id, order.id
+                        )
 
-        # 处理取消的订单
-        for order_id in result.canceled_order_ids:
+        # 批量取消订单
+        if result.canceled_order_ids:
             try:
-                # 取消订单
-                if self.order_service.cancel_order(order_id):
-                    # 从策略中移除订单
-                    self.strategy_service.remove_order_from_strategy(
-                        strategy_id, order_id
-                    )
-                    logger.info(f"订单已取消: 策略ID={strategy_id}, 订单ID={order_id}")
-                else:
-                    logger.error(
-                        f"取消订单失败: 策略ID={strategy_id}, 订单ID={order_id}"
-                    )
+                canceled = self.order_service.cancel_orders(result.canceled_order_ids)
             except Exception as e:
-                logger.error(
-                    f"取消订单时发生错误: 策略ID={strategy_id}, 订单ID={order_id}, 错误: {e}"
-                )
+                logger.error("取消订单时发生错误: 策略ID=%s, 错误: %s", strategy_id, e)
+                canceled = []
+
+            # 批量从策略中移除订单
+            if canceled:
+                self.strategy_service.remove_orders_from_strategy(strategy_id, canceled)
+            if logger.isEnabledFor(logging.INFO):
+                for order_id in canceled:
+                    logger.info(
+                        "订单已取消: 策略ID=%s, 订单ID=%s", strategy_id, order_id
+                    )
 
-        # 处理性能指标
-        if result.metrics:
-            self.strategy_service.update_strategy_performance(
-                strategy_id, result.metrics
-            )
+            if len(canceled) < len(result.canceled_order_ids):
+                canceled_ids = set(canceled)
+                for order_id in result.canceled_order_ids:
+                    if order_id not in canceled_ids:
+                        logger.error(
+                            "取消订单失败: 策略ID=%s, 订单ID=%s", strategy_id, order_id
+                        )
+
+        # 处理性能指标，固定指标名称的结果把数组中的数值指标合并进来，
+        # 每个结果只加载、保存一次策略
+        metrics = result.metrics
+        if isinstance(result, BulkStrategyResult) and result.has_metric_values:
+            metrics = {**result.metrics, **result.metric_dict()}
+
+        if metrics:
+            self.strategy_service.update_strategy_performance(strategy_id, metrics)
 
             # 更新风险管理器上下文
             if risk_manager:
-                risk_manager.update_context(result.metrics)
+                risk_manager.update_context(metrics)
 
         # 处理日志
-        for log in result.logs:
-            logger.info(f"策略日志: 策略ID={strategy_id}, {log}")
+        if result.logs and logger.isEnabledFor(logging.INFO):
+            for log in result.logs:
+                logger.info("策略日志: 策略ID=%s, %s", strategy_id, log)
 
         # 处理错误
         if result.has_error:
             logger.error(
-                f"策略错误: 策略ID={strategy_id}, 错误: {result.error_message}"
+                "策略错误: 策略ID=%s, 错误: %s", strategy_id, result.error_message
             )
 
             # 设置策略错误状态
@@ -549,6 +827,27 @@ class StrategyEngine:
                 status=StrategyStatus.ERROR,
                 error_message=result.error_message,
             )
+            self._set_running(strategy_id, False)
+
+    def sync_running_strategies(self) -> None:
+        """
+        按策略服务中的状态重建运行中的策略集合
+
+        运行集合平时随引擎内的状态变更维护，行情分发时不再查询策略服务；
+        策略状态在引擎之外被修改时，可调用该方法重新同步
+        """
+        running_strategies = self.strategy_service.get_strategies_by_status(
+            StrategyStatus.RUNNING
+        )
+        self._dispatch.clear()
+        self._candle_subs.clear()
+        self._ticker_subs.clear()
+        for strategy in running_strategies:
+            if strategy.id not in self.strategy_instances:
+                logger.warning("策略 %s 应该运行，但找不到实例", strategy.id)
+                continue
+
+            self._set_running(strategy.id, True)
 
     def start(self) -> None:
         """
@@ -562,16 +861,11 @@ class StrategyEngine:
         logger.info("启动策略引擎")
 
         # 启动所有应该运行的策略
-        running_strategies = self.strategy_service.get_strategies_by_status(
-            StrategyStatus.RUNNING
-        )
-        for strategy in running_strategies:
-            if strategy.id not in self.strategy_instances:
-                logger.warning(f"策略 {strategy.id} 应该运行，但找不到实例")
-                continue
-
-            if not self.strategy_instances[strategy.id].is_initialized:
-                self.initialize_strategy(strategy.id)
+        self.sync_running_strategies()
+        # 初始化失败会把策略移出运行集合，先复制一份
+        for strategy_id, entry in list(self._dispatch.items()):
+            if not entry[0].is_initialized:
+                self.initialize_strategy(strategy_id)
 
     def stop(self) -> None:
         """
@@ -584,9 +878,11 @@ class StrategyEngine:
         self.is_running = False
         logger.info("停止策略引擎")
 
-        # 停止所有运行中的策略
-        running_strategies = self.strategy_service.get_strategies_by_status(
-            StrategyStatus.RUNNING
-        )
-        for strategy in running_strategies:
-            self.stop_strategy(strategy.id)
+        # 停止所有运行中的策略，停止时会修改运行集合，先复制一份
+        for strategy_id in list(self._dispatch):
+            self.stop_strategy(strategy_id)
+
+        # 关闭并行执行策略回调的线程池
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
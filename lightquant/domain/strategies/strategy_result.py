@@ -3,12 +3,16 @@
 """
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, NoReturn, Optional, Sequence
 
+import numpy as np
+
+from ..models.base import DATACLASS_SLOTS
 from ..models.order import Order
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class StrategyResult:
     """
     策略执行结果
@@ -29,6 +33,21 @@ class StrategyResult:
     has_error: bool = False  # 是否有错误
     error_message: Optional[str] = None  # 错误消息
 
+    def __bool__(self) -> bool:
+        """没有订单、取消、指标、日志和错误的空结果为假，引擎可以直接跳过"""
+        return bool(
+            self.orders
+            or self.canceled_order_ids
+            or self.metrics
+            or self.logs
+            or self.has_error
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        """是否为空结果：没有订单、取消、指标、日志和错误"""
+        return not self
+
     def add_order(self, order: Order) -> None:
         """
         添加订单
@@ -83,10 +102,18 @@ class StrategyResult:
         Args:
             other: 另一个策略结果
         """
-        self.orders.extend(other.orders)
-        self.canceled_order_ids.extend(other.canceled_order_ids)
-        self.metrics.update(other.metrics)
-        self.logs.extend(other.logs)
+        # 逐根K线汇总结果时，大部分结果都是空的，直接跳过
+        if not other:
+            return
+
+        if other.orders:
+            self.orders.extend(other.orders)
+        if other.canceled_order_ids:
+            self.canceled_order_ids.extend(other.canceled_order_ids)
+        if other.metrics:
+            self.metrics.update(other.metrics)
+        if other.logs:
+            self.logs.extend(other.logs)
 
         if other.has_error:
             self.has_error = True
@@ -94,3 +121,149 @@ class StrategyResult:
                 self.error_message += f"; {other.error_message}"
             else:
                 self.error_message = other.error_message
+
+    def reset(self) -> None:
+        """
+        清空结果以便复用
+
+        每次回调都输出订单或日志的策略可以只创建一个结果对象，在回调开始时调用reset，
+        不必每次分配新的结果对象和容器；引擎在下一次调用策略回调前已经处理完上一次的结果
+        """
+        if self.orders:
+            self.orders.clear()
+        if self.canceled_order_ids:
+            self.canceled_order_ids.clear()
+        if self.metrics:
+            self.metrics.clear()
+        if self.logs:
+            self.logs.clear()
+        self.has_error = False
+        self.error_message = None
+
+
+@dataclass(eq=False, **DATACLASS_SLOTS)
+class BulkStrategyResult(StrategyResult):
+    """
+    指标名称固定的策略结果
+
+    数值指标按创建时给定的名称顺序保存在float64数组中，NaN表示本次没有该指标。
+    适用于每根K线都输出同一组数值指标的策略（如回测中的持仓、权益），
+    策略可以只创建一次结果对象，每根K线调用reset后原地写入，不再为指标分配字典项。
+    非数值或名称之外的指标仍然可以通过add_metric写入metrics字典
+    """
+
+    metric_names: Sequence[str] = ()  # 数值指标名称
+    metric_values: np.ndarray = field(init=False, repr=False)  # 数值指标值
+    _metric_index: Dict[str, int] = field(init=False, repr=False)  # 名称 -> 下标
+
+    def __post_init__(self):
+        self.metric_names = list(self.metric_names)
+        self.metric_values = np.full(len(self.metric_names), np.nan)
+        self._metric_index = {name: i for i, name in enumerate(self.metric_names)}
+
+    def __bool__(self) -> bool:
+        return StrategyResult.__bool__(self) or self.has_metric_values
+
+    @property
+    def has_metric_values(self) -> bool:
+        """数值指标数组中是否有本次写入的值"""
+        return not np.isnan(self.metric_values).all()
+
+    def set_metric_value(self, index: int, value: float) -> None:
+        """
+        按下标写入数值指标
+
+        Args:
+            index: 指标在metric_names中的下标
+            value: 指标值
+        """
+        self.metric_values[index] = value
+
+    def add_metric(self, key: str, value: Any) -> None:
+        """
+        添加性能指标，名称在metric_names中的数值指标写入数组
+
+        Args:
+            key: 指标名称
+            value: 指标值
+        """
+        index = self._metric_index.get(key)
+        if index is not None and isinstance(value, (int, float, np.number)):
+            self.metric_values[index] = value
+        else:
+            self.metrics[key] = value
+
+    def metric_dict(self) -> Dict[str, float]:
+        """
+        把数组中有值的数值指标转换为字典
+
+        Returns:
+            指标字典，格式为 {名称: 值}
+        """
+        return {
+            name: value
+            for name, value in zip(self.metric_names, self.metric_values.tolist())
+            if value == value  # 跳过NaN
+        }
+
+    def merge(self, other: "StrategyResult") -> None:
+        """
+        合并另一个策略结果，另一个结果中有值的数值指标覆盖本结果
+
+        Args:
+            other: 另一个策略结果
+        """
+        if isinstance(other, BulkStrategyResult) and other.has_metric_values:
+            if other.metric_names == self.metric_names:
+                mask = ~np.isnan(other.metric_values)
+                self.metric_values[mask] = other.metric_values[mask]
+            else:
+                for key, value in other.metric_dict().items():
+                    self.add_metric(key, value)
+        StrategyResult.merge(self, other)
+
+    def reset(self) -> None:
+        """清空结果以便复用，数值指标全部重置为NaN"""
+        StrategyResult.reset(self)
+        self.metric_values.fill(np.nan)
+
+
+class _EmptyStrategyResult(StrategyResult):
+    """不可修改的空结果，各字段为空元组或只读字典，所有修改操作都会抛出TypeError"""
+
+    __slots__ = ("_frozen",)
+
+    def __init__(self):
+        super().__init__(
+            orders=(),  # type: ignore[arg-type]
+            canceled_order_ids=(),  # type: ignore[arg-type]
+            metrics=MappingProxyType({}),  # type: ignore[arg-type]
+            logs=(),  # type: ignore[arg-type]
+        )
+        object.__setattr__(self, "_frozen", True)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, "_frozen", False):
+            self._readonly()
+        super().__setattr__(name, value)
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(
+            "EMPTY_RESULT是共享的空结果，不能修改，请创建新的StrategyResult"
+        )
+
+    add_order = _readonly
+    add_canceled_order_id = _readonly
+    add_metric = _readonly
+    add_log = _readonly
+    set_error = _readonly
+    merge = _readonly
+    reset = _readonly
+
+    def __repr__(self) -> str:
+        return "EMPTY_RESULT"
+
+
+# 共享的空结果，策略在没有任何输出时可以直接返回，避免每次创建新对象；
+# 该对象不可修改，需要添加订单或日志时请创建新的StrategyResult
+EMPTY_RESULT: StrategyResult = _EmptyStrategyResult()
@@ -0,0 +1,11 @@
+"""
+缓存模块，包含为仓库增加缓存的装饰器实现
+"""
+
+from .identity_map_strategy_repository import IdentityMapStrategyRepository
+from .redis_strategy_repository import CachingStrategyRepository
+
+__all__ = [
+    "IdentityMapStrategyRepository",
+    "CachingStrategyRepository",
+]
@@ -0,0 +1,123 @@
+"""
+策略仓库身份映射实现
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ...domain.models.strategy import Strategy, StrategyStatus
+from ...domain.repositories.strategy_repository import StrategyRepository
+
+
+class IdentityMapStrategyRepository(StrategyRepository):
+    """
+    策略仓库身份映射实现
+
+    包装另一个策略仓库，按ID缓存已加载的策略对象。有效期内重复查找同一策略时
+    返回同一个对象，不再访问底层仓库；保存时刷新缓存，删除时移除缓存。
+    列表查询直接转发给底层仓库。
+    """
+
+    def __init__(self, repository: StrategyRepository, ttl: float = 1.0):
+        """
+        初始化策略仓库身份映射
+
+        Args:
+            repository: 底层策略仓库
+            ttl: 缓存有效期（秒），过期后重新从底层仓库加载，以感知其他进程的修改
+        """
+        self._repository = repository
+        self._ttl = ttl
+        self._cache: Dict[str, Tuple[float, Strategy]] = {}
+
+    def _get_cached(self, strategy_id: str) -> Optional[Strategy]:
+        """获取未过期的缓存策略"""
+        entry = self._cache.get(strategy_id)
+        if entry is None:
+            return None
+
+        expires_at, strategy = entry
+        if expires_at < time.monotonic():
+            del self._cache[strategy_id]
+            return None
+        return strategy
+
+    def _put(self, strategy: Strategy) -> None:
+        """缓存策略"""
+        self._cache[strategy.id] = (time.monotonic() + self._ttl, strategy)
+
+    def invalidate(self, strategy_id: Optional[str] = None) -> None:
+        """
+        使缓存失效
+
+        Args:
+            strategy_id: 策略ID，为None时清空全部缓存
+        """
+        if strategy_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(strategy_id, None)
+
+    def save(self, strategy: Strategy) -> None:
+        """
+        保存策略
+
+        查找返回的是缓存中的同一个对象，保存失败时移除缓存，
+        避免后续查找拿到未持久化的修改
+        """
+        try:
+            self._repository.save(strategy)
+        except Exception:
+            self._cache.pop(strategy.id, None)
+            raise
+        self._put(strategy)
+
+    def find_by_id(self, strategy_id: str) -> Optional[Strategy]:
+        """根据ID查找策略"""
+        strategy = self._get_cached(strategy_id)
+        if strategy is not None:
+            return strategy
+
+        strategy = self._repository.find_by_id(strategy_id)
+        if strategy is not None:
+            self._put(strategy)
+        return strategy
+
+    def find_many_by_ids(self, strategy_ids: Iterable[str]) -> Dict[str, Strategy]:
+        """根据ID批量查找策略"""
+        result = {}
+        missing = []
+        for strategy_id in strategy_ids:
+            strategy = self._get_cached(strategy_id)
+            if strategy is not None:
+                result[strategy_id] = strategy
+            else:
+                missing.append(strategy_id)
+
+        if missing:
+            loaded = self._repository.find_many_by_ids(missing)
+            for strategy in loaded.values():
+                self._put(strategy)
+            result.update(loaded)
+        return result
+
+    def find_all(self) -> List[Strategy]:
+        """查找所有策略"""
+        return self._repository.find_all()
+
+    def find_by_status(self, status: StrategyStatus) -> List[Strategy]:
+        """根据状态查找策略"""
+        return self._repository.find_by_status(status)
+
+    def find_by_exchange_id(self, exchange_id: str) -> List[Strategy]:
+        """根据交易所ID查找策略"""
+        return self._repository.find_by_exchange_id(exchange_id)
+
+    def find_by_symbol(self, symbol: str) -> List[Strategy]:
+        """根据交易对查找策略"""
+        return self._repository.find_by_symbol(symbol)
+
+    def delete(self, strategy_id: str) -> bool:
+        """删除策略"""
+        self._cache.pop(strategy_id, None)
+        return self._repository.delete(strategy_id)
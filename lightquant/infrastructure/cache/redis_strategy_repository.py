@@ -0,0 +1,185 @@
+"""
+策略仓库Redis缓存实现
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from ...domain.models.strategy import Strategy, StrategyStatus
+from ...domain.repositories.strategy_repository import StrategyRepository
+
+
+class CachingStrategyRepository(StrategyRepository):
+    """
+    策略仓库Redis缓存实现
+
+    包装另一个策略仓库，策略以JSON形式缓存，读操作先查Redis，未命中时读取底层仓库并写入Redis（读穿透）。
+    保存或删除策略时删除该策略的缓存以及可能包含它的列表缓存；
+    策略的交易所或交易对被修改时，旧的列表缓存最多在有效期内保持过期数据。
+    """
+
+    def __init__(
+        self,
+        repository: StrategyRepository,
+        client: Any,
+        ttl: int = 5,
+        prefix: str = "lightquant:",
+    ):
+        """
+        初始化策略仓库缓存
+
+        Args:
+            repository: 底层策略仓库
+            client: Redis客户端，如 redis.Redis 实例
+            ttl: 缓存有效期（秒）
+            prefix: 缓存键前缀
+        """
+        self._repository = repository
+        self._client = client
+        self._ttl = ttl
+        self._prefix = prefix
+
+        # 缓存命中统计
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _dumps(value: Any) -> str:
+        """
+        将策略或策略列表序列化为JSON
+
+        缓存只保存可被 Strategy.from_dict 重建的数据，
+        不使用pickle，避免能写入Redis的一方借反序列化执行任意代码
+        """
+        if isinstance(value, list):
+            return json.dumps([strategy.to_dict() for strategy in value])
+        return json.dumps(value.to_dict())
+
+    @staticmethod
+    def _loads(data: Any) -> Any:
+        """从JSON重建策略或策略列表"""
+        value = json.loads(data)
+        if isinstance(value, list):
+            return [Strategy.from_dict(item) for item in value]
+        return Strategy.from_dict(value)
+
+    def _key(self, *parts: str) -> str:
+        """生成缓存键"""
+        return self._prefix + ":".join(parts)
+
+    def _read_through(self, key: str, load: Callable[[], Any]) -> Any:
+        """
+        读取缓存，未命中时加载并写入缓存
+
+        Args:
+            key: 缓存键
+            load: 缓存未命中时加载数据的函数
+
+        Returns:
+            缓存或加载的数据
+        """
+        data = self._client.get(key)
+        if data is not None:
+            self.hits += 1
+            return self._loads(data)
+
+        self.misses += 1
+        value = load()
+        if value is not None:
+            self._client.setex(key, self._ttl, self._dumps(value))
+        return value
+
+    def _invalidate(self, strategy: Optional[Strategy], strategy_id: str) -> None:
+        """删除策略及可能包含它的列表缓存"""
+        keys = [self._key("strategy", strategy_id), self._key("strategies", "all")]
+        # 状态可能刚刚变化，删除所有状态的列表缓存
+        keys.extend(self._key("strategies", "status", s.value) for s in StrategyStatus)
+        if strategy is not None:
+            keys.extend(
+                self._key("strategies", "exchange", exchange_id)
+                for exchange_id in strategy.config.exchange_ids
+            )
+            keys.extend(
+                self._key("strategies", "symbol", symbol)
+                for symbol in strategy.config.symbols
+            )
+        self._client.delete(*keys)
+
+    def save(self, strategy: Strategy) -> None:
+        """保存策略"""
+        self._repository.save(strategy)
+        self._invalidate(strategy, strategy.id)
+
+    def find_by_id(self, strategy_id: str) -> Optional[Strategy]:
+        """根据ID查找策略"""
+        return self._read_through(
+            self._key("strategy", strategy_id),
+            lambda: self._repository.find_by_id(strategy_id),
+        )
+
+    def find_many_by_ids(self, strategy_ids: Iterable[str]) -> Dict[str, Strategy]:
+        """根据ID批量查找策略"""
+        strategy_ids = list(strategy_ids)
+        if not strategy_ids:
+            return {}
+
+        result = {}
+        missing = []
+        cached = self._client.mget(
+            [self._key("strategy", strategy_id) for strategy_id in strategy_ids]
+        )
+        for strategy_id, data in zip(strategy_ids, cached):
+            if data is not None:
+                result[strategy_id] = self._loads(data)
+            else:
+                missing.append(strategy_id)
+        self.hits += len(result)
+        self.misses += len(missing)
+
+        if missing:
+            loaded = self._repository.find_many_by_ids(missing)
+            if loaded:
+                pipeline = self._client.pipeline()
+                for strategy_id, strategy in loaded.items():
+                    pipeline.setex(
+                        self._key("strategy", strategy_id),
+                        self._ttl,
+                        self._dumps(strategy),
+                    )
+                pipeline.execute()
+            result.update(loaded)
+        return result
+
+    def find_all(self) -> List[Strategy]:
+        """查找所有策略"""
+        return self._read_through(
+            self._key("strategies", "all"), self._repository.find_all
+        )
+
+    def find_by_status(self, status: StrategyStatus) -> List[Strategy]:
+        """根据状态查找策略"""
+        return self._read_through(
+            self._key("strategies", "status", status.value),
+            lambda: self._repository.find_by_status(status),
+        )
+
+    def find_by_exchange_id(self, exchange_id: str) -> List[Strategy]:
+        """根据交易所ID查找策略"""
+        return self._read_through(
+            self._key("strategies", "exchange", exchange_id),
+            lambda: self._repository.find_by_exchange_id(exchange_id),
+        )
+
+    def find_by_symbol(self, symbol: str) -> List[Strategy]:
+        """根据交易对查找策略"""
+        return self._read_through(
+            self._key("strategies", "symbol", symbol),
+            lambda: self._repository.find_by_symbol(symbol),
+        )
+
+    def delete(self, strategy_id: str) -> bool:
+        """删除策略"""
+        strategy = self._repository.find_by_id(strategy_id)
+        deleted = self._repository.delete(strategy_id)
+        self._invalidate(strategy, strategy_id)
+        return deleted
@@ -1,30 +1,54 @@
 """
 数据库模块，包含数据库管理器和所有仓库实现
+
+导出的名称在首次访问时才导入对应的模块，只使用其中一部分的调用方
+不需要加载全部模型和仓库
 """
 
-from lightquant.infrastructure.database.manager import DatabaseManager
-from lightquant.infrastructure.database.models import (
-    AccountModel,
-    BalanceModel,
-    CandleModel,
-    OrderBookModel,
-    OrderModel,
-    StrategyModel,
-    TickerModel,
-    TradeModel,
-)
-from lightquant.infrastructure.database.repositories.sql_account_repository import (
-    SQLAccountRepository,
-)
-from lightquant.infrastructure.database.repositories.sql_market_data_repository import (
-    SQLMarketDataRepository,
-)
-from lightquant.infrastructure.database.repositories.sql_order_repository import (
-    SQLOrderRepository,
-)
-from lightquant.infrastructure.database.repositories.sql_strategy_repository import (
-    SQLStrategyRepository,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from lightquant.infrastructure.database.database_manager import DatabaseManager
+    from lightquant.infrastructure.database.models import (
+        AccountModel,
+        BalanceModel,
+        CandleModel,
+        OrderBookModel,
+        OrderModel,
+        StrategyModel,
+        TickerModel,
+        TradeModel,
+    )
+    from lightquant.infrastructure.database.repositories.sql_account_repository import (
+        SQLAccountRepository,
+    )
+    from lightquant.infrastructure.database.repositories.sql_market_data_repository import (
+        SQLMarketDataRepository,
+    )
+    from lightquant.infrastructure.database.repositories.sql_order_repository import (
+        SQLOrderRepository,
+    )
+    from lightquant.infrastructure.database.repositories.sql_strategy_repository import (
+        SQLStrategyRepository,
+    )
+
+# 导出名称 -> 定义所在的模块（相对于本包）
+_LAZY = {
+    "DatabaseManager": ".database_manager",
+    "OrderModel": ".models",
+    "TradeModel": ".models",
+    "AccountModel": ".models",
+    "BalanceModel": ".models",
+    "TickerModel": ".models",
+    "CandleModel": ".models",
+    "OrderBookModel": ".models",
+    "StrategyModel": ".models",
+    "SQLOrderRepository": ".repositories.sql_order_repository",
+    "SQLAccountRepository": ".repositories.sql_account_repository",
+    "SQLStrategyRepository": ".repositories.sql_strategy_repository",
+    "SQLMarketDataRepository": ".repositories.sql_market_data_repository",
+}
 
 __all__ = [
     "DatabaseManager",
@@ -41,3 +65,18 @@ __all__ = [
     "SQLStrategyRepository",
     "SQLMarketDataRepository",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """首次访问导出名称时导入对应模块，并缓存到模块全局变量中"""
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
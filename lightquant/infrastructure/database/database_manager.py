@@ -3,14 +3,38 @@
 """
 
 import os
+import threading
 from contextlib import contextmanager
 from typing import Any, Dict, Optional
 
-from sqlalchemy import Engine, create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import DeclarativeBase, Session, scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
-Base = declarative_base()
+
+class Base(DeclarativeBase):
+    """所有数据库模型的声明式基类"""
+
+
+# 文件型SQLite数据库在每个新连接上执行的设置：
+# WAL日志下读写互不阻塞，synchronous=NORMAL时提交不再每次fsync
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """新建SQLite连接时执行SQLITE_PRAGMAS"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
 
 
 class DatabaseManager:
@@ -20,35 +44,51 @@ class DatabaseManager:
     负责管理数据库连接和会话
     """
 
-    _instance = None
-    _engines: Dict[str, Engine] = {}
-    _session_factories: Dict[str, sessionmaker] = {}
-
-    def __new__(cls, *args, **kwargs):
-        """单例模式"""
-        if cls._instance is None:
-            cls._instance = super(DatabaseManager, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
+    _instance: Optional["DatabaseManager"] = None
+    _lock = threading.Lock()
 
-    def __init__(self, connection_string: Optional[str] = None):
+    def __new__(cls, connection_string: Optional[str] = None):
         """
-        初始化数据库管理器
+        获取数据库管理器单例，首次调用时完成初始化并创建默认引擎
 
         Args:
-            connection_string: 数据库连接字符串，如果为None则从环境变量获取
-        """
-        if self._initialized:
-            return
+            connection_string: 数据库连接字符串，如果为None则从环境变量获取；
+                单例创建后只能省略或与首次调用时相同
 
-        self._connection_string = connection_string or os.environ.get(
-            "DATABASE_URL", "sqlite:///lightquant.db"
-        )
-        self._default_engine_name = "default"
-        self._initialized = True
-
-        # 创建默认引擎
-        self.create_engine(self._default_engine_name, self._connection_string)
+        Raises:
+            ValueError: 单例已使用其他连接字符串创建
+        """
+        instance = cls._instance
+        if instance is None:
+            with cls._lock:
+                instance = cls._instance
+                if instance is None:
+                    instance = super().__new__(cls)
+                    instance._connection_string = connection_string or os.environ.get(
+                        "DATABASE_URL", "sqlite:///lightquant.db"
+                    )
+                    instance._default_engine_name = "default"
+                    instance._engines = {}
+                    instance._session_factories = {}
+                    instance._scoped_sessions = {}
+
+                    # 创建默认引擎
+                    instance.create_engine(
+                        instance._default_engine_name, instance._connection_string
+                    )
+                    cls._instance = instance
+                    return instance
+
+        if (
+            connection_string is not None
+            and connection_string != instance._connection_string
+        ):
+            raise ValueError(
+                "数据库管理器已使用其他连接字符串初始化，"
+                "请使用create_engine创建命名引擎: "
+                f"{connection_string}"
+            )
+        return instance
 
     def create_engine(self, name: str, connection_string: str, **kwargs) -> Engine:
         """
@@ -62,19 +102,35 @@ class DatabaseManager:
         Returns:
             数据库引擎
         """
-        if name in self._engines:
-            return self._engines[name]
-
-        # 设置默认参数
-        engine_kwargs = {
-            "echo": False,
-            "pool_pre_ping": True,
-            "pool_recycle": 3600,
-        }
+        engine = self._engines.get(name)
+        if engine is not None:
+            return engine
+
+        url = make_url(connection_string)
+        is_sqlite = url.get_backend_name() == "sqlite"
+        in_memory = is_sqlite and url.database in (None, "", ":memory:")
+
+        # 设置默认参数；SQLite是本地文件，不需要检测和回收断开的连接
+        if is_sqlite:
+            engine_kwargs: Dict[str, Any] = {
+                "echo": False,
+                "connect_args": {"check_same_thread": False, "timeout": 30},
+            }
+            # 内存数据库只存在于单个连接中，所有会话共用同一个连接
+            if in_memory:
+                engine_kwargs["poolclass"] = StaticPool
+        else:
+            engine_kwargs = {
+                "echo": False,
+                "pool_pre_ping": True,
+                "pool_recycle": 3600,
+            }
         engine_kwargs.update(kwargs)
 
         # 创建引擎
         engine = create_engine(connection_string, **engine_kwargs)
+        if is_sqlite and not in_memory:
+            event.listen(engine, "connect", _set_sqlite_pragmas)
         self._engines[name] = engine
 
         # 创建会话工厂
@@ -94,9 +150,10 @@ class DatabaseManager:
             数据库引擎
         """
         engine_name = name or self._default_engine_name
-        if engine_name not in self._engines:
+        engine = self._engines.get(engine_name)
+        if engine is None:
             raise ValueError(f"引擎 {engine_name} 不存在")
-        return self._engines[engine_name]
+        return engine
 
     @contextmanager
     def session(self, name: Optional[str] = None) -> Session:
@@ -110,10 +167,10 @@ class DatabaseManager:
             数据库会话
         """
         engine_name = name or self._default_engine_name
-        if engine_name not in self._session_factories:
+        session_factory = self._session_factories.get(engine_name)
+        if session_factory is None:
             raise ValueError(f"引擎 {engine_name} 不存在")
 
-        session_factory = self._session_factories[engine_name]
         session = session_factory()
         try:
             yield session
@@ -126,7 +183,10 @@ class DatabaseManager:
 
     def create_scoped_session(self, name: Optional[str] = None) -> scoped_session:
         """
-        创建线程安全的会话工厂
+        获取线程安全的会话工厂
+
+        每个引擎只创建一个scoped_session，重复调用返回同一个对象；
+        线程用完会话后（如每个请求结束时）应调用其remove()释放线程内的会话
 
         Args:
             name: 引擎名称，如果为None则使用默认引擎
@@ -135,11 +195,20 @@ class DatabaseManager:
             线程安全的会话工厂
         """
         engine_name = name or self._default_engine_name
-        if engine_name not in self._session_factories:
+        scoped = self._scoped_sessions.get(engine_name)
+        if scoped is not None:
+            return scoped
+
+        session_factory = self._session_factories.get(engine_name)
+        if session_factory is None:
             raise ValueError(f"引擎 {engine_name} 不存在")
 
-        session_factory = self._session_factories[engine_name]
-        return scoped_session(session_factory)
+        with self._lock:
+            scoped = self._scoped_sessions.get(engine_name)
+            if scoped is None:
+                scoped = scoped_session(session_factory)
+                self._scoped_sessions[engine_name] = scoped
+        return scoped
 
     def create_all_tables(self, name: Optional[str] = None) -> None:
         """
@@ -148,6 +217,9 @@ class DatabaseManager:
         Args:
             name: 引擎名称，如果为None则使用默认引擎
         """
+        # 导入模型模块，确保所有表都已注册到Base.metadata
+        from . import models  # noqa: F401
+
         engine = self.get_engine(name)
         Base.metadata.create_all(engine)
 
@@ -158,5 +230,8 @@ class DatabaseManager:
         Args:
             name: 引擎名称，如果为None则使用默认引擎
         """
+        # 导入模型模块，确保所有表都已注册到Base.metadata
+        from . import models  # noqa: F401
+
         engine = self.get_engine(name)
         Base.metadata.drop_all(engine)
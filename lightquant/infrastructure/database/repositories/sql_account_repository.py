@@ -2,7 +2,7 @@
 账户仓库SQL实现
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from sqlalchemy.orm import Session
 
@@ -86,6 +86,23 @@ class SQLAccountRepository(AccountRepository):
                 return None
             return self._to_domain_entity(account_model, session)
 
+    def find_many_by_ids(self, account_ids: Iterable[str]) -> Dict[str, Account]:
+        """根据ID批量查找账户"""
+        account_ids = list(account_ids)
+        if not account_ids:
+            return {}
+
+        with self._db_manager.session() as session:
+            account_models = (
+                session.query(AccountModel)
+                .filter(AccountModel.id.in_(account_ids))
+                .all()
+            )
+            return {
+                model.id: self._to_domain_entity(model, session)
+                for model in account_models
+            }
+
     def find_by_exchange_id(self, exchange_id: str) -> Optional[Account]:
         """根据交易所ID查找账户"""
         with self._db_manager.session() as session:
@@ -4,21 +4,48 @@
 
 import json
 from datetime import datetime
-from typing import Dict, List, Optional
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
 
-from sqlalchemy import desc
+import numpy as np
+from sqlalchemy import desc, func, insert
 
-from ....domain.models.market_data import Candle, OrderBook, OrderBookEntry, Ticker
-from ....domain.repositories.market_data_repository import MarketDataRepository
+from ....domain.models.market_data import (
+    Candle,
+    CandleBatch,
+    OrderBook,
+    OrderBookEntry,
+    Ticker,
+    _epoch_ns,
+)
+from ....domain.repositories.market_data_repository import (
+    CANDLE_ARRAY_FIELDS,
+    MarketDataRepository,
+)
 from ..database_manager import DatabaseManager
 from ..models.market_data_model import CandleModel, OrderBookModel, TickerModel
 
+# 批量写入的默认每批行数，PostgreSQL在1000行左右吞吐已趋于平稳
+DEFAULT_BATCH_SIZE = 1000
+
 
 class SQLMarketDataRepository(MarketDataRepository):
     """市场数据仓库SQL实现"""
 
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(
+        self, db_manager: DatabaseManager, batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        """
+        初始化市场数据仓库
+
+        Args:
+            db_manager: 数据库管理器
+            batch_size: 批量写入时每批的行数，DuckDB/MySQL等可适当调大
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size必须大于0")
         self._db_manager = db_manager
+        self._batch_size = batch_size
 
     def get_ticker(self, symbol: str, exchange_id: str) -> Optional[Ticker]:
         """获取最新行情"""
@@ -38,58 +65,53 @@ class SQLMarketDataRepository(MarketDataRepository):
             return self._ticker_to_domain_entity(ticker_model)
 
     def get_tickers(self, exchange_id: str) -> Dict[str, Ticker]:
-        """获取交易所的所有行情"""
-        result = {}
+        """获取交易所的所有行情，一次查询取出每个交易对的最新行情"""
         with self._db_manager.session() as session:
-            # 获取每个交易对的最新行情
-            # 这里的实现可能不是最高效的，实际使用时可能需要优化
-            symbols = (
-                session.query(TickerModel.symbol)
-                .filter(TickerModel.exchange_id == exchange_id)
-                .distinct()
-                .all()
-            )
-
-            for (symbol,) in symbols:
-                ticker_model = (
+            if session.get_bind().dialect.name == "postgresql":
+                # PostgreSQL直接使用 DISTINCT ON (symbol)
+                ticker_models = (
                     session.query(TickerModel)
-                    .filter(
-                        TickerModel.symbol == symbol,
-                        TickerModel.exchange_id == exchange_id,
+                    .filter(TickerModel.exchange_id == exchange_id)
+                    .order_by(TickerModel.symbol, desc(TickerModel.timestamp))
+                    .distinct(TickerModel.symbol)
+                    .all()
+                )
+            else:
+                # 其他数据库使用窗口函数按交易对取时间最新的一行
+                row_number = (
+                    func.row_number()
+                    .over(
+                        partition_by=TickerModel.symbol,
+                        order_by=desc(TickerModel.timestamp),
                     )
-                    .order_by(desc(TickerModel.timestamp))
-                    .first()
+                    .label("row_number")
+                )
+                latest = (
+                    session.query(TickerModel.id, row_number)
+                    .filter(TickerModel.exchange_id == exchange_id)
+                    .subquery()
+                )
+                ticker_models = (
+                    session.query(TickerModel)
+                    .join(latest, TickerModel.id == latest.c.id)
+                    .filter(latest.c.row_number == 1)
+                    .all()
                 )
 
-                if ticker_model:
-                    result[symbol] = self._ticker_to_domain_entity(ticker_model)
-
-        return result
+            return {
+                model.symbol: self._ticker_to_domain_entity(model)
+                for model in ticker_models
+            }
 
     def save_ticker(self, ticker: Ticker) -> None:
         """保存行情"""
-        with self._db_manager.session() as session:
-            ticker_model = TickerModel(
-                id=str(ticker.timestamp.timestamp())
-                + "_"
-                + ticker.symbol
-                + "_"
-                + ticker.exchange_id,
-                symbol=ticker.symbol,
-                exchange_id=ticker.exchange_id,
-                bid=ticker.bid,
-                ask=ticker.ask,
-                last=ticker.last,
-                high=ticker.high if hasattr(ticker, "high") else None,
-                low=ticker.low if hasattr(ticker, "low") else None,
-                volume=ticker.volume if hasattr(ticker, "volume") else None,
-                quote_volume=(
-                    ticker.quote_volume if hasattr(ticker, "quote_volume") else None
-                ),
-                timestamp=ticker.timestamp,
-                created_at=datetime.utcnow(),
-            )
-            session.add(ticker_model)
+        self.save_tickers([ticker])
+
+    def save_tickers(
+        self, tickers: List[Ticker], batch_size: Optional[int] = None
+    ) -> None:
+        """批量保存行情，按batch_size分批executemany写入"""
+        self._save_in_batches(TickerModel, tickers, self._ticker_to_row, batch_size)
 
     def get_candles(
         self,
@@ -119,33 +141,103 @@ class SQLMarketDataRepository(MarketDataRepository):
 
             return [self._candle_to_domain_entity(model) for model in candle_models]
 
-    def save_candles(self, candles: List[Candle]) -> None:
-        """保存K线数据"""
+    def get_latest_candle_timestamp(
+        self, symbol: str, exchange_id: str, timeframe: str
+    ) -> Optional[datetime]:
+        """获取最新K线的开盘时间"""
         with self._db_manager.session() as session:
-            for candle in candles:
-                candle_model = CandleModel(
-                    id=str(candle.timestamp.timestamp())
-                    + "_"
-                    + candle.symbol
-                    + "_"
-                    + candle.exchange_id
-                    + "_"
-                    + candle.timeframe,
-                    symbol=candle.symbol,
-                    exchange_id=candle.exchange_id,
-                    timeframe=candle.timeframe,
-                    timestamp=candle.timestamp,
-                    open=candle.open,
-                    high=candle.high,
-                    low=candle.low,
-                    close=candle.close,
-                    volume=candle.volume,
-                    quote_volume=(
-                        candle.quote_volume if hasattr(candle, "quote_volume") else None
-                    ),
-                    created_at=datetime.utcnow(),
+            return (
+                session.query(func.max(CandleModel.timestamp))
+                .filter(
+                    CandleModel.symbol == symbol,
+                    CandleModel.exchange_id == exchange_id,
+                    CandleModel.timeframe == timeframe,
                 )
-                session.add(candle_model)
+                .scalar()
+            )
+
+    def get_candles_array(
+        self,
+        symbol: str,
+        exchange_id: str,
+        timeframe: str,
+        since: Optional[datetime] = None,
+        limit: int = 100,
+        fields: Sequence[str] = CANDLE_ARRAY_FIELDS,
+    ) -> np.ndarray:
+        """以NumPy数组形式获取K线数据，只查询所需列，不创建K线对象"""
+        with self._db_manager.session() as session:
+            columns = [getattr(CandleModel, name) for name in fields]
+            query = session.query(*columns).filter(
+                CandleModel.symbol == symbol,
+                CandleModel.exchange_id == exchange_id,
+                CandleModel.timeframe == timeframe,
+            )
+
+            if since:
+                query = query.filter(CandleModel.timestamp >= since)
+
+            rows = query.order_by(desc(CandleModel.timestamp)).limit(limit).all()
+
+        # 查询按时间降序返回，翻转为升序
+        data = np.array(rows, dtype=np.float64).reshape(len(rows), len(fields))
+        return data[::-1]
+
+    def get_candle_batch(
+        self,
+        symbol: str,
+        exchange_id: str,
+        timeframe: str,
+        since: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> CandleBatch:
+        """以列式结构获取K线数据，只查询所需列，不创建K线对象"""
+        with self._db_manager.session() as session:
+            query = session.query(
+                CandleModel.timestamp,
+                CandleModel.open,
+                CandleModel.high,
+                CandleModel.low,
+                CandleModel.close,
+                CandleModel.volume,
+            ).filter(
+                CandleModel.symbol == symbol,
+                CandleModel.exchange_id == exchange_id,
+                CandleModel.timeframe == timeframe,
+            )
+
+            if since:
+                query = query.filter(CandleModel.timestamp >= since)
+
+            rows = query.order_by(desc(CandleModel.timestamp)).limit(limit).all()
+
+        # 查询按时间降序返回，翻转为升序
+        rows.reverse()
+        # 与 CandleBatch.from_candles 使用同一换算，带时区的时间（如timestamptz）归一为UTC
+        timestamps = np.fromiter(
+            (_epoch_ns(row[0]) for row in rows), dtype=np.int64, count=len(rows)
+        )
+        values = np.array([row[1:] for row in rows], dtype=np.float64).reshape(
+            len(rows), 5
+        )
+
+        return CandleBatch(
+            symbol=symbol,
+            exchange_id=exchange_id,
+            timeframe=timeframe,
+            timestamps=timestamps,
+            open=np.ascontiguousarray(values[:, 0]),
+            high=np.ascontiguousarray(values[:, 1]),
+            low=np.ascontiguousarray(values[:, 2]),
+            close=np.ascontiguousarray(values[:, 3]),
+            volume=np.ascontiguousarray(values[:, 4]),
+        )
+
+    def save_candles(
+        self, candles: List[Candle], batch_size: Optional[int] = None
+    ) -> None:
+        """保存K线数据，按batch_size分批executemany写入"""
+        self._save_in_batches(CandleModel, candles, self._candle_to_row, batch_size)
 
     def get_order_book(
         self, symbol: str, exchange_id: str, limit: int = 20
@@ -193,6 +285,86 @@ class SQLMarketDataRepository(MarketDataRepository):
             )
             session.add(order_book_model)
 
+    def _save_in_batches(
+        self,
+        model: type,
+        items: Iterable[Any],
+        to_row: Callable[[Any, datetime], Dict[str, Any]],
+        batch_size: Optional[int] = None,
+    ) -> None:
+        """
+        分批写入数据
+
+        每批只构建batch_size行的字典并执行一次executemany，
+        所有批次在同一事务中，退出会话时统一提交。
+
+        Args:
+            model: 数据库模型类
+            items: 领域实体序列
+            to_row: 将领域实体转换为行字典的函数
+            batch_size: 每批行数，如果为None则使用构造时的配置
+        """
+        batch_size = self._batch_size if batch_size is None else batch_size
+        if batch_size < 1:
+            raise ValueError("batch_size必须大于0")
+        iterator = iter(items)
+        chunk = list(islice(iterator, batch_size))
+        if not chunk:
+            return
+
+        created_at = datetime.utcnow()
+        statement = insert(model)
+        with self._db_manager.session() as session:
+            while chunk:
+                session.execute(statement, [to_row(item, created_at) for item in chunk])
+                chunk = list(islice(iterator, batch_size))
+
+    @staticmethod
+    def _ticker_to_row(ticker: Ticker, created_at: datetime) -> Dict[str, Any]:
+        """将行情转换为批量插入使用的行字典"""
+        return {
+            "id": str(ticker.timestamp.timestamp())
+            + "_"
+            + ticker.symbol
+            + "_"
+            + ticker.exchange_id,
+            "symbol": ticker.symbol,
+            "exchange_id": ticker.exchange_id,
+            "bid": ticker.bid,
+            "ask": ticker.ask,
+            "last": ticker.last,
+            "high": getattr(ticker, "high", None),
+            "low": getattr(ticker, "low", None),
+            "volume": getattr(ticker, "volume", None),
+            "quote_volume": getattr(ticker, "quote_volume", None),
+            "timestamp": ticker.timestamp,
+            "created_at": created_at,
+        }
+
+    @staticmethod
+    def _candle_to_row(candle: Candle, created_at: datetime) -> Dict[str, Any]:
+        """将K线转换为批量插入使用的行字典"""
+        return {
+            "id": str(candle.timestamp.timestamp())
+            + "_"
+            + candle.symbol
+            + "_"
+            + candle.exchange_id
+            + "_"
+            + candle.timeframe,
+            "symbol": candle.symbol,
+            "exchange_id": candle.exchange_id,
+            "timeframe": candle.timeframe,
+            "timestamp": candle.timestamp,
+            "open": candle.open,
+            "high": candle.high,
+            "low": candle.low,
+            "close": candle.close,
+            "volume": candle.volume,
+            "quote_volume": getattr(candle, "quote_volume", None),
+            "created_at": created_at,
+        }
+
     def _ticker_to_domain_entity(self, model: TickerModel) -> Ticker:
         """将数据库模型转换为领域实体"""
         return Ticker(
@@ -3,7 +3,7 @@
 """
 
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from sqlalchemy.orm import Session
 
@@ -40,42 +40,68 @@ class SQLOrderRepository(OrderRepository):
 
             if order_model:
                 # 更新现有订单
-                order_model.status = self._map_order_status(order.status)
-                order_model.filled_amount = order.filled_amount
-                order_model.average_price = order.average_price
-                order_model.exchange_order_id = order.exchange_order_id
-                order_model.is_closed = order.is_closed
-                order_model.submitted_at = order.submitted_at
-                order_model.closed_at = order.closed_at
-                order_model.error_message = order.error_message
+                self._update_model(order_model, order)
             else:
                 # 创建新订单
-                order_model = OrderModel(
-                    id=order.id,
-                    strategy_id=order.strategy_id,
-                    exchange_id=order.exchange_id,
-                    symbol=order.params.symbol,
-                    order_type=self._map_order_type(order.params.order_type),
-                    side=self._map_order_side(order.params.side),
-                    amount=order.params.amount,
-                    price=order.params.price,
-                    stop_price=order.params.stop_price,
-                    filled_amount=order.filled_amount,
-                    average_price=order.average_price,
-                    status=self._map_order_status(order.status),
-                    exchange_order_id=order.exchange_order_id,
-                    client_order_id=order.client_order_id,
-                    params=(
-                        json.dumps(order.params.params) if order.params.params else None
-                    ),
-                    error_message=order.error_message,
-                    is_closed=order.is_closed,
-                    created_at=order.created_at,
-                    updated_at=order.updated_at,
-                    submitted_at=order.submitted_at,
-                    closed_at=order.closed_at,
+                session.add(self._to_model(order))
+
+    def save_many(self, orders: Iterable[Order]) -> None:
+        """批量保存订单，在同一事务中完成，已存在的订单通过一次查询取出"""
+        orders = list(orders)
+        if not orders:
+            return
+
+        with self._db_manager.session() as session:
+            existing = {
+                model.id: model
+                for model in session.query(OrderModel).filter(
+                    OrderModel.id.in_([order.id for order in orders])
                 )
-                session.add(order_model)
+            }
+
+            for order in orders:
+                order_model = existing.get(order.id)
+                if order_model:
+                    self._update_model(order_model, order)
+                else:
+                    session.add(self._to_model(order))
+
+    def _update_model(self, order_model: OrderModel, order: Order) -> None:
+        """将订单的可变状态写入已存在的数据库模型"""
+        order_model.status = self._map_order_status(order.status)
+        order_model.filled_amount = order.filled_amount
+        order_model.average_price = order.average_price
+        order_model.exchange_order_id = order.exchange_order_id
+        order_model.is_closed = order.is_closed
+        order_model.submitted_at = order.submitted_at
+        order_model.closed_at = order.closed_at
+        order_model.error_message = order.error_message
+
+    def _to_model(self, order: Order) -> OrderModel:
+        """将订单转换为新的数据库模型"""
+        return OrderModel(
+            id=order.id,
+            strategy_id=order.strategy_id,
+            exchange_id=order.exchange_id,
+            symbol=order.params.symbol,
+            order_type=self._map_order_type(order.params.order_type),
+            side=self._map_order_side(order.params.side),
+            amount=order.params.amount,
+            price=order.params.price,
+            stop_price=order.params.stop_price,
+            filled_amount=order.filled_amount,
+            average_price=order.average_price,
+            status=self._map_order_status(order.status),
+            exchange_order_id=order.exchange_order_id,
+            client_order_id=order.client_order_id,
+            params=(json.dumps(order.params.params) if order.params.params else None),
+            error_message=order.error_message,
+            is_closed=order.is_closed,
+            created_at=order.created_at,
+            updated_at=order.updated_at,
+            submitted_at=order.submitted_at,
+            closed_at=order.closed_at,
+        )
 
     def find_by_id(self, order_id: str) -> Optional[Order]:
         """根据ID查找订单"""
@@ -87,6 +113,18 @@ class SQLOrderRepository(OrderRepository):
                 return None
             return self._to_domain_entity(order_model)
 
+    def find_many_by_ids(self, order_ids: Iterable[str]) -> Dict[str, Order]:
+        """根据ID批量查找订单"""
+        order_ids = list(order_ids)
+        if not order_ids:
+            return {}
+
+        with self._db_manager.session() as session:
+            order_models = (
+                session.query(OrderModel).filter(OrderModel.id.in_(order_ids)).all()
+            )
+            return {model.id: self._to_domain_entity(model) for model in order_models}
+
     def find_by_exchange_order_id(
         self, exchange_id: str, exchange_order_id: str
     ) -> Optional[Order]:
@@ -177,7 +215,7 @@ class SQLOrderRepository(OrderRepository):
             amount=model.amount,
             price=model.price,
             stop_price=model.stop_price,
-            params=json.loads(model.params) if model.params else {},
+            params=json.loads(model.params) if model.params else None,
         )
 
         # 创建订单实体
@@ -191,6 +229,7 @@ class SQLOrderRepository(OrderRepository):
         # 设置订单属性
         order._status = self._map_to_order_status(model.status)
         order._filled_amount = model.filled_amount
+        order._remaining_amount = model.amount - model.filled_amount
         order._average_price = model.average_price
         order._exchange_order_id = model.exchange_order_id
         order._client_order_id = model.client_order_id
@@ -3,7 +3,7 @@
 """
 
 import json
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 from sqlalchemy.orm import Session
 
@@ -77,6 +77,23 @@ class SQLStrategyRepository(StrategyRepository):
                 return None
             return self._to_domain_entity(strategy_model, session)
 
+    def find_many_by_ids(self, strategy_ids: Iterable[str]) -> Dict[str, Strategy]:
+        """根据ID批量查找策略"""
+        strategy_ids = list(strategy_ids)
+        if not strategy_ids:
+            return {}
+
+        with self._db_manager.session() as session:
+            strategy_models = (
+                session.query(StrategyModel)
+                .filter(StrategyModel.id.in_(strategy_ids))
+                .all()
+            )
+            return {
+                model.id: self._to_domain_entity(model, session)
+                for model in strategy_models
+            }
+
     def find_all(self) -> List[Strategy]:
         """查找所有策略"""
         with self._db_manager.session() as session:
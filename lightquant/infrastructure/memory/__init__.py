@@ -0,0 +1,9 @@
+"""
+内存仓库模块，包含不依赖数据库的仓库实现
+"""
+
+from .memory_order_repository import InMemoryOrderRepository
+
+__all__ = [
+    "InMemoryOrderRepository",
+]
@@ -0,0 +1,118 @@
+"""
+订单仓库内存实现
+"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from ...domain.models.order import Order
+from ...domain.repositories.order_repository import OrderRepository
+
+
+class InMemoryOrderRepository(OrderRepository):
+    """
+    订单仓库内存实现
+
+    未完成订单始终强引用保存；已完成订单放入容量受限的LRU缓存，
+    超出容量时淘汰最久未访问的订单，保证长时间运行的进程内存有界。
+    查询方法只能返回仍在缓存中的已完成订单。
+    """
+
+    def __init__(self, max_closed_orders: int = 10_000):
+        """
+        初始化订单仓库
+
+        Args:
+            max_closed_orders: 缓存的已完成订单最大数量
+        """
+        self._max_closed_orders = max_closed_orders
+        self._open: Dict[str, Order] = {}
+        self._closed: "OrderedDict[str, Order]" = OrderedDict()
+
+    def save(self, order: Order) -> None:
+        """保存订单"""
+        if order.is_closed:
+            self._open.pop(order.id, None)
+            self._closed[order.id] = order
+            self._closed.move_to_end(order.id)
+            while len(self._closed) > self._max_closed_orders:
+                self._closed.popitem(last=False)
+        else:
+            self._closed.pop(order.id, None)
+            self._open[order.id] = order
+
+    def save_many(self, orders: Iterable[Order]) -> None:
+        """批量保存订单"""
+        for order in orders:
+            self.save(order)
+
+    def find_by_id(self, order_id: str) -> Optional[Order]:
+        """根据ID查找订单"""
+        order = self._open.get(order_id)
+        if order is not None:
+            return order
+
+        order = self._closed.get(order_id)
+        if order is not None:
+            self._closed.move_to_end(order_id)
+        return order
+
+    def find_many_by_ids(self, order_ids: Iterable[str]) -> Dict[str, Order]:
+        """根据ID批量查找订单"""
+        result = {}
+        for order_id in order_ids:
+            order = self.find_by_id(order_id)
+            if order is not None:
+                result[order_id] = order
+        return result
+
+    def find_by_exchange_order_id(
+        self, exchange_id: str, exchange_order_id: str
+    ) -> Optional[Order]:
+        """根据交易所订单ID查找订单"""
+        for order in self._iter_orders():
+            if (
+                order.exchange_id == exchange_id
+                and order.exchange_order_id == exchange_order_id
+            ):
+                return order
+        return None
+
+    def find_by_strategy_id(self, strategy_id: str) -> List[Order]:
+        """查找策略的所有订单"""
+        return [
+            order for order in self._iter_orders() if order.strategy_id == strategy_id
+        ]
+
+    def find_open_by_strategy_id(self, strategy_id: str) -> List[Order]:
+        """查找策略的未完成订单"""
+        return [
+            order for order in self._open.values() if order.strategy_id == strategy_id
+        ]
+
+    def find_by_exchange_id(self, exchange_id: str) -> List[Order]:
+        """查找交易所的所有订单"""
+        return [
+            order for order in self._iter_orders() if order.exchange_id == exchange_id
+        ]
+
+    def find_open_by_exchange_id(self, exchange_id: str) -> List[Order]:
+        """查找交易所的未完成订单"""
+        return [
+            order for order in self._open.values() if order.exchange_id == exchange_id
+        ]
+
+    def find_by_symbol(self, symbol: str) -> List[Order]:
+        """查找交易对的所有订单"""
+        return [order for order in self._iter_orders() if order.params.symbol == symbol]
+
+    def delete(self, order_id: str) -> bool:
+        """删除订单"""
+        if self._open.pop(order_id, None) is not None:
+            return True
+        return self._closed.pop(order_id, None) is not None
+
+    def _iter_orders(self):
+        """遍历所有缓存中的订单，未完成订单在前"""
+        yield from self._open.values()
+        yield from self._closed.values()
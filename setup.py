@@ -12,6 +12,11 @@ setup(
         "ccxt",
         "python-dateutil",
     ],
+    extras_require={
+        "redis": ["redis"],
+        "jit": ["numba"],
+        "fast-json": ["orjson"],
+    },
     author="LightQuant Team",
     author_email="info@lightquant.org",
     description="A lightweight quantitative trading framework for digital currencies",
@@ -0,0 +1,18 @@
+"""
+测试公共夹具
+"""
+
+import pytest
+
+from lightquant.infrastructure.database.database_manager import DatabaseManager
+
+
+@pytest.fixture
+def db_manager():
+    """使用内存SQLite的数据库管理器，每个测试重新创建单例"""
+    DatabaseManager._instance = None
+    manager = DatabaseManager("sqlite:///:memory:")
+    manager.create_all_tables()
+    yield manager
+    manager.get_engine().dispose()
+    DatabaseManager._instance = None
@@ -0,0 +1,122 @@
+"""
+CandleRingBuffer 测试
+"""
+
+import warnings
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from lightquant.domain.models.candle_kernels import _ring_update_python
+from lightquant.domain.models.market_data import (
+    Candle,
+    CandleBatch,
+    CandleRingBuffer,
+    _epoch_ns,
+)
+
+T0 = datetime(2024, 1, 1)
+
+
+def make_candle(minute: int, close: float = None, tzinfo=None) -> Candle:
+    price = float(minute) if close is None else close
+    return Candle(
+        symbol="BTC/USDT",
+        exchange_id="binance",
+        timeframe="1m",
+        timestamp=(T0 + timedelta(minutes=minute)).replace(tzinfo=tzinfo),
+        open=price,
+        high=price,
+        low=price,
+        close=price,
+        volume=1.0,
+    )
+
+
+def test_partially_filled_buffer_keeps_insertion_order():
+    buffer = CandleRingBuffer("BTC/USDT", capacity=5)
+    for minute in range(3):
+        buffer.append(make_candle(minute))
+
+    batch = buffer.to_batch()
+
+    assert len(buffer) == 3
+    assert batch.close.tolist() == [0.0, 1.0, 2.0]
+
+
+def test_wraparound_keeps_latest_candles_in_time_order():
+    buffer = CandleRingBuffer("BTC/USDT", capacity=3)
+    candles = [make_candle(minute) for minute in range(8)]
+    for candle in candles:
+        buffer.append(candle)
+
+    batch = buffer.to_batch()
+    expected = CandleBatch.from_candles(candles[-3:], "BTC/USDT")
+
+    assert len(buffer) == 3
+    assert batch.close.tolist() == [5.0, 6.0, 7.0]
+    np.testing.assert_array_equal(batch.timestamps, expected.timestamps)
+
+
+def test_same_timestamp_replaces_latest_candle():
+    buffer = CandleRingBuffer("BTC/USDT", capacity=3)
+    for minute in range(4):
+        buffer.append(make_candle(minute))
+    buffer.append(make_candle(3, close=42.0))
+
+    batch = buffer.to_batch()
+
+    assert len(buffer) == 3
+    assert batch.close.tolist() == [1.0, 2.0, 42.0]
+
+
+def test_to_batch_returns_a_copy():
+    buffer = CandleRingBuffer("BTC/USDT", capacity=2)
+    buffer.append(make_candle(0))
+    batch = buffer.to_batch()
+
+    buffer.append(make_candle(0, close=9.0))
+
+    assert batch.close.tolist() == [0.0]
+
+
+def test_timezone_aware_timestamps_append_without_warnings():
+    buffer = CandleRingBuffer("BTC/USDT", capacity=2)
+    aware = make_candle(0, tzinfo=timezone(timedelta(hours=8)))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        buffer.append(aware)
+
+    expected = int(aware.timestamp.timestamp()) * 1_000_000_000
+    assert buffer.to_batch().timestamps.tolist() == [expected]
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        CandleRingBuffer("BTC/USDT", capacity=0)
+
+
+def test_python_kernel_matches_buffer():
+    buffer = CandleRingBuffer("BTC/USDT", capacity=4)
+    columns = [np.zeros(4, dtype=np.int64)] + [np.zeros(4) for _ in range(5)]
+    state = np.zeros(2, dtype=np.int64)
+
+    for minute in [0, 1, 2, 2, 3, 4, 5]:
+        candle = make_candle(minute, close=minute * 10.0)
+        buffer.append(candle)
+        _ring_update_python(
+            *columns,
+            state,
+            _epoch_ns(candle.timestamp),
+            candle.open,
+            candle.high,
+            candle.low,
+            candle.close,
+            candle.volume,
+        )
+
+    np.testing.assert_array_equal(columns[0], buffer.timestamps)
+    np.testing.assert_array_equal(columns[4], buffer.close)
+    assert len(buffer) == int(state[1])
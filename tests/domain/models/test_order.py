@@ -0,0 +1,73 @@
+"""
+Order 成交累计测试
+"""
+
+import math
+
+import pytest
+
+from lightquant.domain.models.order import (
+    Order,
+    OrderParams,
+    OrderSide,
+    OrderStatus,
+    OrderType,
+)
+
+FILLS = [0.1] * 25 + [0.2, 0.3] * 10
+
+
+def make_order(amount: float) -> Order:
+    params = OrderParams(
+        symbol="BTC/USDT",
+        order_type=OrderType.MARKET,
+        side=OrderSide.BUY,
+        amount=amount,
+    )
+    return Order(params, "strategy-1", "binance")
+
+
+def test_partial_fills_are_summed_without_drift():
+    order = make_order(math.fsum(FILLS) + 1.0)
+
+    for i, amount in enumerate(FILLS):
+        order.fill(amount, 100.0, f"trade-{i}")
+
+    # 直接累加为 7.500000000000001，补偿求和与精确求和一致
+    assert sum(FILLS) != math.fsum(FILLS)
+    assert order.filled_amount == math.fsum(FILLS)
+    assert order.remaining_amount == 1.0
+    assert order.status == OrderStatus.PARTIALLY_FILLED
+
+
+def test_fill_of_exact_remaining_amount_closes_the_order():
+    order = make_order(math.fsum(FILLS) + 1.0)
+    for i, amount in enumerate(FILLS):
+        order.fill(amount, 100.0, f"trade-{i}")
+
+    order.fill(order.remaining_amount, 100.0, "last")
+
+    assert order.filled_amount == order.params.amount
+    assert order.remaining_amount == 0.0
+    assert order.status == OrderStatus.FILLED
+    with pytest.raises(ValueError):
+        order.fill(0.1, 100.0, "extra")
+
+
+def test_average_price_is_weighted_by_filled_amount():
+    order = make_order(4.0)
+
+    order.fill(1.0, 100.0, "trade-1")
+    order.fill(3.0, 200.0, "trade-2")
+
+    assert order.average_price == pytest.approx(175.0)
+    assert order.filled_amount + order.remaining_amount == 4.0
+
+
+def test_fill_larger_than_remaining_amount_is_rejected():
+    order = make_order(1.0)
+    order.fill(0.6, 100.0, "trade-1")
+
+    with pytest.raises(ValueError):
+        order.fill(0.5, 100.0, "trade-2")
+    assert order.filled_amount == 0.6
@@ -0,0 +1,36 @@
+"""
+风险检查内核测试
+"""
+
+import numpy as np
+
+from lightquant.domain.risk_management import risk_kernels
+
+
+def test_numpy_kernel_checks_amount_and_value_limits():
+    amounts = np.array([1.0, 5.0, 2.0, 2.0])
+    values = np.array([100.0, 100.0, 1000.0, np.nan])
+
+    ok = risk_kernels._check_position_sizes_numpy(amounts, values, 3.0, 500.0)
+
+    # 价值为NaN表示无法估值，只检查数量
+    assert ok.tolist() == [True, False, False, True]
+
+
+def test_dispatched_kernel_matches_numpy_kernel():
+    rng = np.random.default_rng(0)
+    amounts = rng.uniform(0.0, 10.0, 1000)
+    values = rng.uniform(0.0, 1000.0, 1000)
+    values[::7] = np.nan
+
+    expected = risk_kernels._check_position_sizes_numpy(amounts, values, 5.0, 500.0)
+    actual = risk_kernels.check_position_sizes(amounts, values, 5.0, 500.0)
+
+    assert actual.dtype == np.bool_
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_empty_batch():
+    empty = np.empty(0)
+
+    assert risk_kernels.check_position_sizes(empty, empty, 1.0, 1.0).shape == (0,)
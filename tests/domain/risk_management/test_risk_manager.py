@@ -0,0 +1,84 @@
+"""
+RiskManager 批量风险检查测试
+"""
+
+from datetime import datetime
+
+from lightquant.domain.models.account import Account
+from lightquant.domain.models.order import Order, OrderParams, OrderSide, OrderType
+from lightquant.domain.risk_management.risk_manager import RiskManager
+from lightquant.domain.risk_management.risk_rule import (
+    MaxTradesPerDayRule,
+    PositionSizeRule,
+)
+
+T0 = datetime(2024, 1, 1, 12)
+
+
+def make_order(amount: float) -> Order:
+    params = OrderParams(
+        symbol="BTC/USDT",
+        order_type=OrderType.MARKET,
+        side=OrderSide.BUY,
+        amount=amount,
+    )
+    return Order(params, "strategy-1", "binance")
+
+
+def make_manager() -> RiskManager:
+    manager = RiskManager()
+    manager.add_rule(PositionSizeRule(max_position_value=1500.0))
+    manager.add_rule(MaxTradesPerDayRule(max_trades=3))
+    manager.update_context(
+        {"current_time": T0, "ticker": {"BTC/USDT": {"last": 1000.0}}}
+    )
+    return manager
+
+
+def test_check_orders_matches_check_order():
+    # 被仓位规则拒绝的订单不占用每日交易次数
+    orders = [make_order(amount) for amount in [1.0, 2.0, 1.0, 1.2, 0.5, 0.1]]
+    account = Account("binance")
+
+    sequential = make_manager()
+    expected = [sequential.check_order(order, account) for order in orders]
+    ok = make_manager().check_orders(orders, account)
+
+    assert ok.tolist() == expected == [True, False, True, True, False, False]
+
+
+def test_disabled_rules_are_skipped():
+    manager = make_manager()
+    manager.disable_rule("Position Size Rule")
+    orders = [make_order(amount) for amount in [2.0, 2.0, 2.0, 2.0]]
+
+    ok = manager.check_orders(orders, Account("binance"))
+
+    assert ok.tolist() == [True, True, True, False]
+
+
+def test_empty_batch():
+    assert make_manager().check_orders([], Account("binance")).shape == (0,)
+
+
+def test_last_prices_in_context_are_merged_into_the_price_table():
+    manager = make_manager()
+    last_prices = manager.last_prices
+
+    manager.update_context({"last_prices": {"ETH/USDT": 100.0}})
+    manager.update_last_price("BTC/USDT", 2000.0)
+
+    assert manager.last_prices is last_prices
+    assert manager.context["last_prices"] is last_prices
+    assert last_prices == {"BTC/USDT": 2000.0, "ETH/USDT": 100.0}
+    assert not manager.check_order(make_order(1.0), Account("binance"))
+
+
+def test_clear_last_prices_drops_stale_prices():
+    manager = make_manager()
+
+    manager.clear_last_prices()
+
+    # 无法确定价格时仓位价值不做检查
+    assert manager.context["last_prices"] == {}
+    assert manager.check_order(make_order(2.0), Account("binance"))
@@ -0,0 +1,262 @@
+"""
+风险规则测试
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from lightquant.domain.models.account import Account
+from lightquant.domain.models.order import Order, OrderParams, OrderSide, OrderType
+from lightquant.domain.risk_management.risk_rule import (
+    MaxDrawdownRule,
+    MaxTradesPerDayRule,
+    PositionSizeRule,
+)
+
+T0 = datetime(2024, 1, 1, 12)
+
+
+def make_order(
+    amount: float = 1.0, price: float = None, symbol: str = "BTC/USDT"
+) -> Order:
+    params = OrderParams(
+        symbol=symbol,
+        order_type=OrderType.MARKET if price is None else OrderType.LIMIT,
+        side=OrderSide.BUY,
+        amount=amount,
+        price=price,
+    )
+    return Order(params, "strategy-1", "binance")
+
+
+def make_account(usdt: float = 10000.0, btc: float = 1.0) -> Account:
+    account = Account("binance")
+    account.update_balance("USDT", usdt)
+    account.update_balance("BTC", btc)
+    return account
+
+
+# 市价单按最新价格估值，限价单按订单价格估值，XRP没有价格
+POSITION_ORDERS = [
+    make_order(1.0),
+    make_order(2.5),
+    make_order(1.6),
+    make_order(10.0, price=120.0, symbol="ETH/USDT"),
+    make_order(1.8, price=1200.0),
+    make_order(5.0, symbol="XRP/USDT"),
+]
+PRICES = {"BTC/USDT": 1000.0, "ETH/USDT": 100.0}
+
+
+def test_drawdown_is_measured_from_the_peak_in_the_lookback_window():
+    rule = MaxDrawdownRule(lookback_days=3)
+
+    assert rule.update_equity(100.0, T0) == 0.0
+    assert rule.update_equity(120.0, T0 + timedelta(days=1)) == 0.0
+    assert rule.update_equity(90.0, T0 + timedelta(days=2)) == pytest.approx(25.0)
+
+    # 第1天的峰值120已超出回顾窗口，峰值变为第2天的90
+    drawdown = rule.update_equity(81.0, T0 + timedelta(days=5))
+    assert drawdown == pytest.approx(10.0)
+
+
+def test_equity_peaks_are_bucketed_per_day():
+    rule = MaxDrawdownRule(lookback_days=2)
+
+    # 同一天内只保留当天的峰值
+    rule.update_equity(100.0, T0)
+    rule.update_equity(110.0, T0 + timedelta(hours=1))
+    assert rule.update_equity(99.0, T0 + timedelta(hours=2)) == pytest.approx(10.0)
+
+    # 当天加上回顾的2天都在窗口内，第0天的峰值仍然有效
+    assert rule.update_equity(88.0, T0 + timedelta(days=2)) == pytest.approx(20.0)
+
+    # 第3天时第0天移出窗口，跳过的第1天没有权益记录
+    drawdown = rule.update_equity(80.0, T0 + timedelta(days=3))
+    assert drawdown == pytest.approx((88.0 - 80.0) / 88.0 * 100)
+
+
+def test_gap_longer_than_the_window_clears_every_day():
+    rule = MaxDrawdownRule(lookback_days=2)
+    rule.update_equity(200.0, T0)
+
+    assert rule.update_equity(100.0, T0 + timedelta(days=10)) == 0.0
+
+
+def test_changing_lookback_days_discards_the_equity_history():
+    rule = MaxDrawdownRule(lookback_days=2)
+    rule.update_equity(200.0, T0)
+
+    rule.update_params({"lookback_days": 5})
+
+    assert rule.update_equity(100.0, T0 + timedelta(days=1)) == 0.0
+
+
+def test_check_order_tracks_equity_from_the_context():
+    rule = MaxDrawdownRule(max_drawdown_percentage=10.0)
+    account = Account("binance")
+    order = make_order()
+
+    assert rule.check_order(order, account, {"equity": 100.0, "current_time": T0})
+    assert rule.check_order(
+        order, account, {"equity": 95.0, "current_time": T0 + timedelta(hours=1)}
+    )
+    assert not rule.check_order(
+        order, account, {"equity": 85.0, "current_time": T0 + timedelta(hours=2)}
+    )
+
+    # 上下文中直接给出的回撤优先于权益
+    assert rule.check_order(order, account, {"drawdown": 5.0, "equity": 1.0})
+    assert rule.check_order(order, account, {})
+
+
+def test_precompute_uses_the_running_peak_without_timestamps():
+    rule = MaxDrawdownRule(max_drawdown_percentage=15.0)
+    account = Account("binance")
+    order = make_order()
+
+    drawdowns = rule.precompute([100.0, 120.0, 90.0, 130.0, 117.0])
+
+    np.testing.assert_allclose(drawdowns, [0.0, 0.0, 25.0, 0.0, 10.0])
+    assert not rule.check_order(order, account, {"bar_idx": 2})
+    assert rule.check_order(order, account, {"bar_idx": 4})
+
+    # 清除后上下文中没有回撤信息，默认通过
+    rule.clear_precomputed()
+    assert rule.check_order(order, account, {"bar_idx": 2})
+
+
+def test_precompute_rolls_the_peak_over_lookback_days():
+    rule = MaxDrawdownRule(lookback_days=2)
+    equity = [100.0, 120.0, 110.0, 100.0, 90.0]
+    timestamps = [T0 + timedelta(days=day) for day in range(len(equity))]
+
+    drawdowns = rule.precompute(equity, timestamps)
+
+    # 每个时间点的峰值只取最近2天内的权益
+    expected = [0.0, 0.0, (1 - 110 / 120) * 100, (1 - 100 / 110) * 100, 10.0]
+    np.testing.assert_allclose(drawdowns, expected)
+
+
+def test_max_trades_per_day_counts_accepted_orders_and_resets_daily():
+    rule = MaxTradesPerDayRule(max_trades=2)
+    account = Account("binance")
+    context = {"current_time": T0}
+
+    results = [rule.check_order(make_order(), account, context) for _ in range(3)]
+    assert results == [True, True, False]
+
+    context["current_time"] = T0 + timedelta(days=1)
+    assert rule.check_order(make_order(), account, context)
+
+
+def test_max_trades_check_orders_admits_the_remaining_quota_in_order():
+    rule = MaxTradesPerDayRule(max_trades=5)
+    account = Account("binance")
+    context = {"current_time": T0}
+    assert rule.check_order(make_order(), account, context)
+
+    ok = rule.check_orders([make_order() for _ in range(6)], account, context)
+    assert ok.tolist() == [True] * 4 + [False] * 2
+    assert not rule.check_orders([make_order()], account, context).any()
+
+    context["current_time"] = T0 + timedelta(days=1)
+    assert rule.check_orders([make_order() for _ in range(3)], account, context).all()
+
+
+def test_max_trades_check_orders_matches_sequential_checks():
+    sequential = MaxTradesPerDayRule(max_trades=3)
+    batched = MaxTradesPerDayRule(max_trades=3)
+    account = Account("binance")
+
+    for day, size in [(0, 2), (0, 0), (0, 2), (1, 1), (1, 4)]:
+        context = {"current_time": T0 + timedelta(days=day)}
+        orders = [make_order() for _ in range(size)]
+        expected = [sequential.check_order(order, account, context) for order in orders]
+        assert batched.check_orders(orders, account, context).tolist() == expected
+
+
+def test_max_drawdown_check_orders_updates_equity_once_per_batch():
+    rule = MaxDrawdownRule(max_drawdown_percentage=10.0)
+    account = Account("binance")
+    rule.update_equity(100.0, T0)
+
+    context = {"equity": 85.0, "current_time": T0 + timedelta(hours=1)}
+    assert (
+        rule.check_orders([make_order() for _ in range(3)], account, context).tolist()
+        == [False] * 3
+    )
+    assert rule.check_orders([], account, context).shape == (0,)
+
+
+@pytest.mark.parametrize(
+    "limits",
+    [
+        {},
+        {"max_position_amount": 2.0},
+        {"max_position_value": 1500.0},
+        {"max_position_percentage": 20.0},
+        {
+            "max_position_amount": 2.0,
+            "max_position_value": 1500.0,
+            "max_position_percentage": 20.0,
+        },
+    ],
+)
+def test_position_size_check_orders_matches_check_order(limits):
+    rule = PositionSizeRule(**limits)
+    account = make_account()
+    context = {"last_prices": PRICES}
+
+    expected = [rule.check_order(order, account, context) for order in POSITION_ORDERS]
+    ok = rule.check_orders(POSITION_ORDERS, account, context)
+
+    assert ok.dtype == bool
+    assert ok.tolist() == expected
+
+
+def test_position_size_limits_by_value_and_equity_percentage():
+    # 权益 = 10000 + 1 BTC * 1000 = 11000，20% 为 2200
+    rule = PositionSizeRule(max_position_value=2000.0, max_position_percentage=20.0)
+
+    ok = rule.check_orders(POSITION_ORDERS, make_account(), {"last_prices": PRICES})
+
+    assert ok.tolist() == [True, False, True, True, False, True]
+
+
+def test_position_size_rejects_priced_orders_without_equity():
+    rule = PositionSizeRule(max_position_percentage=20.0)
+    account = make_account(usdt=0.0, btc=0.0)
+    context = {"last_prices": PRICES}
+
+    expected = [rule.check_order(order, account, context) for order in POSITION_ORDERS]
+    ok = rule.check_orders(POSITION_ORDERS, account, context)
+
+    # 只有无法估值的XRP订单通过
+    assert ok.tolist() == expected == [False] * 5 + [True]
+
+
+def test_position_size_reads_raw_ticker_without_mutating_the_context():
+    rule = PositionSizeRule(max_position_value=2000.0, max_position_percentage=20.0)
+    ticker = {symbol: {"last": price} for symbol, price in PRICES.items()}
+    context = {"ticker": ticker}
+
+    expected = [
+        rule.check_order(order, make_account(), context) for order in POSITION_ORDERS
+    ]
+    ok = rule.check_orders(POSITION_ORDERS, make_account(), context)
+
+    assert ok.tolist() == expected == [True, False, True, True, False, True]
+    assert context == {"ticker": ticker}
+
+
+def test_position_size_treats_malformed_prices_as_unknown():
+    rule = PositionSizeRule(max_position_value=500.0)
+    context = {"last_prices": None}
+
+    assert rule.check_order(make_order(1.0), make_account(), context)
+    assert rule.check_orders([make_order(1.0)], make_account(), context).tolist() == [
+        True
+    ]
@@ -0,0 +1,164 @@
+"""
+MarketDataService 指标缓存测试
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import event
+
+from lightquant.domain.models.market_data import Candle, CandleBatch
+from lightquant.domain.services.market_data_service import MarketDataService
+from lightquant.infrastructure.database.repositories.sql_market_data_repository import (
+    SQLMarketDataRepository,
+)
+
+T0 = datetime(2024, 1, 1)
+
+
+def make_candle(timestamp: datetime, close: float) -> Candle:
+    return Candle(
+        symbol="BTC/USDT",
+        exchange_id="binance",
+        timeframe="1m",
+        timestamp=timestamp,
+        open=close,
+        high=close,
+        low=close,
+        close=close,
+        volume=1.0,
+    )
+
+
+class FakeMarket:
+    """返回已入库K线的仓库替身"""
+
+    def __init__(self):
+        self.candles = [
+            make_candle(T0 + timedelta(minutes=minute), float(minute))
+            for minute in range(10)
+        ]
+        self.repository = MagicMock()
+        self.repository.get_candle_batch.side_effect = self.get_candle_batch
+        self.repository.get_latest_candle_timestamp.side_effect = self.get_latest
+
+    def get_candle_batch(self, symbol, exchange_id, timeframe, since=None, limit=100):
+        return CandleBatch.from_candles(
+            self.candles[-limit:], symbol, exchange_id, timeframe
+        )
+
+    def get_latest(self, symbol, exchange_id, timeframe):
+        return self.candles[-1].timestamp if self.candles else None
+
+    def add_candle(self, close: float) -> None:
+        timestamp = self.candles[-1].timestamp + timedelta(minutes=1)
+        self.candles.append(make_candle(timestamp, close))
+
+    @property
+    def queries(self) -> int:
+        return self.repository.get_candle_batch.call_count
+
+
+@pytest.fixture
+def market():
+    return FakeMarket()
+
+
+@pytest.fixture
+def service(market):
+    return MarketDataService(market.repository)
+
+
+def moving_average(service, periods=3):
+    return service.calculate_moving_average("BTC/USDT", "binance", "1m", periods)
+
+
+def test_hits_only_probe_the_latest_candle(market, service):
+    assert moving_average(service) == pytest.approx(8.0)
+    service.calculate_bollinger_bands("BTC/USDT", "binance", "1m", 3)
+    assert moving_average(service) == pytest.approx(8.0)
+
+    # 同一窗口上的多个指标共用一次K线查询
+    assert market.queries == 1
+    assert market.repository.get_latest_candle_timestamp.call_count == 3
+
+
+def test_new_candle_invalidates_the_cache(market, service):
+    moving_average(service)
+
+    market.add_candle(100.0)
+
+    assert moving_average(service) == pytest.approx((8.0 + 9.0 + 100.0) / 3)
+    assert market.queries == 2
+
+
+def test_empty_series_is_not_cached(market, service):
+    market.candles = []
+    assert moving_average(service) is None
+    assert moving_average(service) is None
+    assert market.queries == 2
+
+    market.candles = [make_candle(T0, 1.0)]
+    assert moving_average(service, periods=1) == pytest.approx(1.0)
+
+
+def test_window_ending_after_the_probe_is_not_cached(market, service):
+    # 探测最新K线之后、查询窗口之前有新K线入库
+    market.repository.get_latest_candle_timestamp.side_effect = [
+        market.candles[-1].timestamp,
+        market.candles[-1].timestamp,
+    ]
+    market.add_candle(100.0)
+
+    assert moving_average(service) == pytest.approx((8.0 + 9.0 + 100.0) / 3)
+    moving_average(service)
+    assert market.queries == 2
+
+
+@pytest.fixture(params=["Asia/Shanghai", "America/New_York"])
+def local_timezone(request):
+    """切换进程本地时区，交易所适配器以本地时间记录K线开盘时间"""
+    previous = os.environ.get("TZ")
+    os.environ["TZ"] = request.param
+    time.tzset()
+    yield request.param
+    if previous is None:
+        del os.environ["TZ"]
+    else:
+        os.environ["TZ"] = previous
+    time.tzset()
+
+
+def test_local_time_candles_are_cached_in_any_timezone(db_manager, local_timezone):
+    repository = SQLMarketDataRepository(db_manager)
+    service = MarketDataService(repository)
+    start = int(time.time()) // 60 * 60 - 600
+    repository.save_candles(
+        [
+            make_candle(datetime.fromtimestamp(start + 60 * minute), float(minute))
+            for minute in range(10)
+        ]
+    )
+
+    selects = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(db_manager.get_engine(), "before_cursor_execute", record)
+    try:
+        assert moving_average(service) == pytest.approx(8.0)
+        assert moving_average(service) == pytest.approx(8.0)
+        # 两次最新K线探测加一次窗口查询
+        assert len(selects) == 3
+
+        repository.save_candles(
+            [make_candle(datetime.fromtimestamp(start + 600), 100.0)]
+        )
+        assert moving_average(service) == pytest.approx((8.0 + 9.0 + 100.0) / 3)
+    finally:
+        event.remove(db_manager.get_engine(), "before_cursor_execute", record)
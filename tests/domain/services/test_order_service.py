@@ -0,0 +1,88 @@
+"""
+OrderService 批量取消订单测试
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from lightquant.domain.models.order import (
+    OrderParams,
+    OrderSide,
+    OrderStatus,
+    OrderType,
+)
+from lightquant.domain.services.order_service import OrderService
+from lightquant.infrastructure.memory import InMemoryOrderRepository
+
+
+@pytest.fixture
+def repository():
+    return InMemoryOrderRepository()
+
+
+@pytest.fixture
+def service(repository):
+    return OrderService(repository, MagicMock())
+
+
+def create_order(service, strategy_id="strategy-1", exchange_id="binance"):
+    params = OrderParams(
+        symbol="BTC/USDT",
+        order_type=OrderType.LIMIT,
+        side=OrderSide.BUY,
+        amount=1.0,
+        price=100.0,
+    )
+    return service.create_order(params, strategy_id, exchange_id)
+
+
+def test_cancel_all_orders_by_strategy_saves_open_orders_in_one_call(
+    service, repository
+):
+    open_orders = [create_order(service) for _ in range(3)]
+    filled = create_order(service)
+    filled.fill(1.0, 100.0, "trade-1")
+    repository.save(filled)
+    other = create_order(service, strategy_id="strategy-2")
+
+    with patch.object(repository, "save_many", wraps=repository.save_many) as spy:
+        assert service.cancel_all_orders_by_strategy("strategy-1") == 3
+
+    spy.assert_called_once()
+    assert all(order.status == OrderStatus.CANCELED for order in open_orders)
+    assert repository.find_by_id(filled.id).status == OrderStatus.FILLED
+    assert not repository.find_by_id(other.id).is_closed
+    assert service.get_open_orders_by_strategy("strategy-1") == []
+
+
+def test_cancel_all_orders_by_exchange(service, repository):
+    orders = [create_order(service, exchange_id="binance") for _ in range(2)]
+    other = create_order(service, exchange_id="okx")
+
+    with patch.object(repository, "save_many", wraps=repository.save_many) as spy:
+        assert service.cancel_all_orders_by_exchange("binance") == 2
+
+    spy.assert_called_once()
+    assert all(order.status == OrderStatus.CANCELED for order in orders)
+    assert not other.is_closed
+
+
+def test_cancel_all_with_no_open_orders(service):
+    assert service.cancel_all_orders_by_strategy("strategy-1") == 0
+    assert service.cancel_all_orders_by_exchange("binance") == 0
+
+
+def test_cancel_orders_skips_missing_and_closed_orders(service, repository):
+    first, second = create_order(service), create_order(service)
+    filled = create_order(service)
+    filled.fill(1.0, 100.0, "trade-1")
+    repository.save(filled)
+
+    with patch.object(repository, "save_many", wraps=repository.save_many) as spy:
+        canceled = service.cancel_orders([first.id, "missing", filled.id, second.id])
+
+    spy.assert_called_once()
+    assert sorted(canceled) == sorted([first.id, second.id])
+    assert first.status == second.status == OrderStatus.CANCELED
+    assert filled.status == OrderStatus.FILLED
@@ -0,0 +1,151 @@
+"""
+BacktestEngine 向量化回测测试
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from lightquant.domain.models.market_data import Candle
+from lightquant.domain.models.order import Order, OrderParams, OrderSide, OrderType
+from lightquant.domain.models.strategy import Strategy, StrategyConfig
+from lightquant.domain.risk_management.risk_rule import MaxTradesPerDayRule
+from lightquant.domain.services.order_service import OrderService
+from lightquant.domain.strategies import BaseStrategy, StrategyResult
+from lightquant.domain.strategies.backtest_engine import BacktestEngine
+from lightquant.infrastructure.memory import InMemoryOrderRepository
+
+T0 = datetime(2024, 1, 1)
+SYMBOL = "BTC/USDT"
+CLOSES = [100.0, 102.0, 101.0, 105.0, 107.0, 104.0, 103.0, 108.0, 110.0, 109.0]
+TARGETS = [0.0, 1.0, 1.0, 2.0, 0.0, 0.0, 1.5, 1.5, 0.5, 0.0]
+CANDLES = [
+    Candle(
+        symbol=SYMBOL,
+        exchange_id="binance",
+        timeframe="1h",
+        timestamp=T0 + timedelta(hours=i),
+        open=close,
+        high=close,
+        low=close,
+        close=close,
+        volume=1.0,
+    )
+    for i, close in enumerate(CLOSES)
+]
+
+
+class EventLoopStrategy(BaseStrategy):
+    """逐根K线按目标持仓的变化量下单"""
+
+    def initialize(self) -> None:
+        self.index = 0
+        self.position = 0.0
+
+    def on_candle(self, candle: Candle) -> StrategyResult:
+        result = StrategyResult()
+        trade = TARGETS[self.index] - self.position
+        self.index += 1
+        self.position += trade
+        if trade:
+            params = OrderParams(
+                symbol=candle.symbol,
+                order_type=OrderType.MARKET,
+                side=OrderSide.BUY if trade > 0 else OrderSide.SELL,
+                amount=abs(trade),
+            )
+            result.add_order(Order(params, self.context.strategy_id, "binance"))
+        return result
+
+
+class VectorizedStrategy(EventLoopStrategy):
+    """同时支持向量化回测，目标持仓与逐根K线版本一致"""
+
+    def on_candles_vectorized(self, batch):
+        return np.array(TARGETS)
+
+
+class WrongShapeStrategy(EventLoopStrategy):
+    def on_candles_vectorized(self, batch):
+        return np.zeros(len(batch) - 1)
+
+
+def make_engine(order_repository) -> BacktestEngine:
+    strategies = {}
+
+    def create_strategy(config):
+        strategy = Strategy(config)
+        strategies[strategy.id] = strategy
+        return strategy
+
+    strategy_service = MagicMock()
+    strategy_service.create_strategy.side_effect = create_strategy
+    strategy_service.get_strategy.side_effect = strategies.get
+
+    market_data_service = MagicMock()
+    market_data_service.get_historical_candles.return_value = CANDLES
+
+    engine = BacktestEngine(
+        strategy_service,
+        OrderService(order_repository, MagicMock()),
+        market_data_service,
+        MagicMock(),
+    )
+    engine.slippage = 0.001
+    return engine
+
+
+def run(strategy_class, rules=(), order_repository=None):
+    if order_repository is None:
+        order_repository = InMemoryOrderRepository()
+    engine = make_engine(order_repository)
+    strategy_id = engine.create_strategy(
+        strategy_class, StrategyConfig("test", [SYMBOL], ["binance"], timeframes=["1h"])
+    )
+    assert strategy_id is not None
+    for rule in rules:
+        engine.risk_manager.add_rule(rule)
+    result = engine.run_backtest(strategy_id, T0, T0 + timedelta(hours=len(CANDLES)))
+    return engine, result
+
+
+def test_vectorized_matches_event_loop():
+    vectorized_engine, vectorized = run(VectorizedStrategy)
+    event_engine, event_loop = run(EventLoopStrategy)
+
+    assert vectorized["performance_metrics"] == event_loop["performance_metrics"]
+    assert vectorized["equity_curve"] == event_loop["equity_curve"]
+    assert vectorized_engine.account_snapshots == event_engine.account_snapshots
+    assert vectorized["performance_metrics"]["total_trades"] == 6
+
+    orders = vectorized["orders"]
+    assert [order.params.side for order in orders] == [
+        order.params.side for order in event_loop["orders"]
+    ]
+    assert all(order.is_closed for order in orders)
+
+
+def test_vectorized_orders_are_saved_through_order_service():
+    order_repository = InMemoryOrderRepository()
+    _, result = run(VectorizedStrategy, order_repository=order_repository)
+
+    saved = order_repository.find_by_symbol(SYMBOL)
+
+    assert {order.id for order in saved} == {order.id for order in result["orders"]}
+
+
+def test_enabled_risk_rules_fall_back_to_event_loop():
+    _, limited = run(VectorizedStrategy, [MaxTradesPerDayRule(max_trades=2)])
+    _, disabled = run(
+        VectorizedStrategy, [MaxTradesPerDayRule(max_trades=2, enabled=False)]
+    )
+
+    assert limited["performance_metrics"]["total_trades"] == 2
+    assert disabled["performance_metrics"]["total_trades"] == 6
+
+
+def test_wrong_position_shape_raises():
+    with pytest.raises(ValueError, match="on_candles_vectorized"):
+        run(WrongShapeStrategy)
@@ -0,0 +1,42 @@
+"""
+StrategyContext 当前时间测试
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from lightquant.domain.models.account import Account
+from lightquant.domain.models.market_data import _epoch_ns
+from lightquant.domain.strategies.strategy_context import StrategyContext
+
+NAIVE_UTC = datetime(2024, 1, 1, 8, 30, 15, 123456)
+
+
+@pytest.fixture
+def context():
+    return StrategyContext("strategy-1", MagicMock(), MagicMock(), Account("binance"))
+
+
+@pytest.mark.parametrize(
+    "time",
+    [
+        NAIVE_UTC,
+        NAIVE_UTC.replace(tzinfo=timezone.utc),
+        (NAIVE_UTC + timedelta(hours=8)).replace(tzinfo=timezone(timedelta(hours=8))),
+    ],
+)
+def test_datetimes_are_stored_as_utc_epoch_ns(context, time):
+    context.update_current_time(time)
+
+    # 与K线时间戳使用同一换算，可以直接比较
+    assert context.current_time_ns == _epoch_ns(NAIVE_UTC)
+    assert context.current_time == NAIVE_UTC
+
+
+def test_epoch_ns_is_stored_unchanged(context):
+    context.update_current_time(1_704_097_815_123_456_789)
+
+    assert context.current_time_ns == 1_704_097_815_123_456_789
+    assert context.current_time == datetime(2024, 1, 1, 8, 30, 15, 123456)
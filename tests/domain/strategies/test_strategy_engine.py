@@ -0,0 +1,228 @@
+"""
+StrategyEngine 订阅索引和分发测试
+"""
+
+import threading
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from lightquant.domain.models.account import Account
+from lightquant.domain.models.market_data import Candle, Ticker
+from lightquant.domain.models.strategy import Strategy, StrategyConfig
+from lightquant.domain.strategies import (
+    BaseStrategy,
+    BulkStrategyResult,
+    StrategyResult,
+)
+from lightquant.domain.strategies.strategy_engine import (
+    PARALLEL_DISPATCH_THRESHOLD,
+    StrategyEngine,
+)
+
+T0 = datetime(2024, 1, 1)
+
+
+class RecordingStrategy(BaseStrategy):
+    """记录收到的行情以及处理行情的线程"""
+
+    def initialize(self) -> None:
+        self.candles = []
+        self.tickers = []
+        self.threads = set()
+
+    def on_candle(self, candle: Candle) -> StrategyResult:
+        self.candles.append(candle)
+        return StrategyResult()
+
+    def on_ticker(self, ticker: Ticker) -> StrategyResult:
+        self.tickers.append(ticker)
+        self.threads.add(threading.get_ident())
+        return StrategyResult()
+
+
+class MetricsStrategy(BaseStrategy):
+    """每根K线同时输出数组指标和字典指标"""
+
+    def initialize(self) -> None:
+        self.result = BulkStrategyResult(metric_names=["position", "equity"])
+
+    def on_candle(self, candle: Candle) -> StrategyResult:
+        self.result.reset()
+        self.result.add_metric("position", 2.0)
+        self.result.add_metric("signal", "long")
+        return self.result
+
+
+def make_candle(symbol: str, timeframe: str = "1m") -> Candle:
+    return Candle(
+        symbol=symbol,
+        exchange_id="binance",
+        timeframe=timeframe,
+        timestamp=T0,
+        open=1.0,
+        high=1.0,
+        low=1.0,
+        close=1.0,
+        volume=1.0,
+    )
+
+
+def make_ticker(symbol: str) -> Ticker:
+    return Ticker(
+        symbol=symbol,
+        exchange_id="binance",
+        bid=1.0,
+        ask=1.0,
+        last=1.0,
+        high=1.0,
+        low=1.0,
+        volume=1.0,
+        quote_volume=1.0,
+        timestamp=T0,
+    )
+
+
+def make_engine(parallel: bool = False) -> StrategyEngine:
+    strategies = {}
+
+    def create_strategy(config):
+        strategy = Strategy(config)
+        strategies[strategy.id] = strategy
+        return strategy
+
+    strategy_service = MagicMock()
+    strategy_service.create_strategy.side_effect = create_strategy
+    strategy_service.get_strategy.side_effect = strategies.get
+    strategy_service.get_strategies_by_status.return_value = []
+
+    account_repository = MagicMock()
+    account_repository.find_by_exchange_id.return_value = Account("binance")
+
+    engine = StrategyEngine(
+        strategy_service,
+        MagicMock(),
+        MagicMock(),
+        account_repository,
+        parallel=parallel,
+    )
+    engine.start()
+    return engine
+
+
+def start_strategy(engine, symbols, timeframes=("1m",)) -> str:
+    config = StrategyConfig(
+        "test", list(symbols), ["binance"], timeframes=list(timeframes)
+    )
+    strategy_id = engine.create_strategy(RecordingStrategy, config)
+    assert engine.start_strategy(strategy_id)
+    return strategy_id
+
+
+def test_candles_reach_only_subscribed_running_strategies():
+    engine = make_engine()
+    btc = start_strategy(engine, ["BTC/USDT"])
+    eth_hourly = start_strategy(engine, ["ETH/USDT"], ["1h"])
+    created_only = engine.create_strategy(
+        RecordingStrategy, StrategyConfig("idle", ["BTC/USDT"], ["binance"])
+    )
+
+    engine.process_candle(make_candle("BTC/USDT"))
+    engine.process_candle(make_candle("ETH/USDT"))
+    engine.process_candle(make_candle("ETH/USDT", "1h"))
+
+    instances = engine.strategy_instances
+    assert [c.symbol for c in instances[btc].candles] == ["BTC/USDT"]
+    assert [c.timeframe for c in instances[eth_hourly].candles] == ["1h"]
+    assert not instances[created_only].is_initialized
+
+
+def test_paused_strategy_is_removed_from_the_index_until_resumed():
+    engine = make_engine()
+    strategy_id = start_strategy(engine, ["BTC/USDT"])
+    strategy = engine.strategy_instances[strategy_id]
+
+    engine.pause_strategy(strategy_id)
+    engine.process_candle(make_candle("BTC/USDT"))
+    engine.process_ticker(make_ticker("BTC/USDT"))
+    assert strategy.candles == [] and strategy.tickers == []
+
+    engine.resume_strategy(strategy_id)
+    engine.process_candle(make_candle("BTC/USDT"))
+    assert len(strategy.candles) == 1
+
+
+def test_sync_running_strategies_rebuilds_index_from_service():
+    engine = make_engine()
+    strategy_id = start_strategy(engine, ["BTC/USDT"])
+    strategy = engine.strategy_instances[strategy_id]
+
+    engine.strategy_service.get_strategies_by_status.return_value = []
+    engine.sync_running_strategies()
+    engine.process_candle(make_candle("BTC/USDT"))
+    assert strategy.candles == []
+
+    engine.strategy_service.get_strategies_by_status.return_value = [
+        engine.strategy_service.get_strategy(strategy_id)
+    ]
+    engine.sync_running_strategies()
+    engine.process_candle(make_candle("BTC/USDT"))
+    assert len(strategy.candles) == 1
+
+
+def test_ticker_fan_out_stays_on_calling_thread_unless_parallel():
+    engine = make_engine(parallel=False)
+    ids = [
+        start_strategy(engine, ["BTC/USDT"])
+        for _ in range(PARALLEL_DISPATCH_THRESHOLD + 1)
+    ]
+
+    engine.process_ticker(make_ticker("BTC/USDT"))
+
+    assert engine._pool is None
+    for strategy_id in ids:
+        strategy = engine.strategy_instances[strategy_id]
+        assert len(strategy.tickers) == 1
+        assert strategy.threads == {threading.get_ident()}
+
+
+def test_parallel_ticker_fan_out_reaches_every_strategy():
+    engine = make_engine(parallel=True)
+    ids = [
+        start_strategy(engine, ["BTC/USDT"]) for _ in range(PARALLEL_DISPATCH_THRESHOLD)
+    ]
+
+    engine.process_ticker(make_ticker("BTC/USDT"))
+
+    assert engine._pool is not None
+    for strategy_id in ids:
+        assert len(engine.strategy_instances[strategy_id].tickers) == 1
+    engine.stop()
+
+
+def test_bulk_metrics_are_saved_and_pushed_once_per_result():
+    engine = make_engine()
+    config = StrategyConfig("metrics", ["BTC/USDT"], ["binance"], timeframes=["1m"])
+    strategy_id = engine.create_strategy(MetricsStrategy, config)
+    assert engine.start_strategy(strategy_id)
+    risk_manager = engine.risk_managers[strategy_id]
+    risk_manager.update_context = MagicMock(wraps=risk_manager.update_context)
+
+    engine.process_candle(make_candle("BTC/USDT"))
+
+    expected = {"position": 2.0, "signal": "long"}
+    engine.strategy_service.update_strategy_performance.assert_called_once_with(
+        strategy_id, expected
+    )
+    risk_manager.update_context.assert_called_once_with(expected)
+
+
+def test_stopping_a_strategy_clears_its_last_prices():
+    engine = make_engine()
+    strategy_id = start_strategy(engine, ["BTC/USDT"])
+    engine.process_candle(make_candle("BTC/USDT"))
+    risk_manager = engine.risk_managers[strategy_id]
+    assert risk_manager.last_prices == {"BTC/USDT": 1.0}
+
+    assert engine.stop_strategy(strategy_id)
+
+    assert risk_manager.last_prices == {}
@@ -0,0 +1,144 @@
+"""
+IdentityMapStrategyRepository 测试
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from lightquant.domain.models.strategy import Strategy, StrategyConfig
+from lightquant.domain.services.strategy_service import StrategyService
+from lightquant.infrastructure.cache import (
+    IdentityMapStrategyRepository,
+    identity_map_strategy_repository,
+)
+
+
+class FakeClock:
+    """可手动推进的单调时钟"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(identity_map_strategy_repository.time, "monotonic", clock)
+    return clock
+
+
+def make_strategy(name: str = "grid") -> Strategy:
+    return Strategy(StrategyConfig(name, ["BTC/USDT"], ["binance"]))
+
+
+@pytest.fixture
+def strategies():
+    return {strategy.id: strategy for strategy in map(make_strategy, "abc")}
+
+
+@pytest.fixture
+def repository(strategies):
+    repository = MagicMock()
+    repository.find_by_id.side_effect = strategies.get
+    repository.find_many_by_ids.side_effect = lambda ids: {
+        strategy_id: strategies[strategy_id]
+        for strategy_id in ids
+        if strategy_id in strategies
+    }
+    return repository
+
+
+def test_repeated_lookups_return_the_same_object_until_ttl(
+    clock, strategies, repository
+):
+    identity_map = IdentityMapStrategyRepository(repository, ttl=1.0)
+    strategy_id = next(iter(strategies))
+
+    first = identity_map.find_by_id(strategy_id)
+    clock.now += 0.5
+    assert identity_map.find_by_id(strategy_id) is first
+    assert repository.find_by_id.call_count == 1
+
+    clock.now += 1.0
+    identity_map.find_by_id(strategy_id)
+    assert repository.find_by_id.call_count == 2
+
+
+def test_missing_strategy_is_not_cached(clock, repository):
+    identity_map = IdentityMapStrategyRepository(repository)
+
+    assert identity_map.find_by_id("missing") is None
+    assert identity_map.find_by_id("missing") is None
+    assert repository.find_by_id.call_count == 2
+
+
+def test_save_refreshes_the_cache(clock, repository):
+    identity_map = IdentityMapStrategyRepository(repository, ttl=1.0)
+    strategy = make_strategy()
+
+    identity_map.save(strategy)
+    clock.now += 0.5
+
+    assert identity_map.find_by_id(strategy.id) is strategy
+    repository.save.assert_called_once_with(strategy)
+    repository.find_by_id.assert_not_called()
+
+
+def test_failed_save_drops_the_cached_strategy(clock, strategies, repository):
+    identity_map = IdentityMapStrategyRepository(repository)
+    strategy_id = next(iter(strategies))
+    strategy = identity_map.find_by_id(strategy_id)
+
+    strategy.start()
+    repository.save.side_effect = RuntimeError("database unavailable")
+    with pytest.raises(RuntimeError):
+        identity_map.save(strategy)
+
+    identity_map.find_by_id(strategy_id)
+    assert repository.find_by_id.call_count == 2
+
+
+def test_delete_removes_the_cached_strategy(clock, strategies, repository):
+    identity_map = IdentityMapStrategyRepository(repository)
+    strategy_id = next(iter(strategies))
+    identity_map.find_by_id(strategy_id)
+
+    identity_map.delete(strategy_id)
+    identity_map.find_by_id(strategy_id)
+
+    repository.delete.assert_called_once_with(strategy_id)
+    assert repository.find_by_id.call_count == 2
+
+
+def test_find_many_by_ids_loads_only_missing_strategies(clock, strategies, repository):
+    identity_map = IdentityMapStrategyRepository(repository)
+    cached_id, *other_ids = strategies
+    cached = identity_map.find_by_id(cached_id)
+
+    found = identity_map.find_many_by_ids([cached_id, *other_ids, "missing"])
+
+    repository.find_many_by_ids.assert_called_once_with([*other_ids, "missing"])
+    assert found[cached_id] is cached
+    assert set(found) == set(strategies)
+
+    # 批量加载的策略同样进入缓存
+    identity_map.find_many_by_ids(other_ids)
+    assert repository.find_many_by_ids.call_count == 1
+
+
+def test_strategy_service_transitions_load_the_strategy_once(
+    clock, strategies, repository
+):
+    service = StrategyService(IdentityMapStrategyRepository(repository), MagicMock())
+    strategy_id = next(iter(strategies))
+
+    assert service.start_strategy(strategy_id)
+    assert service.pause_strategy(strategy_id)
+    assert service.resume_strategy(strategy_id)
+
+    assert repository.find_by_id.call_count == 1
+    assert repository.save.call_count == 3
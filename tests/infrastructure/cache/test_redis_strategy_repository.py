@@ -0,0 +1,97 @@
+"""
+CachingStrategyRepository 测试
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from lightquant.domain.models.strategy import Strategy, StrategyConfig
+from lightquant.infrastructure.cache import CachingStrategyRepository
+
+
+class FakeRedis:
+    """只实现仓库用到的命令的内存Redis替身"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value.encode("utf-8") if isinstance(value, str) else value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        pass
+
+
+@pytest.fixture
+def strategy():
+    strategy = Strategy(
+        StrategyConfig("grid", ["BTC/USDT"], ["binance"], {"levels": 5})
+    )
+    strategy.start()
+    strategy.add_order("order-1")
+    strategy.update_performance_metrics({"pnl": 1.5})
+    return strategy
+
+
+@pytest.fixture
+def redis():
+    return FakeRedis()
+
+
+@pytest.fixture
+def repository(strategy):
+    repository = MagicMock()
+    repository.find_by_id.return_value = strategy
+    repository.find_all.return_value = [strategy]
+    repository.find_many_by_ids.return_value = {strategy.id: strategy}
+    return repository
+
+
+def test_cached_values_are_json(strategy, redis, repository):
+    cache = CachingStrategyRepository(repository, redis)
+    cache.find_by_id(strategy.id)
+    cache.find_all()
+
+    for value in redis.data.values():
+        json.loads(value)
+
+
+def test_read_through_round_trips_strategies(strategy, redis, repository):
+    cache = CachingStrategyRepository(repository, redis)
+
+    for _ in range(2):
+        by_id = cache.find_by_id(strategy.id)
+        listed = cache.find_all()
+        many = cache.find_many_by_ids([strategy.id])
+
+    assert by_id.to_dict() == strategy.to_dict()
+    assert listed[0].to_dict() == strategy.to_dict()
+    assert many[strategy.id].to_dict() == strategy.to_dict()
+    assert repository.find_by_id.call_count == 1
+    assert repository.find_all.call_count == 1
+    assert cache.hits == 4 and cache.misses == 2
+
+
+def test_save_invalidates_cached_strategy(strategy, redis, repository):
+    cache = CachingStrategyRepository(repository, redis)
+    cache.find_by_id(strategy.id)
+
+    cache.save(strategy)
+    cache.find_by_id(strategy.id)
+
+    assert repository.find_by_id.call_count == 2
@@ -0,0 +1,54 @@
+"""
+DatabaseManager 单例测试
+"""
+
+import threading
+
+import pytest
+
+from lightquant.infrastructure.database.database_manager import DatabaseManager
+
+
+def test_later_calls_return_the_same_instance(db_manager):
+    assert DatabaseManager() is db_manager
+    assert DatabaseManager("sqlite:///:memory:") is db_manager
+
+
+def test_other_connection_string_is_rejected(db_manager):
+    with pytest.raises(ValueError):
+        DatabaseManager("sqlite:///other.db")
+
+    # 其他数据库通过命名引擎创建，默认引擎不变
+    engine = db_manager.create_engine("other", "sqlite:///:memory:")
+    assert db_manager.get_engine("other") is engine
+    assert db_manager.get_engine() is not engine
+
+
+def test_existing_instance_ignores_the_environment(db_manager, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///from_env.db")
+
+    assert DatabaseManager() is db_manager
+    assert db_manager.get_engine().url.database == ":memory:"
+
+
+def test_concurrent_first_calls_create_one_instance():
+    DatabaseManager._instance = None
+    barrier = threading.Barrier(8)
+    instances = []
+
+    def create():
+        barrier.wait()
+        instances.append(DatabaseManager("sqlite:///:memory:"))
+
+    threads = [threading.Thread(target=create) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    try:
+        assert len(instances) == 8
+        assert all(instance is instances[0] for instance in instances)
+    finally:
+        instances[0].get_engine().dispose()
+        DatabaseManager._instance = None
@@ -0,0 +1,184 @@
+"""
+SQLMarketDataRepository 测试
+"""
+
+import warnings
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from lightquant.domain.models.market_data import Candle, CandleBatch, Ticker
+from lightquant.infrastructure.database.repositories.sql_market_data_repository import (
+    SQLMarketDataRepository,
+)
+
+T0 = datetime(2024, 1, 1)
+
+
+def make_candle(minute: int, symbol: str = "BTC/USDT") -> Candle:
+    price = 100.0 + minute
+    return Candle(
+        symbol=symbol,
+        exchange_id="binance",
+        timeframe="1m",
+        timestamp=T0 + timedelta(minutes=minute),
+        open=price,
+        high=price + 1,
+        low=price - 1,
+        close=price,
+        volume=10.0,
+    )
+
+
+def make_ticker(
+    symbol: str, second: int, last: float, exchange_id: str = "binance"
+) -> Ticker:
+    return Ticker(
+        symbol=symbol,
+        exchange_id=exchange_id,
+        bid=last - 1,
+        ask=last + 1,
+        last=last,
+        high=last + 5,
+        low=last - 5,
+        volume=1.0,
+        quote_volume=last,
+        timestamp=T0 + timedelta(seconds=second),
+    )
+
+
+@pytest.fixture
+def statements(db_manager):
+    """记录默认引擎执行的SQL语句"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    engine = db_manager.get_engine()
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_get_tickers_returns_latest_ticker_per_symbol(db_manager):
+    repository = SQLMarketDataRepository(db_manager)
+    repository.save_tickers(
+        [
+            make_ticker("BTC/USDT", 0, 100.0),
+            make_ticker("BTC/USDT", 2, 102.0),
+            make_ticker("BTC/USDT", 1, 101.0),
+            make_ticker("ETH/USDT", 5, 20.0),
+            make_ticker("ETH/USDT", 3, 10.0),
+            make_ticker("BTC/USDT", 9, 999.0, exchange_id="okx"),
+        ]
+    )
+
+    tickers = repository.get_tickers("binance")
+
+    assert set(tickers) == {"BTC/USDT", "ETH/USDT"}
+    assert tickers["BTC/USDT"].last == 102.0
+    assert tickers["BTC/USDT"].timestamp == T0 + timedelta(seconds=2)
+    assert tickers["ETH/USDT"].last == 20.0
+    assert repository.get_tickers("okx")["BTC/USDT"].last == 999.0
+    assert repository.get_tickers("unknown") == {}
+
+
+def test_get_tickers_uses_a_single_query(db_manager, statements):
+    repository = SQLMarketDataRepository(db_manager)
+    repository.save_tickers(
+        [make_ticker(f"S{i}/USDT", second, 1.0) for i in range(5) for second in (0, 1)]
+    )
+    statements.clear()
+
+    assert len(repository.get_tickers("binance")) == 5
+    assert len([s for s in statements if s.lstrip().startswith("SELECT")]) == 1
+
+
+def test_save_candles_round_trip(db_manager):
+    repository = SQLMarketDataRepository(db_manager)
+    repository.save_candles([make_candle(minute) for minute in range(30)])
+
+    candles = repository.get_candles("BTC/USDT", "binance", "1m", limit=100)
+
+    assert [candle.timestamp for candle in candles] == [
+        T0 + timedelta(minutes=minute) for minute in range(30)
+    ]
+    assert candles[-1].close == 129.0
+
+
+def test_save_candles_uses_one_executemany(db_manager, statements):
+    repository = SQLMarketDataRepository(db_manager)
+
+    repository.save_candles([make_candle(minute) for minute in range(30)])
+
+    inserts = [s for s in statements if s.startswith("INSERT INTO candles")]
+    assert len(inserts) == 1
+
+
+def test_save_candles_chunks_by_batch_size(db_manager, statements):
+    repository = SQLMarketDataRepository(db_manager, batch_size=7)
+
+    repository.save_candles([make_candle(minute) for minute in range(50)])
+    inserts = [s for s in statements if s.startswith("INSERT INTO candles")]
+    assert len(inserts) == 8  # ceil(50 / 7)
+
+    statements.clear()
+    repository.save_candles(
+        [make_candle(minute) for minute in range(50, 60)], batch_size=5
+    )
+    inserts = [s for s in statements if s.startswith("INSERT INTO candles")]
+    assert len(inserts) == 2
+
+    assert len(repository.get_candles("BTC/USDT", "binance", "1m", limit=100)) == 60
+
+
+def test_save_candles_rolls_back_every_chunk_on_error(db_manager):
+    repository = SQLMarketDataRepository(db_manager, batch_size=5)
+    repository.save_candles([make_candle(minute) for minute in range(10)])
+
+    # 最后一批与已有K线主键冲突，之前已写入的批次也一并回滚
+    with pytest.raises(IntegrityError):
+        repository.save_candles(
+            [make_candle(minute) for minute in range(10, 19)] + [make_candle(0)]
+        )
+
+    assert len(repository.get_candles("BTC/USDT", "binance", "1m", limit=100)) == 10
+
+
+@pytest.mark.parametrize("batch_size", [0, -1])
+def test_batch_size_must_be_positive(db_manager, batch_size):
+    with pytest.raises(ValueError):
+        SQLMarketDataRepository(db_manager, batch_size=batch_size)
+
+    repository = SQLMarketDataRepository(db_manager)
+    with pytest.raises(ValueError):
+        repository.save_candles([make_candle(0)], batch_size=batch_size)
+
+
+def test_save_ticker_delegates_to_bulk_insert(db_manager):
+    repository = SQLMarketDataRepository(db_manager)
+    repository.save_ticker(make_ticker("BTC/USDT", 0, 100.0))
+
+    ticker = repository.get_ticker("BTC/USDT", "binance")
+
+    assert ticker is not None
+    assert ticker.last == 100.0
+
+
+def test_get_candle_batch_matches_in_memory_batch(db_manager):
+    repository = SQLMarketDataRepository(db_manager)
+    candles = [make_candle(minute) for minute in range(20)]
+    repository.save_candles(candles)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        batch = repository.get_candle_batch("BTC/USDT", "binance", "1m", limit=5)
+
+    expected = CandleBatch.from_candles(candles[-5:], "BTC/USDT", "binance", "1m")
+    assert batch.timestamps.dtype == np.int64
+    np.testing.assert_array_equal(batch.timestamps, expected.timestamps)
+    np.testing.assert_array_equal(batch.close, expected.close)